@@ -24,6 +24,7 @@ setup(
         "Runtime": ["psutil"],
         "ConsoleColor": ["colorama>=0.4.6"],
         "Graphs": ["numpy", "matplotlib"],
+        "ColumnarParams": ["numpy"],
         "Translate": ["googletrans>=3.1.0a0"],
         "Regulation": ["aes"],
         "Sound": ["pydub"],
@@ -5,6 +5,7 @@ Command Line Usage:
 python -m soulstruct
     [--binderpack]
     [--binderunpack]
+    [--workers]
     [--tpfpack]
     [--tpfunpack]
     [--restorebak]
@@ -12,7 +13,9 @@ python -m soulstruct
     [--fileLogLevel]
 """
 import argparse
+import glob
 import logging
+import time
 from pathlib import Path
 
 from soulstruct._logging import CONSOLE_HANDLER, FILE_HANDLER
@@ -24,8 +27,29 @@ _LOGGER = logging.getLogger("soulstruct")
 
 parser = argparse.ArgumentParser(prog="soulstruct", description="Launch Soulstruct programs or adjust settings.")
 
-parser.add_argument("--binderpack", action="store", help=word_wrap("Repack a BND/BXF from the given source directory."))
-parser.add_argument("--binderunpack", action="store", help=word_wrap("Unpack a BND/BXF from the given source file."))
+parser.add_argument(
+    "--binderpack",
+    action="store",
+    nargs="+",
+    help=word_wrap("Repack a BND/BXF from each given source directory. Glob patterns (e.g. 'chr/*.unpacked') are OK."),
+)
+parser.add_argument(
+    "--binderunpack",
+    action="store",
+    nargs="+",
+    help=word_wrap("Unpack each given BND/BXF source file. Glob patterns (e.g. 'chr/*.chrbnd.dcx') are OK."),
+)
+parser.add_argument(
+    "--workers",
+    action="store",
+    type=int,
+    default=1,
+    help=word_wrap(
+        "Total number of workers for '--binderpack' and '--binderunpack'. Binders are spread across up to this many "
+        "processes, and any workers left over (e.g. for fewer binders) are split into threads that each process uses "
+        "to read or write entry files."
+    ),
+)
 parser.add_argument("--tpfpack", action="store", help=word_wrap("Repack a TPF from the given source directory."))
 parser.add_argument("--tpfunpack", action="store", help=word_wrap("Unpack a TPF from the given source file."))
 parser.add_argument("--restorebak", action="store", help=word_wrap("Restore a BAK file, overwriting any non-BAK file."))
@@ -66,14 +90,24 @@ def soulstruct_main(ss_args):
 
     if ss_args.binderpack is not None:
         from soulstruct.containers import Binder
-        binder = Binder.from_unpacked_path(ss_args.binderpack)
-        binder.write()
+        paths = _expand_glob_args(ss_args.binderpack)
+        if not paths:
+            return
+        start = time.perf_counter()
+        processes, threads = _split_workers(ss_args.workers, len(paths))
+        results = Binder.pack_batch(paths, processes=processes, threads=threads)
+        _log_binder_batch_summary("Packed", paths, results, time.perf_counter() - start)
         return
 
     if ss_args.binderunpack is not None:
         from soulstruct.containers import Binder
-        binder = Binder.from_path(ss_args.binderunpack)
-        binder.write_unpacked_directory()
+        paths = _expand_glob_args(ss_args.binderunpack)
+        if not paths:
+            return
+        start = time.perf_counter()
+        processes, threads = _split_workers(ss_args.workers, len(paths))
+        results = Binder.unpack_batch(paths, processes=processes, threads=threads)
+        _log_binder_batch_summary("Unpacked", paths, results, time.perf_counter() - start)
         return
 
     if ss_args.tpfunpack is not None:
@@ -115,8 +149,41 @@ def soulstruct_main(ss_args):
     return
 
 
-try:
-    soulstruct_main(parser.parse_args())
-except Exception as ex:
-    _LOGGER.exception(f"Error occurred in soulstruct.__main__: {ex}")
-    input("Press any key to exit.")
+def _split_workers(workers: int, binder_count: int) -> tuple[int, int]:
+    """Split `workers` into `(processes, threads)` for up to `binder_count` processes, so that at most `workers` threads
+    run in total."""
+    processes = max(1, min(workers, binder_count))
+    return processes, max(1, workers // processes)
+
+
+def _expand_glob_args(patterns: list[str]) -> list[Path]:
+    """Expand any glob patterns in `patterns` (sorted). Plain paths are kept as they are."""
+    paths = []
+    for pattern in patterns:
+        if any(c in pattern for c in "*?["):
+            matches = sorted(glob.glob(pattern))
+            if not matches:
+                _LOGGER.warning(f"No files match pattern: {pattern}")
+            paths += [Path(match) for match in matches]
+        else:
+            paths.append(Path(pattern))
+    return paths
+
+
+def _log_binder_batch_summary(verb: str, paths: list[Path], results: list[int | None], elapsed: float):
+    failed = [path for path, size in zip(paths, results) if size is None]
+    total_mb = sum(size for size in results if size is not None) / 1024 ** 2
+    _LOGGER.info(
+        f"{verb} {len(paths) - len(failed)} / {len(paths)} binders ({total_mb:.1f} MB) in {elapsed:.2f} s "
+        f"({total_mb / max(elapsed, 1e-6):.1f} MB/s)."
+    )
+    if failed:
+        _LOGGER.error("Failed binders:\n    " + "\n    ".join(str(path) for path in failed))
+
+
+if __name__ == "__main__":  # not run again by worker processes that import this module
+    try:
+        soulstruct_main(parser.parse_args())
+    except Exception as ex:
+        _LOGGER.exception(f"Error occurred in soulstruct.__main__: {ex}")
+        input("Press any key to exit.")
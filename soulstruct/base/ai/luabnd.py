@@ -37,12 +37,12 @@ class LuaBND(Binder):
     is_lua_32: bool = False  # as opposed to 64-bit (can't decompile 32-bit at present)
 
     @classmethod
-    def from_reader(cls, reader: BinaryReader, bdt_reader: BinaryReader | None = None) -> tp.Self:
+    def from_reader(cls, reader: BinaryReader, bdt_reader: BinaryReader | None = None, lazy=False) -> tp.Self:
         if bdt_reader is not None:
             raise TypeError("Cannot read `LuaBND` from a split `BXF` file.")
 
         # TODO: This seems dodgy, type-wise. Will `luabnd` be a `Binder` object?
-        luabnd = super(LuaBND, cls).from_reader(reader)  # type: tp.Self
+        luabnd = super(LuaBND, cls).from_reader(reader, lazy=lazy)  # type: tp.Self
 
         # Load goals and unknown scripts.
         try:
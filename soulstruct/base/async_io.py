@@ -0,0 +1,68 @@
+"""Helpers for loading and writing files from `asyncio` code without blocking the event loop.
+
+`BaseBinaryFile.from_path_async()`, `from_path_batch_async()`, and `write_async()` run file I/O and parsing/packing on
+an executor. By default this is the event loop's default thread pool; parsing is mostly pure Python, so for real
+parallelism across many files, set a process pool instead:
+
+    from concurrent.futures import ProcessPoolExecutor
+    from soulstruct.base.async_io import set_async_executor
+    set_async_executor(ProcessPoolExecutor(max_workers=8))
+
+    msbs = await MSB.from_path_batch_async(msb_paths, limit=16)
+
+Note that with a process pool, instances are pickled to and from worker processes, and any changes that `write()` makes
+to the instance (like `Binder.entry_autogen()`) happen to the worker's copy only.
+"""
+from __future__ import annotations
+
+__all__ = [
+    "get_async_executor",
+    "set_async_executor",
+    "run_in_executor",
+    "gather_limited",
+]
+
+import asyncio
+import functools
+import typing as tp
+from concurrent.futures import Executor
+
+T = tp.TypeVar("T")
+
+_ASYNC_EXECUTOR = None  # type: Executor | None
+
+
+def get_async_executor() -> Executor | None:
+    return _ASYNC_EXECUTOR
+
+
+def set_async_executor(executor: Executor | None):
+    """Set executor used by `*_async` file methods, or use the event loop's default executor with `None`."""
+    global _ASYNC_EXECUTOR
+    _ASYNC_EXECUTOR = executor
+
+
+async def run_in_executor(func: tp.Callable[..., T], *args, executor: Executor = None, **kwargs) -> T:
+    """Run `func(*args, **kwargs)` on `executor` (default: `get_async_executor()`) and await its result."""
+    loop = asyncio.get_running_loop()
+    if kwargs:
+        func = functools.partial(func, **kwargs)
+    return await loop.run_in_executor(executor or _ASYNC_EXECUTOR, func, *args)
+
+
+async def gather_limited(
+    awaitables: tp.Iterable[tp.Awaitable[T]], limit: int = None, return_exceptions=False
+) -> list[T]:
+    """Like `asyncio.gather()`, but with at most `limit` of the given awaitables running at once (no limit if `None`).
+
+    Coroutines are only started when a slot is free, so this is safe to use with thousands of file operations.
+    """
+    if limit is None:
+        return await asyncio.gather(*awaitables, return_exceptions=return_exceptions)
+    semaphore = asyncio.Semaphore(limit)
+
+    async def _limited(awaitable: tp.Awaitable[T]) -> T:
+        async with semaphore:
+            return await awaitable
+
+    return await asyncio.gather(*(_limited(a) for a in awaitables), return_exceptions=return_exceptions)
@@ -7,10 +7,10 @@ __all__ = [
 ]
 
 import abc
+import contextlib
 import copy
 import json
 import logging
-import multiprocessing
 import re
 import traceback
 import typing as tp
@@ -18,9 +18,17 @@ from dataclasses import dataclass, asdict, field, fields
 from pathlib import Path
 
 from soulstruct.games import Game, get_game
+from soulstruct.profiling import get_active_profile, get_remaining_size, profile_category, profile_span
 from soulstruct.utilities.binary import *
-from soulstruct.utilities.files import create_bak, read_json, write_json, get_blake2b_hash
-from soulstruct.dcx import DCXType, compress, decompress, is_dcx
+from soulstruct.utilities.files import (
+    create_bak, read_json, write_json, get_blake2b_hash, get_cached_file_hash, set_cached_file_hash
+)
+from soulstruct.utilities.worker_pool import batch_starmap, get_worker_pool
+from soulstruct.dcx import DCXType, DCXStreamReader, compress, decompress, get_dcx_buffer_pool, get_dcx_policy, is_dcx
+
+from .async_io import gather_limited, run_in_executor
+from .build_manifest import get_build_manifest
+from .parsed_cache import get_parsed_file_cache
 
 if tp.TYPE_CHECKING:
     from soulstruct.containers.entry import BinderEntry
@@ -70,12 +78,15 @@ class BaseBinaryFile:
         pass
 
     def __bytes__(self) -> bytes:
-        """Applies `dcx_type` DCX automatically."""
-        packed = bytes(self.to_writer())
-        dcx_type = self._get_dcx_type()
-        if dcx_type != DCXType.Null:
-            return compress(packed, dcx_type)
-        return packed
+        """Applies `dcx_type` DCX automatically, using the `DCXPolicy` for this class (see `dcx.set_dcx_policy()`)."""
+        with profile_category(type(self).__name__):
+            with profile_span("to_writer") as event:
+                packed = bytes(self.to_writer())
+                event.size = len(packed)
+            dcx_type = self._get_dcx_type()
+            if dcx_type != DCXType.Null:
+                return compress(packed, dcx_type, policy=get_dcx_policy(type(self)))
+            return packed
 
     def to_bytes(self) -> bytes:
         """More explicit version of `__bytes__`."""
@@ -88,15 +99,17 @@ class BaseBinaryFile:
         Failed conversions will put `None` into list rather than `bytes`.
         """
         mp_args = [(file,) for file in files]
-        with multiprocessing.Pool(processes=processes) as pool:
-            file_data = pool.starmap(_to_bytes_mp, mp_args)  # blocks here until all done
-        return file_data
+        return batch_starmap(_to_bytes_mp, mp_args, processes)
 
     @classmethod
     def from_path(cls, path: str | Path) -> tp.Self:
         path = Path(path)
         try:
-            binary_file = cls.from_bytes(BinaryReader(path))
+            if (cache := get_parsed_file_cache()) is not None:
+                data = path.read_bytes()
+                binary_file = cache.get_or_parse(cls, data, lambda: cls.from_bytes(data))
+            else:
+                binary_file = cls.from_bytes(BinaryReader(path))
         except Exception:
             traceback.print_exc()
             _LOGGER.error(f"Error occurred while reading `{cls.__name__}` with path '{path}'. See traceback.")
@@ -114,37 +127,76 @@ class BaseBinaryFile:
 
         Failed conversions will put `None` into list rather than a `BaseBinaryFile` instance.
         """
-
         mp_args = [(cls, Path(path)) for path in paths]
+        return batch_starmap(_from_path_mp, mp_args, processes)
 
-        with multiprocessing.Pool(processes=processes) as pool:
-            files = pool.starmap(_from_path_mp, mp_args)  # blocks here until all done
+    @classmethod
+    def iter_from_path_batch(
+        cls, paths: tp.Iterable[Path | str], ordered=True
+    ) -> tp.Iterator[tuple[Path, BASE_BINARY_FILE_T | None]]:
+        """Like `from_path_batch()`, but yield `(path, file)` pairs as soon as each file is loaded, so the caller can
+        start using files (and let them be garbage-collected) while later ones are still loading.
+
+        Files are yielded in the order of `paths` if `ordered` is True, or as soon as they finish otherwise. Uses the
+        shared worker pool (see `utilities.worker_pool`).
+        """
+        mp_args = ((cls, Path(path)) for path in paths)
+        yield from get_worker_pool().imap(_from_path_with_path_mp, mp_args, ordered=ordered)
 
-        return files
+    @classmethod
+    async def from_path_async(cls, path: str | Path) -> tp.Self:
+        """Asynchronous `from_path()`, which reads and parses the file on the async executor (see `base.async_io`)."""
+        return await run_in_executor(cls.from_path, Path(path))
+
+    @classmethod
+    async def from_path_batch_async(
+        cls, paths: tp.Iterable[Path | str], limit: int | None = 8
+    ) -> list[BASE_BINARY_FILE_T | None]:
+        """Asynchronously load each path in `paths`, with at most `limit` files being loaded at once.
+
+        Failed conversions will put `None` into list rather than a `BaseBinaryFile` instance.
+        """
+        return await gather_limited((run_in_executor(_from_path_mp, cls, Path(path)) for path in paths), limit)
 
     @classmethod
     def from_bytes(cls, data: bytes | bytearray | tp.BinaryIO | BinaryReader | BinderEntry) -> tp.Self:
-        """Load instance from binary data or binary stream (or `BinderEntry.data`)."""
+        """Load instance from binary data or binary stream (or `BinderEntry.data`).
+
+        A `DCXStreamReader` from `dcx.decompress_stream()` can also be given, in which case the file is parsed directly
+        from the lazily-decompressed stream and its `dcx_type` is recorded.
+        """
         reader = BinaryReader(data) if not isinstance(data, BinaryReader) else data  # type: BinaryReader
 
-        if is_dcx(reader):
+        with contextlib.ExitStack() as stack:
+            stack.enter_context(profile_category(cls.__name__))
+            if isinstance(reader.buffer, DCXStreamReader):
+                dcx_type = reader.buffer.dcx_type
+            elif is_dcx(reader):
+                try:
+                    if (buffer_pool := get_dcx_buffer_pool()) is not None:
+                        # Decompressed buffer is returned to pool when parsing is done.
+                        stream, dcx_type = stack.enter_context(buffer_pool.decompress(reader))
+                        data = stream
+                    else:
+                        data, dcx_type = decompress(reader)
+                finally:
+                    reader.close()
+                reader = BinaryReader(data)
+            else:
+                dcx_type = DCXType.Null
+
             try:
-                data, dcx_type = decompress(reader)
+                with profile_span("from_reader") as event:
+                    if get_active_profile() is not None:
+                        event.size = get_remaining_size(reader.buffer)
+                    binary_file = cls.from_reader(reader)
+                binary_file.dcx_type = dcx_type
+            except Exception:
+                traceback.print_exc()
+                _LOGGER.error(f"Error occurred while reading `{cls.__name__}` from binary data. See traceback.")
+                raise
             finally:
                 reader.close()
-            reader = BinaryReader(data)
-        else:
-            dcx_type = DCXType.Null
-
-        try:
-            binary_file = cls.from_reader(reader)
-            binary_file.dcx_type = dcx_type
-        except Exception:
-            traceback.print_exc()
-            _LOGGER.error(f"Error occurred while reading `{cls.__name__}` from binary data. See traceback.")
-            raise
-        finally:
-            reader.close()
         return binary_file
 
     @classmethod
@@ -154,9 +206,7 @@ class BaseBinaryFile:
         Failed conversions will put `None` into list rather than a `BaseBinaryFile` instance.
         """
         mp_args = [(cls, data) for data in data_list]
-        with multiprocessing.Pool(processes=processes) as pool:
-            files = pool.starmap(_from_bytes_mp, mp_args)  # blocks here until all done
-        return files
+        return batch_starmap(_from_bytes_mp, mp_args, processes)
 
     @classmethod
     def from_binder_entry(cls, binder_entry: BinderEntry) -> tp.Self:
@@ -172,9 +222,7 @@ class BaseBinaryFile:
         Failed conversions will put `None` into list rather than a `BaseBinaryFile` instance.
         """
         mp_args = [(cls, entry) for entry in entry_list]
-        with multiprocessing.Pool(processes=processes) as pool:
-            files = pool.starmap(_from_binder_entry_mp, mp_args)  # blocks here until all done
-        return files
+        return batch_starmap(_from_binder_entry_mp, mp_args, processes)
 
     @classmethod
     def from_dict(cls, data: dict) -> tp.Self:
@@ -200,6 +248,9 @@ class BaseBinaryFile:
         Will compress with DCX automatically and add `.dcx` file extension if `.dcx_type` is not `Null`. Will also
         automatically create a `.bak` version of the `file_path`, if a backup does not already exist.
 
+        If a build manifest is active (see `base.build_manifest`), the file is not packed or written at all if it was
+        last written from an identical instance (and has not been changed since), and all writes are recorded in it.
+
         Args:
             file_path (None, str, Path): file path to write to. Defaults to `self.path`, which is automatically set at
                 instance creation if a file path is used as a source.
@@ -211,17 +262,44 @@ class BaseBinaryFile:
             written. (Child classes may write multiple files.)
         """
         file_path = self.get_file_path(file_path)
+        manifest = get_build_manifest()
+        fingerprint = None
+        if manifest is not None:
+            fingerprint = manifest.get_fingerprint(self)
+            if manifest.is_up_to_date(file_path, fingerprint):
+                return []  # don't pack or write file
+        self._prepare_write()
         if make_dirs:
             file_path.parent.mkdir(parents=True, exist_ok=True)
         packed_dcx = bytes(self)
-        if check_hash and file_path.is_file():
-            if get_blake2b_hash(file_path) == get_blake2b_hash(packed_dcx):
+        packed_hash = get_blake2b_hash(packed_dcx)
+        if check_hash:
+            existing_hash = manifest.get_output_hash(file_path) if manifest else get_cached_file_hash(file_path)
+            if existing_hash == packed_hash:
+                if manifest is not None:
+                    manifest.record(file_path, packed_hash, (fingerprint, manifest.get_fingerprint(self)))
                 return []  # don't write file
         create_bak(file_path)
         with file_path.open("wb") as f:
             f.write(packed_dcx)
+        set_cached_file_hash(file_path, packed_hash)
+        if manifest is not None:
+            # Fingerprint again after packing, which may have normalized some instance state.
+            manifest.record(file_path, packed_hash, (fingerprint, manifest.get_fingerprint(self)))
         return [file_path]
 
+    def _prepare_write(self):
+        """Called by `write()` just before packing, after any build manifest check. Subclasses can override this to
+        update instance state (e.g. binder entries) that only needs updating if the file will actually be packed."""
+        pass
+
+    async def write_async(self, *args, **kwargs) -> list[Path]:
+        """Asynchronous `write()`, which packs and writes the file on the async executor (see `base.async_io`).
+
+        All arguments are passed to `write()`.
+        """
+        return await run_in_executor(self.write, *args, **kwargs)
+
     def to_dict(self) -> dict[str, tp.Any]:
         """Create a dictionary from file instance. Uses `dataclasses.asdict()` by default and ignores internals."""
         return asdict(
@@ -398,6 +476,13 @@ def _from_path_mp(file_type: type[BASE_BINARY_FILE_T], path: Path) -> BASE_BINAR
         return None
 
 
+def _from_path_with_path_mp(
+    file_type: type[BASE_BINARY_FILE_T], path: Path
+) -> tuple[Path, BASE_BINARY_FILE_T | None]:
+    """Function for streaming batch operator."""
+    return path, _from_path_mp(file_type, path)
+
+
 def _from_bytes_mp(file_type: type[BASE_BINARY_FILE_T], data: bytes) -> BASE_BINARY_FILE_T | None:
     """Function for batch operator."""
     try:
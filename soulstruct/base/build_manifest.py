@@ -0,0 +1,270 @@
+"""Persistent record of written game files, used to skip rebuilding files whose inputs have not changed.
+
+Packing and compressing every file of a project on every build is slow, even with `check_hash=True` (which still packs
+the file, then re-reads and hashes the existing file from disk, only to decide not to write it). With a build manifest
+active, `BaseBinaryFile.write()` and `GameFileDirectory.write()` first compare a cheap fingerprint of each instance with
+the fingerprint recorded when its output file was last written, and skip packing entirely if nothing has changed:
+
+    from soulstruct.base.build_manifest import build_manifest
+    with build_manifest(project_directory):  # loads (and afterward saves) `project_directory/.soulstruct_build.json`
+        event_directory.write(game_event_directory)
+        game_param_bnd.write(game_param_path)
+
+For each output file, the manifest records:
+    - the fingerprint of the instance written to it (a hash of its pickled public fields, the class, the Soulstruct
+      version, and the `DCXPolicy` used to compress it);
+    - the hash, size, and modification time of the written data, so that existing output hashes never need to be
+      recomputed from disk (and output files changed by anything else are detected and rewritten);
+    - optionally, the hashes of source files (e.g. EVS scripts) that it was built from, so that tools can skip even
+      loading sources that have not changed (see `BuildManifest.check_sources()`).
+
+A stale or deleted manifest only ever causes files to be rebuilt, never skipped.
+"""
+from __future__ import annotations
+
+__all__ = [
+    "BuildManifest",
+    "get_build_manifest",
+    "set_build_manifest",
+    "build_manifest",
+]
+
+import contextlib
+import dataclasses
+import json
+import logging
+import os
+import pickle
+import tempfile
+import threading
+import typing as tp
+from pathlib import Path
+
+from soulstruct.dcx import get_dcx_policy
+from soulstruct.utilities.files import get_blake2b_hash, get_cached_file_hash
+
+if tp.TYPE_CHECKING:
+    from .base_binary_file import BaseBinaryFile
+
+_LOGGER = logging.getLogger("soulstruct")
+
+
+class BuildManifest:
+    """Maps output file paths to the fingerprints, output hashes, and source hashes of their last build.
+
+    Paths inside `project_directory` are stored relative to it, so the project can be moved. Safe to use from multiple
+    threads. Call `save()` (or use `build_manifest()`) to persist changes.
+    """
+
+    FILE_NAME: tp.ClassVar[str] = ".soulstruct_build.json"
+    VERSION: tp.ClassVar[int] = 1
+
+    project_directory: Path
+    path: Path
+    skipped_count: int
+
+    def __init__(self, project_directory: str | Path, path: str | Path = None):
+        self.project_directory = Path(project_directory).resolve()
+        self.path = Path(path) if path is not None else self.project_directory / self.FILE_NAME
+        self.skipped_count = 0
+        self._lock = threading.Lock()
+        self._entries = {}  # type: dict[str, dict[str, tp.Any]]
+        self._modified = False
+        if self.path.is_file():
+            try:
+                manifest = json.loads(self.path.read_text(encoding="utf-8"))
+                if manifest.get("version") == self.VERSION:
+                    self._entries = manifest["files"]
+                else:
+                    _LOGGER.info(f"Ignoring build manifest with old version: {self.path}")
+            except (OSError, ValueError, KeyError) as ex:
+                _LOGGER.warning(f"Could not read build manifest {self.path} ({ex}). All files will be rebuilt.")
+
+    def _get_key(self, file_path: str | Path) -> str:
+        file_path = Path(file_path).resolve()
+        try:
+            return file_path.relative_to(self.project_directory).as_posix()
+        except ValueError:
+            return file_path.as_posix()
+
+    @staticmethod
+    def get_fingerprint(instance: BaseBinaryFile) -> str | None:
+        """Hash of `instance` state and everything else that affects its packed data (except Soulstruct code changes
+        within the same version), or `None` if `instance` state cannot be pickled.
+
+        Only the public `init` fields of dataclass instances are hashed. Private and transient state (e.g. the entry
+        index of `Binder`, or flags set by `write()` itself) does not affect packed data and is ignored. Note that
+        packing can normalize some instance state the first time, so fingerprints from before and after packing should
+        be recorded.
+        """
+        import soulstruct
+        if dataclasses.is_dataclass(instance):
+            state = [
+                (f.name, getattr(instance, f.name))
+                for f in dataclasses.fields(instance)
+                if f.init and not f.name.startswith("_")
+            ]
+        else:
+            state = instance
+        try:
+            pickled_state = pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            return None
+        file_type = type(instance)
+        version = getattr(soulstruct, "__version__", "UNKNOWN")
+        context = f"{version}:{file_type.__module__}.{file_type.__qualname__}:{get_dcx_policy(file_type)!r}"
+        return get_blake2b_hash(context.encode() + pickled_state).hex()
+
+    def _get_valid_entry(self, file_path: Path, key: str) -> dict[str, tp.Any] | None:
+        """Get entry for `file_path` if the file still exists with the size and modification time recorded for it."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        try:
+            stat = file_path.stat()
+        except OSError:
+            return None
+        if stat.st_size != entry["size"] or stat.st_mtime_ns != entry["mtime_ns"]:
+            return None
+        return entry
+
+    def is_up_to_date(self, file_path: str | Path, fingerprint: str | None) -> bool:
+        """Check if `file_path` was last written (and not changed since) from an instance with `fingerprint`, before or
+        after packing it."""
+        if fingerprint is None:
+            return False
+        file_path = Path(file_path)
+        key = self._get_key(file_path)
+        with self._lock:
+            entry = self._get_valid_entry(file_path, key)
+            if entry is not None and fingerprint in entry["fingerprints"]:
+                self.skipped_count += 1
+                return True
+        return False
+
+    def get_output_hash(self, file_path: str | Path) -> bytes | None:
+        """Get hash of existing `file_path` from the manifest if it has not changed since it was recorded, or hash the
+        file itself (with `get_cached_file_hash()`) otherwise. Returns `None` if the file does not exist."""
+        file_path = Path(file_path)
+        key = self._get_key(file_path)
+        with self._lock:
+            entry = self._get_valid_entry(file_path, key)
+        if entry is not None:
+            return bytes.fromhex(entry["output_hash"])
+        return get_cached_file_hash(file_path)
+
+    def check_sources(self, file_path: str | Path, source_paths: tp.Iterable[str | Path]) -> bool:
+        """Check if existing `file_path` was last built from exactly `source_paths` with their current contents."""
+        file_path = Path(file_path)
+        key = self._get_key(file_path)
+        with self._lock:
+            entry = self._get_valid_entry(file_path, key)
+        if entry is None or not entry.get("sources"):
+            return False
+        sources = {}
+        for source_path in source_paths:
+            source_hash = get_cached_file_hash(source_path)
+            if source_hash is None:
+                return False
+            sources[self._get_key(source_path)] = source_hash.hex()
+        if sources != entry["sources"]:
+            return False
+        with self._lock:
+            self.skipped_count += 1
+        return True
+
+    def record(
+        self,
+        file_path: str | Path,
+        output_hash: bytes,
+        fingerprints: tp.Iterable[str | None] = (),
+        source_paths: tp.Iterable[str | Path] = (),
+    ):
+        """Record that `file_path` (which must exist) now contains data with `output_hash`, packed from an instance with
+        any of `fingerprints` (usually from before and after packing) and built from `source_paths` (if any)."""
+        file_path = Path(file_path)
+        stat = file_path.stat()
+        sources = {}
+        for source_path in source_paths:
+            if (source_hash := get_cached_file_hash(source_path)) is not None:
+                sources[self._get_key(source_path)] = source_hash.hex()
+        with self._lock:
+            self._entries[self._get_key(file_path)] = {
+                "fingerprints": sorted({fingerprint for fingerprint in fingerprints if fingerprint is not None}),
+                "output_hash": output_hash.hex(),
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+                "sources": sources,
+            }
+            self._modified = True
+
+    def forget(self, file_path: str | Path):
+        """Remove any entry for `file_path`, so it will be rebuilt next time."""
+        with self._lock:
+            if self._entries.pop(self._get_key(file_path), None) is not None:
+                self._modified = True
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._modified = True
+
+    def save(self):
+        """Write manifest JSON file (via a temporary file, so an interrupted save never corrupts it) if changed."""
+        with self._lock:
+            if not self._modified:
+                return
+            manifest_json = json.dumps({"version": self.VERSION, "files": self._entries}, indent=1)
+            self._modified = False
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_name = tempfile.mkstemp(dir=self.path.parent, prefix=f"{self.path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(manifest_json)
+            os.replace(temp_name, self.path)
+        except BaseException:
+            Path(temp_name).unlink(missing_ok=True)
+            raise
+
+    def __contains__(self, file_path: str | Path) -> bool:
+        return self._get_key(file_path) in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return f"BuildManifest('{self.path}', {len(self)} files, skipped={self.skipped_count})"
+
+
+_BUILD_MANIFEST = None  # type: BuildManifest | None
+
+
+def get_build_manifest() -> BuildManifest | None:
+    return _BUILD_MANIFEST
+
+
+def set_build_manifest(manifest: BuildManifest | str | Path | None):
+    """Use build manifest (given instance or project directory) for all file writes, or disable with `None`.
+
+    Note that the manifest is not saved automatically; call `save()` on it afterward, or use `build_manifest()`.
+    """
+    global _BUILD_MANIFEST
+    if isinstance(manifest, (str, Path)):
+        manifest = BuildManifest(manifest)
+    _BUILD_MANIFEST = manifest
+
+
+@contextlib.contextmanager
+def build_manifest(project_directory: str | Path, path: str | Path = None) -> tp.Iterator[BuildManifest]:
+    """Use build manifest of `project_directory` inside this block, then save it and restore any previous manifest.
+
+    The manifest is saved even if an error occurs, as it only records files that were written successfully.
+    """
+    global _BUILD_MANIFEST
+    manifest = BuildManifest(project_directory, path)
+    previous, _BUILD_MANIFEST = _BUILD_MANIFEST, manifest
+    try:
+        yield manifest
+    finally:
+        _BUILD_MANIFEST = previous
+        manifest.save()
@@ -86,6 +86,9 @@ class TalkESDBND(Binder, abc.ABC):
             else:
                 talk_esd.write_esp_directory(esp_directory / f"t{talk_id}", esd_type=ESDType.TALK)
 
+    def entry_autogen(self):
+        self.regenerate_entries()
+
     def regenerate_entries(self):
         """Regenerate Binder entries from `talk` dictionary."""
 
@@ -95,12 +98,14 @@ class TalkESDBND(Binder, abc.ABC):
             if entry_name not in current_entry_names:
                 self.remove_entry_name(entry_name)
 
+        entry_talk_esds = []
         for talk_entry_name, talk_esd in zip(current_entry_names, self.talk.values(), strict=True):
             entry_path = self.get_default_entry_path(talk_entry_name)
             entry = self.set_default_entry(entry_path)
             if not entry.data:
                 _LOGGER.debug(f"New ESD entry added to `TalkESDBND`: {talk_entry_name}")
-            entry.set_from_binary_file(talk_esd)
+            entry_talk_esds.append((entry, talk_esd))
+        self.set_entries_from_binary_files(entry_talk_esds)
 
         # Sort entries by name.
         self.entries.sort(key=lambda entry: entry.name)
@@ -125,7 +130,6 @@ class TalkESDBND(Binder, abc.ABC):
             raise TypeError(
                 f"Cannot write `TalkESDBND` to a split `BXF` file. (Invalid `bdt_file_path`: {bdt_file_path})"
             )
-        self.regenerate_entries()
         return super(TalkESDBND, self).write(file_path, make_dirs=make_dirs, check_hash=check_hash)
 
     @classmethod
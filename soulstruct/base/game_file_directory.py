@@ -1,16 +1,29 @@
 from __future__ import annotations
 
-__all__ = ["GameFileDirectory", "GameFileMapDirectory", "map_property"]
+__all__ = ["GameFileDirectory", "GameFileMapDirectory", "LazyFileDict", "map_property"]
 
 import abc
 import logging
+import os
+import pickle
 import re
+import shutil
+import tempfile
+import threading
+import traceback
 import typing as tp
+from collections.abc import MutableMapping
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
 
+from soulstruct.dcx import DCXPolicy, dcx_policy, get_dcx_policy
 from .base_binary_file import BaseBinaryFile, BASE_BINARY_FILE_T
-from ..utilities.files import create_bak, get_blake2b_hash
+from .build_manifest import BuildManifest, get_build_manifest
+from ..utilities.files import (
+    copy_file_mode, create_bak, get_blake2b_hash, get_cached_file_hash, set_cached_file_hash
+)
+from ..utilities.worker_pool import batch_starmap
 
 if tp.TYPE_CHECKING:
     from .game_types.map_types import Map
@@ -19,12 +32,111 @@ if tp.TYPE_CHECKING:
 _LOGGER = logging.getLogger("soulstruct")
 
 
+class LazyFileDict(MutableMapping[str, BASE_BINARY_FILE_T]):
+    """`files` mapping of a `GameFileDirectory` opened with `lazy=True`.
+
+    Only file paths are recorded on creation. Each file is loaded with `load_func` (usually `FILE_CLASS.from_path`) the
+    first time it is accessed (by key, or by iterating over `values()` or `items()`), so a tool that only needs one or
+    two files from a large directory does not have to wait for all of them to be parsed. Iterating over keys and `len()`
+    never load anything. Files can also be loaded ahead of time in a background thread with `prefetch()`.
+
+    Errors raised while loading a file are raised on access (and the file remains unloaded).
+    """
+
+    def __init__(self, paths: dict[str, Path], load_func: tp.Callable[[Path], BASE_BINARY_FILE_T]):
+        # Maps all stems (in order) to the path they will be loaded from, or `None` if assigned directly.
+        self._paths = dict(paths)  # type: dict[str, Path | None]
+        self._files = {}  # type: dict[str, BASE_BINARY_FILE_T]
+        self._load_func = load_func
+        self._lock = threading.Lock()
+        self._load_locks = {}  # type: dict[str, threading.Lock]
+
+    def __getitem__(self, stem: str) -> BASE_BINARY_FILE_T:
+        try:
+            return self._files[stem]
+        except KeyError:
+            pass
+        with self._lock:
+            path = self._paths[stem]  # raises `KeyError` for unknown stem
+            load_lock = self._load_locks.setdefault(stem, threading.Lock())
+        with load_lock:  # another thread (e.g. prefetch) may be loading this file already
+            if stem not in self._files:
+                instance = self._load_func(path)
+                with self._lock:
+                    if stem in self._paths:  # not deleted while loading
+                        self._files.setdefault(stem, instance)
+        return self._files[stem]
+
+    def __setitem__(self, stem: str, instance: BASE_BINARY_FILE_T):
+        with self._lock:
+            self._paths.setdefault(stem, None)
+            self._files[stem] = instance
+
+    def __delitem__(self, stem: str):
+        with self._lock:
+            del self._paths[stem]
+            self._files.pop(stem, None)
+
+    def __iter__(self) -> tp.Iterator[str]:
+        return iter(list(self._paths))
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def __contains__(self, stem: object) -> bool:
+        return stem in self._paths
+
+    def is_loaded(self, stem: str) -> bool:
+        """Check if file `stem` has been loaded (or assigned). Raises `KeyError` if `stem` is unknown."""
+        if stem not in self._paths:
+            raise KeyError(stem)
+        return stem in self._files
+
+    def get_path(self, stem: str) -> Path | None:
+        """Path that file `stem` was (or will be) loaded from, or `None` if it was assigned directly."""
+        return self._paths[stem]
+
+    @property
+    def loaded_count(self) -> int:
+        return len(self._files)
+
+    def prefetch(self, stems: tp.Iterable[str] = None) -> threading.Thread:
+        """Start loading the given file `stems` (default: all unloaded files) in order in a background thread.
+
+        Accessing a file that is currently being prefetched waits for that load rather than loading it again. Files
+        that fail to load are logged and left unloaded (so the error is raised again on access). Returns the started
+        daemon thread, which can be joined to wait for all prefetching to finish.
+        """
+        stems = list(self._paths) if stems is None else list(stems)
+        for stem in stems:
+            if stem not in self._paths:
+                raise KeyError(f"Cannot prefetch unknown file stem: {stem}")
+
+        def _prefetch():
+            for _stem in stems:
+                try:
+                    self[_stem]
+                except KeyError:
+                    continue  # deleted since prefetch started
+                except Exception as ex:
+                    _LOGGER.warning(f"Failed to prefetch file '{_stem}': {ex}")
+
+        thread = threading.Thread(target=_prefetch, name="LazyFileDict.prefetch", daemon=True)
+        thread.start()
+        return thread
+
+    def __repr__(self) -> str:
+        return f"LazyFileDict(<{len(self)} files, {self.loaded_count} loaded>)"
+
+
 @dataclass(slots=True)
 class GameFileDirectory(tp.Generic[BASE_BINARY_FILE_T], abc.ABC):
     """Python structure for a folder of files in a FromSoftware installation. Implementation is much more flexible.
 
     Typical usage is to specify subclass `FILE_NAME_PATTERN`, `FILE_CLASS`, and `FILE_EXTENSION` to indicate which file
     names should be loaded into which Python class, then use `__post_init__` to compute any other fields if needed.
+
+    With `from_path(..., lazy=True)`, `files` is a `LazyFileDict` that only loads each file on first access.
     """
     FILE_NAME_PATTERN: tp.ClassVar[str]
     FILE_CLASS: tp.ClassVar[type[BaseBinaryFile]]
@@ -32,11 +144,16 @@ class GameFileDirectory(tp.Generic[BASE_BINARY_FILE_T], abc.ABC):
 
     # Tracks directory that instance was loaded from (if any) for argument-free write calls.
     directory: Path | None = field(default=None, kw_only=True)
-    # Maps 'true stems' to `FILE_CLASS` instances.
-    files: dict[str, BASE_BINARY_FILE_T] = field(default_factory=dict, kw_only=True)
+    # Maps 'true stems' to `FILE_CLASS` instances. May be a `LazyFileDict` (see `from_path()`).
+    files: dict[str, BASE_BINARY_FILE_T] | LazyFileDict[BASE_BINARY_FILE_T] = field(default_factory=dict, kw_only=True)
 
     @classmethod
-    def from_path(cls, directory_path: Path | str):
+    def from_path(cls, directory_path: Path | str, lazy=False, prefetch: tp.Iterable[str] | bool = None):
+        """Load all files in `directory_path` that match `FILE_NAME_PATTERN`.
+
+        If `lazy=True`, files are only found here, and each is loaded the first time it is accessed in `files` (see
+        `LazyFileDict`). `prefetch` can then be `True` or an iterable of file stems to start loading in the background.
+        """
         if cls.FILE_NAME_PATTERN is None or cls.FILE_CLASS is None:
             raise TypeError(
                 f"`GameFileDirectory` subclass `{cls.__name__}` must define `FILE_NAME_PATTERN` and `FILE_CLASS` class "
@@ -46,43 +163,128 @@ class GameFileDirectory(tp.Generic[BASE_BINARY_FILE_T], abc.ABC):
         directory_path = Path(directory_path)
         if not directory_path.is_dir():
             raise NotADirectoryError(f"Missing directory: {directory_path}")
-        files = {}
+        file_paths = {}
         file_name_re = re.compile(cls.FILE_NAME_PATTERN + r"(\.dcx)?$")
         for file_path in directory_path.glob("*"):
             if file_name_re.match(file_path.name):
                 file_path_stem = file_path.name.split(".")[0]
-                files[file_path_stem] = cls.FILE_CLASS.from_path(file_path)
+                file_paths[file_path_stem] = file_path
+
+        return cls(directory=directory_path, files=cls._get_files(file_paths, lazy, prefetch))
 
-        return cls(directory=directory_path, files=files)
+    @classmethod
+    def _get_files(
+        cls, file_paths: dict[str, Path], lazy: bool, prefetch: tp.Iterable[str] | bool = None
+    ) -> dict[str, BASE_BINARY_FILE_T] | LazyFileDict[BASE_BINARY_FILE_T]:
+        """Load `FILE_CLASS` instances from `file_paths` now, or wrap them in a `LazyFileDict` if `lazy`."""
+        if not lazy:
+            if prefetch:
+                raise ValueError("`prefetch` can only be used with `lazy=True`.")
+            return {stem: cls.FILE_CLASS.from_path(file_path) for stem, file_path in file_paths.items()}
+        files = LazyFileDict(file_paths, cls.FILE_CLASS.from_path)
+        if prefetch:
+            files.prefetch(None if prefetch is True else prefetch)
+        return files
+
+    def _get_unloaded_stems(self, directory_path: Path) -> set[str]:
+        """Stems of lazy `files` that have never been loaded from `directory_path`, and so need not be written to it."""
+        if not isinstance(self.files, LazyFileDict) or self.directory is None:
+            return set()
+        if directory_path.resolve() != self.directory.resolve():
+            return set()
+        return {stem for stem in self.files if not self.files.is_loaded(stem)}
 
     @staticmethod
     def _write(
-        paths_instances: dict[Path, BaseBinaryFile], check_file_hashes=False, no_partial_write=True
+        paths_instances: dict[Path, BaseBinaryFile],
+        check_file_hashes=False,
+        no_partial_write=True,
+        processes: int = None,
     ) -> list[Path]:
-        """Internal write method. Subclasses may determine file paths differently, then call this."""
-        packed_files = {}  # type: dict[Path, bytes]
-        for file_path, instance in paths_instances.items():
-            try:
-                packed_dcx = bytes(instance)
-            except Exception as ex:
+        """Internal write method. Subclasses may determine file paths differently, then call this.
+
+        Files are written in three stages:
+            1. All instances are packed (and DCX-compressed) in this process by default, as before. If `processes` is
+               greater than one, they are instead packed in parallel in worker processes (see `batch_starmap()`). Note
+               that any changes made to instances by packing itself (e.g. `entry_autogen()` of binders) then only
+               happen to the worker's copy.
+            2. If `check_file_hashes` is True, files whose packed data matches the existing file are dropped. Existing
+               file hashes are cached per process, so files are only re-read from disk if they have changed since.
+            3. Remaining files are written to temporary files next to their targets in a thread pool (also creating
+               any missing `.bak` backups), then all renamed to their final paths at the end (see `_replace_all()`).
+
+        If a build manifest is active (see `base.build_manifest`), files last written from identical instances are
+        dropped before stage 1, and the manifest's recorded output hashes are used in stage 2.
+
+        If `no_partial_write` is True (default), any packing or writing error is raised before any target file is
+        changed, and any error while renaming files restores the targets already replaced. Otherwise, files that fail
+        are logged and skipped.
+        """
+        manifest = get_build_manifest()
+        fingerprints = {}  # type: dict[Path, str | None]
+        if manifest is not None:
+            changed_paths_instances = {}
+            for file_path, instance in paths_instances.items():
+                fingerprint = manifest.get_fingerprint(instance)
+                if manifest.is_up_to_date(file_path, fingerprint):
+                    continue  # don't pack or write file
+                changed_paths_instances[file_path] = instance
+                fingerprints[file_path] = fingerprint
+            paths_instances = changed_paths_instances
+
+        if not paths_instances:
+            return []
+        file_paths = list(paths_instances)
+        packed = _pack_instances(list(paths_instances.values()), processes)
+
+        packed_files = {}  # type: dict[Path, tuple[bytes, bytes]]
+        for file_path, (packed_dcx, data_hash, error, error_traceback) in zip(file_paths, packed):
+            if error is not None:
                 if no_partial_write:
-                    _LOGGER.error(f"Failed to pack {file_path.name} (see traceback). No files written.")
-                    raise
-                _LOGGER.error(f"Failed to pack {file_path.name}: {ex}. Continuing with other files...")
+                    _LOGGER.error(f"Failed to pack {file_path.name}. No files written. Traceback:\n{error_traceback}")
+                    raise error
+                _LOGGER.error(f"Failed to pack {file_path.name}: {error}. Continuing with other files...")
                 continue
-            if check_file_hashes and file_path.is_file():
-                if get_blake2b_hash(file_path) == get_blake2b_hash(packed_dcx):
+            if check_file_hashes:
+                existing_hash = manifest.get_output_hash(file_path) if manifest else get_cached_file_hash(file_path)
+                if existing_hash == data_hash:
+                    if manifest is not None:
+                        _record_in_manifest(manifest, file_path, data_hash, paths_instances[file_path], fingerprints)
                     continue  # don't write file
-            packed_files[file_path] = packed_dcx
-
-        # All files packed successfully (or partial write permitted).
-        written_paths = []
-        for file_path, packed_dcx in packed_files.items():
-            file_path.parent.mkdir(parents=True, exist_ok=True)
-            create_bak(file_path)
-            with file_path.open("wb") as f:
-                f.write(packed_dcx)
-            written_paths.append(file_path)
+            packed_files[file_path] = (packed_dcx, data_hash)
+
+        if not packed_files:
+            return []
+
+        # Write all files to temporary files first.
+        temp_paths = {}  # type: dict[Path, Path]
+        with ThreadPoolExecutor(max_workers=min(len(packed_files), _WRITE_THREADS)) as executor:
+            futures = {
+                file_path: executor.submit(_write_temp_file, file_path, packed_dcx)
+                for file_path, (packed_dcx, _) in packed_files.items()
+            }
+            write_error = None
+            for file_path, future in futures.items():
+                try:
+                    temp_paths[file_path] = future.result()
+                except Exception as ex:
+                    if no_partial_write:
+                        _LOGGER.error(f"Failed to write {file_path.name}: {ex}. No files written.")
+                        write_error = write_error or ex
+                    else:
+                        _LOGGER.error(f"Failed to write {file_path.name}: {ex}. Continuing with other files...")
+        if write_error is not None:
+            for temp_path in temp_paths.values():
+                temp_path.unlink(missing_ok=True)
+            raise write_error
+
+        # All files packed and written successfully (or partial write permitted). Move them into place.
+        written_paths = _replace_all(temp_paths, no_partial_write)
+        for file_path in written_paths:
+            data_hash = packed_files[file_path][1]
+            set_cached_file_hash(file_path, data_hash)
+            if manifest is not None:
+                _record_in_manifest(manifest, file_path, data_hash, paths_instances[file_path], fingerprints)
 
         return written_paths
 
@@ -100,19 +302,24 @@ class GameFileDirectory(tp.Generic[BASE_BINARY_FILE_T], abc.ABC):
         directory_path: Path | str | None = None,
         check_file_hashes: bool = False,
         no_partial_write=True,
+        processes: int = None,
     ) -> list[Path]:
+        """Write all files to `directory_path` (default: `directory`). See `_write()` for argument usage."""
         if directory_path is None:
             if self.directory is None:
                 raise ValueError("Cannot autodetect directory name (`directory` not set).")
             directory_path = self.directory
         directory_path = Path(directory_path)
 
+        # Lazy files that were never loaded are unchanged, so they are not loaded just to rewrite them in place.
+        unloaded_stems = self._get_unloaded_stems(directory_path)
         file_paths = {
-            (directory_path / f"{file_stem}{self.FILE_EXTENSION}"): instance
-            for file_stem, instance in self.files.items()
+            (directory_path / f"{file_stem}{self.FILE_EXTENSION}"): self.files[file_stem]
+            for file_stem in self.files
+            if file_stem not in unloaded_stems
         }
 
-        written_paths = self._write(file_paths, check_file_hashes, no_partial_write)
+        written_paths = self._write(file_paths, check_file_hashes, no_partial_write, processes)
         self._log_directory_write(directory_path, len(written_paths))
         return written_paths
 
@@ -151,7 +358,8 @@ class GameFileMapDirectory(GameFileDirectory[BASE_BINARY_FILE_T], abc.ABC):
     #  `UndeadBurg = property(lambda self: self.files[UNDEAD_BURG.msb_file_stem])`
 
     @classmethod
-    def from_path(cls, directory_path: Path | str):
+    def from_path(cls, directory_path: Path | str, lazy=False, prefetch: tp.Iterable[str] | bool = None):
+        """Load files matching `FILE_NAME_PATTERN` and a map stem in `ALL_MAPS`. See `GameFileDirectory.from_path()`."""
         # NOTE: Pattern is still used in combination with `Map` stems.
         if cls.FILE_NAME_PATTERN is None or cls.FILE_CLASS is None:
             raise TypeError(
@@ -163,13 +371,13 @@ class GameFileMapDirectory(GameFileDirectory[BASE_BINARY_FILE_T], abc.ABC):
         if not directory_path.is_dir():
             raise NotADirectoryError(f"Missing directory: {directory_path}")
         all_map_stems = [getattr(game_map, cls.MAP_STEM_ATTRIBUTE) for game_map in cls.ALL_MAPS]
-        files = {}
+        file_paths = {}
         file_name_re = re.compile(cls.FILE_NAME_PATTERN + r"(\.dcx)?$")
         for file_path in directory_path.glob("*"):
             if file_name_re.match(file_path.name):
                 file_stem = file_path.name.split(".")[0]  # `.stem` not good enough with possible double DCX extension
                 if file_stem in all_map_stems:
-                    files[file_stem] = cls.FILE_CLASS.from_path(file_path)
+                    file_paths[file_stem] = file_path
                     all_map_stems.remove(file_stem)
                 else:
                     if file_stem not in cls.QUIETLY_IGNORED_FILE_STEMS:
@@ -184,10 +392,14 @@ class GameFileMapDirectory(GameFileDirectory[BASE_BINARY_FILE_T], abc.ABC):
         if all_map_stems:
             _LOGGER.warning(f"Could not find some files in `{cls.__name__}` directory: {', '.join(all_map_stems)}")
 
-        return cls(directory=directory_path, files=files)
+        return cls(directory=directory_path, files=cls._get_files(file_paths, lazy, prefetch))
 
     def write(
-        self, directory_path: Path | str | None = None, check_file_hashes=False, no_partial_write=True
+        self,
+        directory_path: Path | str | None = None,
+        check_file_hashes=False,
+        no_partial_write=True,
+        processes: int = None,
     ) -> list[Path]:
         """Same as `GameFileDirectory`, but reports unknown files and if any maps are missing."""
         if directory_path is None:
@@ -197,20 +409,22 @@ class GameFileMapDirectory(GameFileDirectory[BASE_BINARY_FILE_T], abc.ABC):
         directory_path = Path(directory_path)
 
         all_map_stems = [getattr(game_map, self.MAP_STEM_ATTRIBUTE) for game_map in self.ALL_MAPS]
+        unloaded_stems = self._get_unloaded_stems(directory_path)
         file_paths = {}
-        for file_stem, instance in self.files.items():
+        for file_stem in self.files:
             if file_stem in all_map_stems:
                 all_map_stems.remove(file_stem)
             else:
                 _LOGGER.warning(f"Writing unknown map file found in `{self.__class__.__name__}`: {file_stem}")
-            file_paths[directory_path / f"{file_stem}{self.FILE_EXTENSION}"] = instance
+            if file_stem not in unloaded_stems:
+                file_paths[directory_path / f"{file_stem}{self.FILE_EXTENSION}"] = self.files[file_stem]
         if all_map_stems:
             _LOGGER.warning(
                 f"Could not find some file keys while writing `{self.__class__.__name__}` directory: "
                 f"{', '.join(all_map_stems)}"
             )
 
-        written_paths = self._write(file_paths, check_file_hashes, no_partial_write)
+        written_paths = self._write(file_paths, check_file_hashes, no_partial_write, processes)
         if written_paths:
             _LOGGER.info(
                 f"`{self.__class__.__name__}` written to `{directory_path}` successfully "
@@ -223,9 +437,9 @@ class GameFileMapDirectory(GameFileDirectory[BASE_BINARY_FILE_T], abc.ABC):
     def __getitem__(self, map_source: str | tuple) -> BASE_BINARY_FILE_T:
         game_map = self.GET_MAP(map_source)
         map_stem = getattr(game_map, self.MAP_STEM_ATTRIBUTE)
-        for file_name, file_instance in self.files.items():
+        for file_name in self.files:  # avoids loading other lazy files
             if file_name.split(".")[0] == map_stem:
-                return file_instance
+                return self.files[file_name]
         raise KeyError(
             f"Could not find map `{game_map.name}` with stem `{map_stem}` (from spec `{map_source}`) in this "
             f"`{self.__class__.__name__}`."
@@ -235,6 +449,160 @@ class GameFileMapDirectory(GameFileDirectory[BASE_BINARY_FILE_T], abc.ABC):
         return f"{self.__class__.__name__}({self.directory}, <{len(self.files)} files>)"
 
 
+# Maximum number of threads used to write files in `GameFileDirectory._write()`.
+_WRITE_THREADS = 8
+
+
+def _pack(
+    instance: BaseBinaryFile, policy: DCXPolicy
+) -> tuple[bytes | None, bytes | None, Exception | None, str | None]:
+    """Returns packed data and its hash, or the error that occurred and its traceback.
+
+    `policy` is the `DCXPolicy` for `instance` in the calling process, which worker processes may not otherwise see.
+    """
+    try:
+        with dcx_policy(policy, type(instance)):
+            packed_dcx = bytes(instance)
+    except Exception as ex:
+        return None, None, ex, traceback.format_exc()
+    return packed_dcx, get_blake2b_hash(packed_dcx), None, None
+
+
+def _pack_mp(
+    pickled_instance: bytes, policy: DCXPolicy
+) -> tuple[bytes | None, bytes | None, Exception | None, str | None] | None:
+    """Function for batch operator. Returns `None` if the instance cannot be unpickled in this worker.
+
+    Instances are pickled manually (rather than by `multiprocessing`) because a worker that fails to unpickle its task
+    would otherwise be lost, and the pool would wait for its result forever.
+    """
+    try:
+        instance = pickle.loads(pickled_instance)
+    except Exception:
+        return None
+    return _pack(instance, policy)
+
+
+def _try_pickle(instance: BaseBinaryFile) -> bytes | None:
+    try:
+        return pickle.dumps(instance, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        return None
+
+
+def _pack_instances(
+    instances: list[BaseBinaryFile], processes: int = None
+) -> list[tuple[bytes | None, bytes | None, Exception | None, str | None]]:
+    """Pack `instances` in this process, or with `_pack_mp()` in worker processes if `processes` is greater than one.
+
+    Any instances that cannot be sent to or from worker processes are also packed in this process.
+    """
+    policies = [get_dcx_policy(type(instance)) for instance in instances]
+    results = [None] * len(instances)  # type: list[tuple[bytes | None, bytes | None, Exception | None, str | None]]
+    if processes is not None and processes > 1 and len(instances) > 1:
+        args_list = []
+        indices = []
+        for i, (instance, policy) in enumerate(zip(instances, policies)):
+            pickled_instance = _try_pickle(instance)
+            if pickled_instance is not None:
+                args_list.append((pickled_instance, policy))
+                indices.append(i)
+        try:
+            for i, result in zip(indices, batch_starmap(_pack_mp, args_list, processes)):
+                results[i] = result
+        except Exception as ex:
+            _LOGGER.warning(f"Could not pack files in worker processes ({ex}). Packing them in this process instead.")
+    for i, result in enumerate(results):
+        if result is None:
+            results[i] = _pack(instances[i], policies[i])
+    return results
+
+
+def _record_in_manifest(
+    manifest: BuildManifest,
+    file_path: Path,
+    output_hash: bytes,
+    instance: BaseBinaryFile,
+    fingerprints: dict[Path, str | None],
+):
+    """Record `instance` fingerprints from before (in `fingerprints`) and after packing, which may have normalized some
+    instance state."""
+    manifest.record(file_path, output_hash, (fingerprints[file_path], manifest.get_fingerprint(instance)))
+
+
+def _write_temp_file(file_path: Path, data: bytes) -> Path:
+    """Write `data` to a new temporary file in `file_path`'s directory (creating it if needed) and return its path.
+
+    Also creates a backup of any existing `file_path`, as it will later be replaced by the temporary file.
+    """
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    create_bak(file_path)
+    fd, temp_name = tempfile.mkstemp(dir=file_path.parent, prefix=f".{file_path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        copy_file_mode(file_path, temp_name)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
+    return Path(temp_name)
+
+
+def _replace_all(temp_paths: dict[Path, Path], no_partial_write: bool) -> list[Path]:
+    """Rename temporary files (values) to their target paths (keys) and return the target paths replaced.
+
+    If `no_partial_write` is True, each existing target is first hard-linked (or copied) to a rollback file next to it.
+    If any rename fails, every target already replaced is restored from its rollback file (or removed, if it did not
+    exist before), and all remaining temporary files are removed, before the error is raised. Otherwise, files that
+    fail to be renamed are logged and skipped.
+    """
+    replaced = []  # type: list[tuple[Path, Path | None]]  # target path, rollback path (if target existed)
+    try:
+        for file_path, temp_path in temp_paths.items():
+            rollback_path = None
+            if no_partial_write and file_path.is_file():
+                rollback_path = temp_path.with_suffix(".old")
+                try:
+                    os.link(file_path, rollback_path)
+                except OSError:  # hard links unsupported
+                    shutil.copy2(file_path, rollback_path)
+            try:
+                os.replace(temp_path, file_path)
+            except OSError as ex:
+                if rollback_path is not None:
+                    rollback_path.unlink(missing_ok=True)
+                if no_partial_write:
+                    raise
+                _LOGGER.error(f"Failed to replace {file_path.name}: {ex}. Continuing with other files...")
+                temp_path.unlink(missing_ok=True)
+                continue
+            replaced.append((file_path, rollback_path))
+    except BaseException as ex:
+        for temp_path in temp_paths.values():
+            temp_path.unlink(missing_ok=True)  # already gone if renamed
+        unrestored = []
+        for file_path, rollback_path in reversed(replaced):
+            try:
+                if rollback_path is None:
+                    file_path.unlink(missing_ok=True)
+                else:
+                    os.replace(rollback_path, file_path)
+            except OSError:
+                unrestored.append(file_path)
+        if unrestored:
+            _LOGGER.error(
+                f"Failed to replace all files ({ex}), and could not restore these files already replaced (see their "
+                f"`.bak` and `.old` files): {', '.join(str(file_path) for file_path in unrestored)}"
+            )
+        else:
+            _LOGGER.error(f"Failed to replace all files ({ex}). Files already replaced have been restored.")
+        raise
+    for _, rollback_path in replaced:
+        if rollback_path is not None:
+            rollback_path.unlink(missing_ok=True)
+    return [file_path for file_path, _ in replaced]
+
+
 def map_property(game_map: Map):
     """Assists in assigning properties to map names, e.g. `UndeadBurg = map_property(UNDEAD_BURG)"""
     return property(lambda self: self.files[getattr(game_map, self.MAP_STEM_ATTRIBUTE)])
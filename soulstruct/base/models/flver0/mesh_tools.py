@@ -6,11 +6,11 @@ __all__ = [
 ]
 
 import logging
-import multiprocessing
 import typing as tp
 from dataclasses import dataclass
 
 from soulstruct.base.models.base.mesh_tools import SplitSubmeshDef, BaseMergedMesh
+from soulstruct.utilities.worker_pool import batch_starmap
 from .material import Material
 from .vertex_array import VertexArray
 from .submesh import Submesh
@@ -43,10 +43,7 @@ class MergedMesh(BaseMergedMesh):
             (flver, *args) for flver, args in zip(flvers, merged_mesh_args, strict=True)
         ]
 
-        with multiprocessing.Pool(processes=processes) as pool:
-            merged_meshes = pool.starmap(_from_flver_mp, mp_args)  # blocks here until all done
-
-        return merged_meshes
+        return batch_starmap(_from_flver_mp, mp_args, processes)
 
 
 def _from_flver_mp(
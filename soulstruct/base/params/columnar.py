@@ -0,0 +1,513 @@
+"""NumPy-backed alternative to `Param` that stores all row data in one structured array.
+
+`Param` unpacks every row into a `ParamRow` dataclass instance, which is convenient for editing individual rows but slow
+for passes over entire params (e.g. rebalancing every weapon). `ColumnarParam` instead reads the row data block of a
+`.param` file directly into a NumPy structured array, whose `dtype` is generated from the `ParamRow` field metadata, so
+each field is a column that can be read and updated with array operations:
+
+    from soulstruct.base.params.columnar import ColumnarParam
+    weapons = ColumnarParam.from_param(game_param_bnd.params["EquipParamWeapon"])
+    is_dagger = weapons["weaponCategory"] == 0
+    weapons.update(is_dagger, attackBasePhysics=weapons["attackBasePhysics"] * 1.1)
+    weapons["isEnhance"]  # bit fields are computed columns
+    game_param_bnd.params["EquipParamWeapon"] = weapons.to_param()
+
+Consecutive bit fields share one column for their storage unit (named like `_bits_0x1A`, after its row offset), and
+are exposed as computed columns. String fields (rare) are raw, null-padded `bytes` columns. Requires `numpy`.
+"""
+from __future__ import annotations
+
+__all__ = ["ColumnarParam", "TypedColumnarParam"]
+
+import logging
+import struct
+import sys
+import typing as tp
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from soulstruct.base.game_file import GameFile
+from soulstruct.dcx import DCXType
+from soulstruct.utilities.binary import *
+from soulstruct.utilities.text import pad_chars
+
+from .flags import ParamFlags1, ParamFlags2
+from .param import Param, TypedParam
+from .param_row import ParamRow
+
+_LOGGER = logging.getLogger("soulstruct")
+
+
+class _BitField(tp.NamedTuple):
+    unit_name: str  # storage unit column
+    offset: int  # bit offset within unit, from least significant bit
+    bit_count: int
+    field_type: type  # `int` or `bool`
+
+
+@dataclass(slots=True)
+class ColumnarParam(GameFile):
+    """Table of `Param` rows stored as one NumPy structured array `data`, with one element per row.
+
+    Rows are always sorted by ID (and duplicate row IDs discarded), matching what `Param` writes. Like `Param`, this
+    should be retrieved dynamically with `TypedColumnarParam(row_type)`, or created with `from_param()`.
+    """
+    ROW_TYPE: tp.ClassVar[type[ParamRow]] = None
+
+    # Cached on first use: non-bit field names, bit fields, and internal names (mapped to field names).
+    _LAYOUT: tp.ClassVar[tuple[tuple[tuple[str, str], ...], dict[str, _BitField], dict[str, str]]] = None
+
+    EXT: tp.ClassVar[str] = ".param"
+
+    param_type: str = ""
+    big_endian: bool = False
+    unknown: int = 0
+    flags1: ParamFlags1 = ParamFlags1(0)
+    flags2: ParamFlags2 = ParamFlags2(0)
+    paramdef_data_version: int = 0
+    paramdef_format_version: int = 0
+
+    row_ids: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.int32))
+    data: np.ndarray = None
+    # Row names, exactly as read (null-stripped, not decoded). Use `get_row_name()` and `set_row_name()` for `str`.
+    raw_names: list[bytes] = field(default_factory=list)
+
+    def __post_init__(self):
+        if self.data is None:
+            self.data = np.zeros(0, dtype=self.get_dtype(self.big_endian))
+        if not (len(self.row_ids) == len(self.data) == len(self.raw_names)):
+            raise ValueError(
+                f"`ColumnarParam` row IDs ({len(self.row_ids)}), data ({len(self.data)}), and raw names "
+                f"({len(self.raw_names)}) must all have the same length."
+            )
+
+    @classmethod
+    def _get_layout(cls) -> tuple[tuple[tuple[str, str], ...], dict[str, _BitField], dict[str, str]]:
+        """Lay out `ROW_TYPE` fields the same way `BinaryStruct` and `BitFieldReader` do.
+
+        Returns `(name, fmt)` pairs of all array columns (with `fmt` using `struct` characters), bit fields, and a
+        dictionary mapping internal field names to field names.
+        """
+        if "_LAYOUT" in cls.__dict__:
+            return cls._LAYOUT
+        if cls.ROW_TYPE is None:
+            raise TypeError("Cannot get row layout of `ColumnarParam` of unknown row type. Use `TypedColumnarParam`.")
+
+        row_type = cls.ROW_TYPE
+        row_type.get_full_fmt()  # initializes `_FIELD_METADATA`
+        columns = []
+        bit_fields = {}
+        offset = 0
+        unit_name = unit_fmt = ""
+        unit_bit_count = unit_used_bits = 0
+        for binary_field, metadata in zip(row_type.get_binary_fields(), row_type._FIELD_METADATA, strict=True):
+            if metadata.bit_count == -1:
+                unit_fmt = ""  # any unfinished bit field unit is discarded
+                columns.append((binary_field.name, metadata.fmt))
+                offset += struct.calcsize(f"<{metadata.fmt}")
+                continue
+            if metadata.fmt != unit_fmt or unit_used_bits + metadata.bit_count > unit_bit_count:
+                # New storage unit.
+                unit_name = f"_bits_{offset:#x}"
+                unit_fmt = metadata.fmt
+                unit_bit_count = 8 * struct.calcsize(f"<{unit_fmt}")
+                unit_used_bits = 0
+                columns.append((unit_name, unit_fmt))
+                offset += unit_bit_count // 8
+            field_type = bool if metadata.field_type is bool else int
+            bit_fields[binary_field.name] = _BitField(unit_name, unit_used_bits, metadata.bit_count, field_type)
+            unit_used_bits += metadata.bit_count
+
+        internal_names = {
+            field_metadata.internal_name: field_name
+            for field_name, field_metadata in row_type.get_all_field_metadata().items()
+        }
+        cls._LAYOUT = (tuple(columns), bit_fields, internal_names)
+        return cls._LAYOUT
+
+    @classmethod
+    def get_dtype(cls, big_endian=False) -> np.dtype:
+        """NumPy structured `dtype` of one `ROW_TYPE` row, with one field per non-bit field or bit field unit."""
+        columns, _, _ = cls._get_layout()
+        byte_order = ">" if big_endian else "<"
+        return np.dtype([
+            (name, f"S{fmt[:-1] or 1}" if fmt.endswith("s") else f"{byte_order}{fmt}")
+            for name, fmt in columns
+        ])
+
+    @classmethod
+    def get_bit_field_names(cls) -> tuple[str, ...]:
+        return tuple(cls._get_layout()[1])
+
+    @property
+    def field_names(self) -> tuple[str, ...]:
+        return self.ROW_TYPE.get_binary_field_names()
+
+    def _resolve_field_name(self, field_name: str) -> str:
+        columns, bit_fields, internal_names = self._get_layout()
+        if field_name in bit_fields or field_name in self.data.dtype.names:
+            return field_name
+        try:
+            return internal_names[field_name]
+        except KeyError:
+            raise KeyError(f"No field with name '{field_name}' in {self.ROW_TYPE.__name__}.")
+
+    def get_column(self, field_name: str) -> np.ndarray:
+        """Get all values of field `field_name` (name or internal name) as an array, in row ID order.
+
+        Non-bit field columns are views of `data`, which can be modified in place. Bit field columns are computed from
+        their storage unit, so changes to them must be made with `set_column()` or `update()`.
+        """
+        field_name = self._resolve_field_name(field_name)
+        bit_field = self._get_layout()[1].get(field_name)
+        if bit_field is None:
+            return self.data[field_name]
+        unit = self.data[bit_field.unit_name]
+        values = (unit >> bit_field.offset) & ((1 << bit_field.bit_count) - 1)
+        if bit_field.field_type is bool:
+            return values.astype(bool)
+        return values.astype(unit.dtype.newbyteorder("="))
+
+    def __getitem__(self, field_name: str) -> np.ndarray:
+        return self.get_column(field_name)
+
+    def __setitem__(self, field_name: str, values: tp.Any):
+        self.set_column(field_name, values)
+
+    def set_column(self, field_name: str, values: tp.Any, mask: np.ndarray = None):
+        """Set field `field_name` (name or internal name) of all rows, or only rows where boolean array `mask` is true.
+
+        `values` can be a single value or an array of values for all rows. Raises `ValueError` if any value to be set
+        does not fit in the field (rather than letting NumPy silently wrap it).
+        """
+        field_name = self._resolve_field_name(field_name)
+        bit_field = self._get_layout()[1].get(field_name)
+        column = self.data[bit_field.unit_name if bit_field else field_name]
+        values = np.broadcast_to(values, column.shape)
+        if mask is not None:
+            mask = np.asarray(mask, dtype=bool)
+            if mask.shape != column.shape:
+                raise ValueError(f"Mask shape {mask.shape} does not match row count {len(self)}.")
+            values = values[mask]
+
+        if bit_field is not None:
+            max_value = (1 << bit_field.bit_count) - 1
+            if np.any(values < 0) or np.any(values > max_value):
+                raise ValueError(
+                    f"Values of bit field `{field_name}` must be between 0 and {max_value} ({bit_field.bit_count} "
+                    f"bits)."
+                )
+            unit = column if mask is None else column[mask]
+            values = values.astype(unit.dtype)
+            unit_mask = unit.dtype.type(max_value << bit_field.offset)
+            values = (unit & ~unit_mask) | (values << bit_field.offset)
+        elif column.dtype.kind in "iu":
+            limits = np.iinfo(column.dtype)
+            if np.any(values < limits.min) or np.any(values > limits.max):
+                raise ValueError(
+                    f"Values of field `{field_name}` must be between {limits.min} and {limits.max} ({column.dtype})."
+                )
+
+        if mask is None:
+            column[:] = values
+        else:
+            column[mask] = values
+
+    def update(self, mask: np.ndarray = None, **field_values):
+        """Set multiple fields at once (of rows where `mask` is true, if given) with `set_column()`."""
+        for field_name in field_values:
+            self._resolve_field_name(field_name)  # check all names first
+        for field_name, values in field_values.items():
+            self.set_column(field_name, values, mask)
+
+    def get_row_mask(self, row_ids: tp.Iterable[int]) -> np.ndarray:
+        """Boolean array that is true for rows with any of the given `row_ids`."""
+        return np.isin(self.row_ids, np.fromiter(row_ids, dtype=np.int64))
+
+    def get_row_index(self, row_id: int) -> int:
+        index = int(np.searchsorted(self.row_ids, row_id))
+        if index == len(self.row_ids) or self.row_ids[index] != row_id:
+            raise KeyError(f"No row with ID {row_id} in {self.param_type}.")
+        return index
+
+    def get_row(self, row_id: int) -> ParamRow:
+        """Unpack a single row as a (detached) `ROW_TYPE` instance."""
+        index = self.get_row_index(row_id)
+        raw_name = self.raw_names[index]
+        try:
+            name = raw_name.decode(Param.get_name_encoding(self.big_endian, self.flags2))
+        except UnicodeDecodeError:
+            name = ""
+        return self.ROW_TYPE.from_reader(BinaryReader(self.data[index].tobytes()), raw_name, name)
+
+    def get_row_name(self, row_id: int) -> str:
+        """Decoded name of row `row_id`, or an empty string if it cannot be decoded."""
+        try:
+            return self.raw_names[self.get_row_index(row_id)].decode(
+                Param.get_name_encoding(self.big_endian, self.flags2)
+            )
+        except UnicodeDecodeError:
+            return ""
+
+    def set_row_name(self, row_id: int, name: str):
+        self.raw_names[self.get_row_index(row_id)] = name.encode(Param.get_name_encoding(self.big_endian, self.flags2))
+
+    def __contains__(self, row_id: int) -> bool:
+        try:
+            self.get_row_index(row_id)
+        except KeyError:
+            return False
+        return True
+
+    def __len__(self) -> int:
+        return len(self.row_ids)
+
+    def __iter__(self) -> tp.Iterator[int]:
+        return iter(self.row_ids.tolist())
+
+    def _set_rows(self, row_ids: np.ndarray, data: np.ndarray, raw_names: list[bytes]):
+        """Sort rows by ID, keeping only the first row with each ID."""
+        unique_ids, first_indices = np.unique(row_ids, return_index=True)
+        if len(unique_ids) != len(row_ids):
+            repeated = np.setdiff1d(np.arange(len(row_ids)), first_indices)
+            for row_id in row_ids[repeated]:
+                _LOGGER.warning(f"Repeated param row ID in {self.param_type}: {row_id}. Only first will be kept.")
+        self.row_ids = unique_ids.astype(np.int32)
+        self.data = data[first_indices]  # new contiguous array
+        self.raw_names = [raw_names[i] for i in first_indices]
+
+    def sort(self):
+        """Sort rows by ID (e.g. after manually appending to `data`)."""
+        self._set_rows(self.row_ids, self.data, self.raw_names)
+
+    @classmethod
+    def from_reader(cls, reader: BinaryReader) -> tp.Self:
+        """Reads the row data block of a `.param` file directly into `data`. Only row names are read individually."""
+        byte_order = ByteOrder.BigEndian if reader["b", 0x2c] == -1 else ByteOrder.LittleEndian
+        reader.default_byte_order = byte_order
+        big_endian = byte_order == ByteOrder.BigEndian
+        version_info = reader.unpack("bbb", offset=0x2d)
+        flags1 = ParamFlags1(version_info[0])
+        flags2 = ParamFlags2(version_info[1])
+        paramdef_format_version = version_info[2]
+
+        name_data_offset = reader["I"]  # CANNOT BE TRUSTED IN VANILLA FILES! Off by +12 bytes.
+        _row_data_offset = reader["H"]  # NOT USED! It's an unsigned short, but can be larger.
+        if ((flags1[0] and flags1.IntDataOffset) or flags1.LongDataOffset) and _row_data_offset != 0:
+            raise ValueError(f"Expected `_row_data_offset` of zero in this `Param`, not: {_row_data_offset}")
+        unknown = reader["H"]
+        if unknown not in {0, 1, 2}:
+            raise ValueError(f"Expected `unknown` of 0 or 1 in this `Param`, not: {unknown}")
+        paramdef_data_version = reader["H"]
+        row_count = reader["H"]
+
+        if flags1.OffsetParam:
+            reader.assert_pad(4)
+            param_type_offset = reader["q"]
+            param_type = reader.unpack_string(offset=param_type_offset, encoding="ASCII")
+            reader.assert_pad(20)
+        else:
+            param_type = reader.unpack_string(length=32, encoding="ASCII")
+
+        reader.read(4)  # big endian, flags1, flags2, paramdef_format_version
+
+        if flags1[0] and flags1.IntDataOffset:
+            reader.read(16)  # row data offset (not needed) and padding
+        elif flags1.LongDataOffset:
+            reader.read(16)
+        # End of header.
+
+        pointer_dtype = cls._get_row_pointer_dtype(big_endian, flags1.LongDataOffset)
+        row_pointers = np.frombuffer(reader.read(row_count * pointer_dtype.itemsize), dtype=pointer_dtype)
+        row_data_offset = reader.position
+
+        param = cls(
+            param_type=param_type,
+            big_endian=big_endian,
+            unknown=unknown,
+            flags1=flags1,
+            flags2=flags2,
+            paramdef_data_version=paramdef_data_version,
+            paramdef_format_version=paramdef_format_version,
+        )
+        if row_count == 0:
+            return param
+
+        dtype = cls.get_dtype(big_endian)
+        data_offsets = row_pointers["data_offset"].astype(np.int64)
+        if row_count == 1:
+            # See `Param.from_reader()`. We can at least check that the only row is the expected size.
+            row_size = dtype.itemsize if param_type == "LEVELSYNC_PARAM_ST" else name_data_offset - row_data_offset
+        else:
+            row_size = int(data_offsets[1] - data_offsets[0])
+        if row_size < dtype.itemsize:
+            raise ValueError(
+                f"Row size of {param_type} data ({row_size}) is smaller than size of `{cls.ROW_TYPE.__name__}` "
+                f"({dtype.itemsize})."
+            )
+
+        first_offset = int(data_offsets[0])
+        if row_size == dtype.itemsize and np.array_equal(
+            data_offsets, first_offset + np.arange(row_count, dtype=np.int64) * row_size
+        ):
+            # Usual case: one contiguous block of row data.
+            row_data = bytearray(reader.read(row_count * row_size, offset=first_offset))
+        else:
+            row_data = bytearray().join(reader.read(dtype.itemsize, offset=int(offset)) for offset in data_offsets)
+        data = np.frombuffer(row_data, dtype=dtype)  # writable, as it uses `bytearray`
+
+        raw_names = [
+            reader.unpack_bytes(offset=int(name_offset)) if name_offset != 0 else b""
+            for name_offset in row_pointers["name_offset"]
+        ]
+        param._set_rows(row_pointers["row_id"], data, raw_names)
+        return param
+
+    @staticmethod
+    def _get_row_pointer_dtype(big_endian: bool, long_data_offset: bool) -> np.dtype:
+        byte_order = ">" if big_endian else "<"
+        if long_data_offset:
+            return np.dtype([
+                ("row_id", f"{byte_order}i4"),
+                ("unknown", f"{byte_order}i4"),
+                ("data_offset", f"{byte_order}i8"),
+                ("name_offset", f"{byte_order}i8"),
+            ])
+        return np.dtype([
+            ("row_id", f"{byte_order}i4"),
+            ("data_offset", f"{byte_order}i4"),
+            ("name_offset", f"{byte_order}i4"),
+        ])
+
+    def _get_dcx_type(self) -> DCXType:
+        """Params never have DCX applied individually."""
+        return DCXType.Null
+
+    def to_writer(self) -> BinaryWriter:
+        """Same output as `Param.to_writer()`, but the row pointers and row data are each appended as one array."""
+        self.sort()
+        row_count = len(self)
+
+        byte_order = ByteOrder.BigEndian if self.big_endian else ByteOrder.LittleEndian
+        writer = BinaryWriter(byte_order=byte_order)
+
+        writer.reserve("row_names_offset", "I", obj=self)
+        writer.reserve("_short_row_data_offset", "H", obj=self)  # unsigned short, but can be larger
+        writer.pack("HHH", self.unknown, self.paramdef_data_version, row_count)
+
+        if self.flags1.OffsetParam:
+            writer.pad(4)
+            writer.reserve("param_type_offset", "q", obj=self)
+            writer.pad(20)
+        else:
+            writer.append(pad_chars(
+                self.param_type, encoding="ASCII", null_terminate=True, alignment=32, pad=b"\x20")
+            )
+
+        writer.pack(
+            "4b", -1 if self.big_endian else 0, self.flags1.pack(), self.flags2.pack(), self.paramdef_format_version
+        )
+
+        if self.flags1[0] and self.flags1.IntDataOffset:
+            writer.reserve("row_data_offset", "i", obj=self)
+            writer.pad(12)
+            has_long_row_data_offset = True
+        elif self.flags1.LongDataOffset:
+            writer.reserve("row_data_offset", "q", obj=self)
+            writer.pad(8)
+            has_long_row_data_offset = True
+        else:
+            has_long_row_data_offset = False
+        # End of header.
+
+        data = self.data.astype(self.get_dtype(self.big_endian), copy=False)  # swaps byte order if changed
+        pointer_dtype = self._get_row_pointer_dtype(self.big_endian, self.flags1.LongDataOffset)
+        row_data_offset = writer.position + row_count * pointer_dtype.itemsize
+        row_names_offset = row_data_offset + data.nbytes
+        if self.flags1.OffsetParam:
+            row_names_offset += len(self.param_type.encode("ASCII")) + 1
+
+        name_encoding = Param.get_name_encoding(self.big_endian, self.flags2)
+        terminator = b"\0\0" if name_encoding.replace("-", "").startswith("utf16") else b"\0"
+        packed_names = []
+        name_offsets = np.zeros(row_count, dtype=np.int64)
+        name_offset = row_names_offset
+        for i, raw_name in enumerate(self.raw_names):
+            if raw_stripped := raw_name.rstrip(b"\0"):  # zero offset for empty name
+                packed_names.append(raw_stripped + terminator)
+                name_offsets[i] = name_offset
+                name_offset += len(packed_names[-1])
+
+        row_pointers = np.zeros(row_count, dtype=pointer_dtype)
+        row_pointers["row_id"] = self.row_ids
+        row_pointers["data_offset"] = row_data_offset + np.arange(row_count, dtype=np.int64) * data.dtype.itemsize
+        row_pointers["name_offset"] = name_offsets
+        writer.append(row_pointers.tobytes())
+
+        writer.fill("_short_row_data_offset", min(writer.position, 2 ** 16 - 1), obj=self)
+        if has_long_row_data_offset:
+            writer.fill_with_position("row_data_offset", obj=self)
+
+        writer.append(memoryview(np.ascontiguousarray(data).view(np.uint8)))  # entire row data buffer, not copied
+
+        if self.flags1.OffsetParam:
+            writer.fill_with_position("param_type_offset", obj=self)
+            writer.append(self.param_type.encode("ASCII") + b"\0")
+
+        writer.fill_with_position("row_names_offset", obj=self)
+        writer.append(b"".join(packed_names))
+
+        return writer
+
+    @classmethod
+    def from_param(cls, param: Param) -> tp.Self:
+        """Create from existing `Param`, whose rows are packed once into `data`.
+
+        If called on `ColumnarParam` itself, the matching `TypedColumnarParam` is used.
+        """
+        if cls.ROW_TYPE is None:
+            cls = TypedColumnarParam(param.ROW_TYPE)
+        elif param.ROW_TYPE is not cls.ROW_TYPE:
+            raise TypeError(
+                f"Cannot create `{cls.__name__}` from `Param` with row type `{param.ROW_TYPE.__name__}`."
+            )
+        columnar_param = cls(
+            param_type=param.param_type,
+            big_endian=param.big_endian,
+            unknown=param.unknown,
+            flags1=param.flags1,
+            flags2=param.flags2,
+            paramdef_data_version=param.paramdef_data_version,
+            paramdef_format_version=param.paramdef_format_version,
+        )
+        byte_order = ByteOrder.BigEndian if param.big_endian else ByteOrder.LittleEndian
+        name_encoding = Param.get_name_encoding(param.big_endian, param.flags2)
+        row_data = bytearray().join(row.to_bytes(byte_order) for row in param.values())
+        columnar_param._set_rows(
+            np.fromiter(param.keys(), dtype=np.int32, count=len(param)),
+            np.frombuffer(row_data, dtype=cls.get_dtype(param.big_endian)),
+            [row.Name.encode(name_encoding) if row.Name else row.RawName for row in param.values()],
+        )
+        return columnar_param
+
+    def to_param(self) -> Param:
+        """Unpack into a `Param` of `ROW_TYPE` rows."""
+        param = TypedParam(self.ROW_TYPE).from_bytes(bytes(self.to_writer()))
+        param.big_endian = self.big_endian
+        return param
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.param_type}, <{len(self)} rows>)"
+
+
+def TypedColumnarParam(row_type: type[ParamRow]) -> type[ColumnarParam]:
+    """Generate a `ColumnarParam` subclass dynamically with the given row type (or retrieve existing subclass)."""
+    for param_subclass in ColumnarParam.__subclasses__():
+        if param_subclass.ROW_TYPE is row_type:
+            return param_subclass
+    new_param_subclass = type(f"ColumnarParam_{row_type.__name__}", (ColumnarParam,), {"ROW_TYPE": row_type})
+    new_param_subclass.__module__ = row_type.__module__
+    # Register in row type module, so instances can be pickled (e.g. for build manifest fingerprints).
+    setattr(sys.modules[row_type.__module__], new_param_subclass.__name__, new_param_subclass)
+    return new_param_subclass
@@ -107,6 +107,7 @@ class GameParamBND(Binder, abc.ABC):
             if entry_name not in current_entry_names:
                 self.remove_entry_name(entry_name)
 
+        entry_params = []
         for param_name, param in zip(current_entry_names, self.params.values(), strict=True):
             entry_path = self.get_default_entry_path(param_name)
             entry = self.set_default_entry(
@@ -114,7 +115,8 @@ class GameParamBND(Binder, abc.ABC):
             )
             if not entry.data:
                 _LOGGER.debug(f"New Param entry added to `GameParamBND`: {entry_path}")
-            entry.set_from_binary_file(param)
+            entry_params.append((entry, param))
+        self.set_entries_from_binary_files(entry_params)
 
     def write(
         self,
@@ -132,6 +134,8 @@ class GameParamBND(Binder, abc.ABC):
                 f"Cannot write `GameParamBND` to a split `BXF` file. (Invalid `bdt_file_path`: {bdt_file_path})"
             )
         written = super(GameParamBND, self).write(file_path, make_dirs=make_dirs, check_hash=check_hash)
+        if not written:
+            return written
         _LOGGER.info("GameParamBND written successfully.")
         if not self._reload_warning_given:
             _LOGGER.info("Remember to reload your game to see changes.")
@@ -6,6 +6,7 @@ import abc
 import copy
 import logging
 import struct
+import sys
 import typing as tp
 from dataclasses import dataclass, field
 from pathlib import Path
@@ -816,4 +817,6 @@ def TypedParam(row_type: type[ParamRow]):
             return param_subclass
     new_param_subclass = type(f"Param_{row_type.__name__}", (Param,), {"ROW_TYPE": row_type})
     new_param_subclass.__module__ = row_type.__module__
+    # Register in row type module, so instances can be pickled (e.g. for build manifest fingerprints).
+    setattr(sys.modules[row_type.__module__], new_param_subclass.__name__, new_param_subclass)
     return new_param_subclass
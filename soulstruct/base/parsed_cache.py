@@ -0,0 +1,232 @@
+"""Optional on-disk cache of parsed `BaseBinaryFile` instances, keyed by the hash of the source file.
+
+Tools that load the same vanilla files (`GameParam.parambnd.dcx`, MSBs, FLVERs, ...) every time they start spend most
+of their startup time decompressing and parsing them. With a cache enabled, `from_path()` hashes the file and, if it has
+been loaded before, unpickles the parsed instance instead, skipping DCX decompression and parsing entirely:
+
+    from soulstruct.base.parsed_cache import set_parsed_file_cache
+    set_parsed_file_cache("~/.soulstruct/parsed_cache", max_size=4 * 1024 ** 3)
+
+Instances are stored with pickle protocol 5, with large buffers (notably NumPy arrays, like FLVER vertex arrays) stored
+out-of-band and loaded directly into writable memory without an extra copy.
+
+Cache keys include the source file hash, the Soulstruct version, and the class, so updating Soulstruct or loading the
+same file as a different class never returns stale instances. Entries are evicted in least-recently-used order (using
+file modification times, as in `DCXCache`) when the total cache size exceeds `max_size`. Split BHD/BDT binders and lazy
+binders are never cached.
+"""
+from __future__ import annotations
+
+__all__ = [
+    "ParsedFileCache",
+    "get_parsed_file_cache",
+    "set_parsed_file_cache",
+]
+
+import logging
+import os
+import pickle
+import struct
+import tempfile
+import threading
+import time
+import typing as tp
+from pathlib import Path
+
+from soulstruct.utilities.files import get_blake2b_hash
+
+if tp.TYPE_CHECKING:
+    from .base_binary_file import BaseBinaryFile
+
+_LOGGER = logging.getLogger("soulstruct")
+
+T = tp.TypeVar("T")
+
+# Cache file header: magic and out-of-band buffer count, followed by pickle size and each buffer size (`uint64`).
+_HEADER = struct.Struct("<4sI")
+_SIZE = struct.Struct("<Q")
+_MAGIC = b"SSPC"
+# Alignment of out-of-band buffers (e.g. NumPy array data) within cache files.
+_BUFFER_ALIGNMENT = 64
+
+
+class ParsedFileCache:
+    """Directory of pickled instances with a total size cap and LRU eviction. Safe to use from multiple threads."""
+
+    SUFFIX: tp.ClassVar[str] = ".parsed"
+
+    directory: Path
+    max_size: int
+    hits: int
+    misses: int
+
+    def __init__(self, directory: str | Path, max_size: int = 1024 ** 3):
+        self.directory = Path(directory).expanduser()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # Maps key to `[size, last_access_time]`. Loaded from existing cache files.
+        self._index = {}  # type: dict[str, list[int | float]]
+        self._total_size = 0
+        for path in self.directory.glob(f"*/*{self.SUFFIX}"):
+            stat = path.stat()
+            self._index[path.name.removesuffix(self.SUFFIX)] = [stat.st_size, stat.st_mtime]
+            self._total_size += stat.st_size
+
+    @staticmethod
+    def get_key(file_type: type[BaseBinaryFile], data: bytes) -> str:
+        """Key from source data hash, Soulstruct version, and fully-qualified `file_type` name."""
+        import soulstruct
+        version = getattr(soulstruct, "__version__", "UNKNOWN")
+        type_name = f"{file_type.__module__}.{file_type.__qualname__}"
+        type_hash = get_blake2b_hash(f"{version}:{type_name}".encode()).hex()[:16]
+        return f"{get_blake2b_hash(data).hex()[:64]}_{file_type.__name__}_{type_hash}"
+
+    def _get_path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}{self.SUFFIX}"
+
+    def get_or_parse(self, file_type: type[T], data: bytes, parse: tp.Callable[[], T]) -> T:
+        """Return cached instance of `file_type` parsed from source `data`, or call `parse()` and cache its result."""
+        key = self.get_key(file_type, data)
+        if (instance := self.get(key)) is not None:
+            return instance
+        instance = parse()
+        self.put(key, instance)
+        return instance
+
+    def get(self, key: str) -> tp.Any | None:
+        """Return cached instance for `key`, or `None` if missing (or unreadable). Marks entry as recently used."""
+        with self._lock:
+            entry = self._index.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+        path = self._get_path(key)
+        try:
+            with path.open("rb") as f:
+                data = bytearray(entry[0])
+                f.readinto(data)
+            os.utime(path)
+            instance = self._unpack(data)
+        except Exception as ex:
+            if not isinstance(ex, OSError):  # not just removed by another process
+                _LOGGER.warning(f"Could not load parsed file cache entry {path}: {ex}")
+            with self._lock:
+                self._drop(key)
+                self.misses += 1
+            return None
+        with self._lock:
+            entry[1] = time.time()
+            self.hits += 1
+        return instance
+
+    def put(self, key: str, instance: tp.Any):
+        """Store pickled `instance` under `key`, then evict least-recently-used entries if over `max_size`."""
+        try:
+            chunks = self._pack(instance)
+        except Exception as ex:
+            _LOGGER.warning(f"Could not pickle `{type(instance).__name__}` for parsed file cache: {ex}")
+            return
+        size = sum(len(chunk) for chunk in chunks)
+        if size > self.max_size:
+            return  # would evict everything else
+        path = self._get_path(key)
+        path.parent.mkdir(exist_ok=True)
+        # Write to a temporary file and rename it, so that other processes never see partial cache files.
+        fd, temp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.writelines(chunks)
+            os.replace(temp_name, path)
+        except OSError as ex:
+            _LOGGER.warning(f"Could not write parsed file cache file {path}: {ex}")
+            Path(temp_name).unlink(missing_ok=True)
+            return
+        with self._lock:
+            self._drop(key)
+            self._index[key] = [size, time.time()]
+            self._total_size += size
+            if self._total_size > self.max_size:
+                self._evict()
+
+    @staticmethod
+    def _pack(instance: tp.Any) -> list[bytes | memoryview]:
+        buffers = []  # type: list[pickle.PickleBuffer]
+        pickled = pickle.dumps(instance, protocol=5, buffer_callback=buffers.append)
+        views = [buffer.raw() for buffer in buffers]
+        header = _HEADER.pack(_MAGIC, len(views)) + _SIZE.pack(len(pickled))
+        header += b"".join(_SIZE.pack(len(view)) for view in views)
+        chunks = [header, pickled]
+        position = len(header) + len(pickled)
+        for view in views:
+            padding = -position % _BUFFER_ALIGNMENT
+            chunks += [b"\0" * padding, view]
+            position += padding + len(view)
+        return chunks
+
+    @staticmethod
+    def _unpack(data: bytearray) -> tp.Any:
+        magic, buffer_count = _HEADER.unpack_from(data)
+        if magic != _MAGIC:
+            raise ValueError(f"Invalid parsed file cache magic: {magic}")
+        offset = _HEADER.size
+        pickle_size, *buffer_sizes = struct.unpack_from(f"<{buffer_count + 1}Q", data, offset)
+        offset += _SIZE.size * (buffer_count + 1)
+        view = memoryview(data)
+        pickled = view[offset:offset + pickle_size]
+        offset += pickle_size
+        buffers = []
+        for buffer_size in buffer_sizes:
+            offset += -offset % _BUFFER_ALIGNMENT
+            buffers.append(view[offset:offset + buffer_size])
+            offset += buffer_size
+        return pickle.loads(pickled, buffers=buffers)
+
+    def _drop(self, key: str):
+        if (entry := self._index.pop(key, None)) is not None:
+            self._total_size -= entry[0]
+
+    def _evict(self):
+        """Delete least-recently-used entries until under `max_size`. Must hold lock."""
+        for key, (size, _) in sorted(self._index.items(), key=lambda item: item[1][1]):
+            if self._total_size <= self.max_size:
+                break
+            self._get_path(key).unlink(missing_ok=True)
+            self._drop(key)
+
+    def clear(self):
+        """Delete all cache files."""
+        with self._lock:
+            for key in list(self._index):
+                self._get_path(key).unlink(missing_ok=True)
+                self._drop(key)
+
+    @property
+    def total_size(self) -> int:
+        return self._total_size
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __repr__(self) -> str:
+        return (
+            f"ParsedFileCache('{self.directory}', {len(self)} entries, {self._total_size} / {self.max_size} bytes, "
+            f"hits={self.hits}, misses={self.misses})"
+        )
+
+
+_PARSED_FILE_CACHE = None  # type: ParsedFileCache | None
+
+
+def get_parsed_file_cache() -> ParsedFileCache | None:
+    return _PARSED_FILE_CACHE
+
+
+def set_parsed_file_cache(cache: ParsedFileCache | str | Path | None, max_size: int = 1024 ** 3):
+    """Enable parsed file cache (given instance or directory) for all `from_path()` calls, or disable with `None`."""
+    global _PARSED_FILE_CACHE
+    if isinstance(cache, (str, Path)):
+        cache = ParsedFileCache(cache, max_size)
+    _PARSED_FILE_CACHE = cache
@@ -0,0 +1,5 @@
+"""Performance benchmarks for Soulstruct read/write pipelines.
+
+Run `python -m soulstruct.benchmarks` to benchmark reading and writing every file format in the bundled test resources
+(see `formats`). Individual benchmark modules can also be run directly, e.g. `python -m soulstruct.benchmarks.dcx`.
+"""
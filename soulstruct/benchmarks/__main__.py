@@ -0,0 +1,6 @@
+"""Run file format benchmarks with `python -m soulstruct.benchmarks`. See `soulstruct.benchmarks.formats`."""
+import sys
+
+from .formats import main
+
+sys.exit(main())
@@ -0,0 +1,252 @@
+"""Benchmarks for DCX compression and decompression.
+
+Usage:
+    python -m soulstruct.benchmarks.dcx [source_paths...] [--workers 1 2 4 8] [--repeat 3]
+    python -m soulstruct.benchmarks.dcx [source_paths...] --policies [--repeat 3]
+    python -m soulstruct.benchmarks.dcx [source_paths...] --codecs [--repeat 3]
+
+Source files may be DCX-compressed (they will be decompressed first) or raw. If no sources are given, a synthetic,
+moderately compressible 16 MB payload is used.
+
+The first form compares serial and threaded `DCX_EDGE` (de)compression. The second form compares the size/time
+tradeoff of `DCXPolicy` compression levels, compressing each source with its original DCX type (or `DCX_DFLT_10000_24_9`
+for raw sources). The third form compares the registered codec for each source's DCX type against the same codec running
+in a warm `SubprocessCodec` worker, which shows the per-call cost of crossing a process boundary.
+"""
+from __future__ import annotations
+
+__all__ = [
+    "BenchmarkResult",
+    "time_call",
+    "load_payload",
+    "synthetic_payload",
+    "benchmark_dcx_edge_workers",
+    "benchmark_dcx_policies",
+    "benchmark_dcx_codecs",
+    "print_results_table",
+    "print_policy_table",
+]
+
+import argparse
+import random
+import time
+import typing as tp
+from dataclasses import dataclass
+from pathlib import Path
+
+from soulstruct.dcx import (
+    DCXCodec, DCXType, DCXPolicy, SubprocessCodec, compress, dcx_codec, decompress, get_dcx_codec, is_dcx
+)
+from soulstruct.utilities.binary import BinaryReader
+
+
+@dataclass(slots=True)
+class BenchmarkResult:
+    name: str
+    seconds: float  # best of repeats
+    input_size: int
+    output_size: int
+
+    @property
+    def mb_per_second(self) -> float:
+        return self.input_size / self.seconds / 1e6 if self.seconds > 0 else float("inf")
+
+
+def time_call(func: tp.Callable[[], tp.Any], repeat: int) -> tuple[float, tp.Any]:
+    """Call `func` `repeat` times and return the best time (seconds) and the last result."""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def synthetic_payload(size: int = 16 * 1024 * 1024, seed: int = 0) -> bytes:
+    """Generate reproducible payload with a mix of repeated records and noise, roughly like packed game files."""
+    rng = random.Random(seed)
+    records = [rng.randbytes(rng.randint(16, 256)) for _ in range(64)]
+    pieces = []
+    total = 0
+    while total < size:
+        piece = rng.choice(records) if rng.random() < 0.8 else rng.randbytes(64)
+        pieces.append(piece)
+        total += len(piece)
+    return b"".join(pieces)[:size]
+
+
+def load_payload(path: Path | str) -> tuple[bytes, DCXType]:
+    """Read file at `path`, decompressing it if it is a DCX file. Returns data and DCX type (`Null` if not DCX)."""
+    data = Path(path).read_bytes()
+    if is_dcx(BinaryReader(data)):
+        data, dcx_type = decompress(data)
+        return bytes(data), dcx_type
+    return data, DCXType.Null
+
+
+def benchmark_dcx_edge_workers(
+    payload: bytes, workers_list: tp.Sequence[int] = (1, 2, 4, 8), repeat: int = 3
+) -> list[BenchmarkResult]:
+    """Time `DCX_EDGE` compression and decompression of `payload` with each worker count in `workers_list`.
+
+    Also checks that every parallel result is byte-identical to the serial result.
+    """
+    results = []
+    serial_compressed = None
+    for workers in workers_list:
+        seconds, compressed = time_call(lambda: compress(payload, DCXType.DCX_EDGE, workers=workers), repeat)
+        if serial_compressed is None:
+            serial_compressed = compressed
+        elif compressed != serial_compressed:
+            raise ValueError(f"`DCX_EDGE` compression with {workers} workers does not match serial output.")
+        results.append(
+            BenchmarkResult(f"DCX_EDGE compress (workers={workers})", seconds, len(payload), len(compressed))
+        )
+
+    for workers in workers_list:
+        seconds, (decompressed, _) = time_call(lambda: decompress(serial_compressed, workers=workers), repeat)
+        if decompressed != payload:
+            raise ValueError(f"`DCX_EDGE` decompression with {workers} workers does not match original payload.")
+        results.append(
+            BenchmarkResult(f"DCX_EDGE decompress (workers={workers})", seconds, len(payload), len(decompressed))
+        )
+
+    return results
+
+
+DEFAULT_POLICIES = {
+    "release": DCXPolicy.release(),
+    "level=6": DCXPolicy(level=6),
+    "level=4": DCXPolicy(level=4),
+    "dev (level=1)": DCXPolicy.dev(),
+    "level=0": DCXPolicy(level=0),
+}
+
+
+def benchmark_dcx_policies(
+    payload: bytes,
+    dcx_type: DCXType,
+    policies: dict[str, DCXPolicy] = None,
+    repeat: int = 3,
+) -> list[BenchmarkResult]:
+    """Time compression of `payload` with `dcx_type` under each policy in `policies`, checking that each output can be
+    decompressed again."""
+    if policies is None:
+        policies = DEFAULT_POLICIES
+    results = []
+    for name, policy in policies.items():
+        seconds, compressed = time_call(lambda: compress(payload, dcx_type, policy=policy), repeat)
+        if decompress(compressed)[0] != payload:
+            raise ValueError(f"Compression with DCX policy '{name}' did not round-trip.")
+        results.append(BenchmarkResult(name, seconds, len(payload), len(compressed)))
+    return results
+
+
+def benchmark_dcx_codecs(
+    payload: bytes,
+    dcx_type: DCXType,
+    codecs: dict[str, DCXCodec],
+    repeat: int = 3,
+) -> list[BenchmarkResult]:
+    """Time compression and decompression of `payload` with `dcx_type` using each codec in `codecs`.
+
+    Returns all compression results, then all decompression results.
+    """
+    compress_results = []
+    decompress_results = []
+    for name, codec in codecs.items():
+        with dcx_codec(dcx_type, codec):
+            seconds, compressed = time_call(lambda: compress(payload, dcx_type), repeat)
+            compress_results.append(BenchmarkResult(f"{name} compress", seconds, len(payload), len(compressed)))
+            seconds, (decompressed, _) = time_call(lambda: decompress(compressed), repeat)
+            if decompressed != payload:
+                raise ValueError(f"Codec '{name}' did not round-trip.")
+            decompress_results.append(
+                BenchmarkResult(f"{name} decompress", seconds, len(payload), len(decompressed))
+            )
+    return compress_results + decompress_results
+
+
+def print_policy_table(source_results: dict[str, list[BenchmarkResult]]):
+    """Print policy results for each source, with sizes and times relative to the first ('release') policy."""
+    source_width = max(len(name) for name in source_results)
+    policy_width = max(len(r.name) for results in source_results.values() for r in results)
+    print(
+        f"{'Source':<{source_width}}  {'Policy':<{policy_width}}  {'Time (ms)':>10}  {'MB/s':>8}  "
+        f"{'Size (KB)':>10}  {'Size %':>7}  {'Time %':>7}"
+    )
+    for source_name, results in source_results.items():
+        release = results[0]
+        for result in results:
+            print(
+                f"{source_name:<{source_width}}  {result.name:<{policy_width}}  {result.seconds * 1000:>10.1f}  "
+                f"{result.mb_per_second:>8.1f}  {result.output_size / 1024:>10.1f}  "
+                f"{100 * result.output_size / release.output_size:>6.1f}%  "
+                f"{100 * result.seconds / release.seconds:>6.1f}%"
+            )
+
+
+def print_results_table(results: tp.Sequence[BenchmarkResult], baseline_names: tp.Sequence[str] = ()):
+    """Print `results` as a table. Speedups are relative to the first result in each group with a name containing any
+    of `baseline_names` (default: first result with 'workers=1')."""
+    baseline_names = tuple(baseline_names) or ("workers=1",)
+    name_width = max(len(r.name) for r in results)
+    print(f"{'Benchmark':<{name_width}}  {'Time (ms)':>10}  {'MB/s':>9}  {'Out (KB)':>10}  {'Speedup':>7}")
+    baseline = None
+    for result in results:
+        if any(name in result.name for name in baseline_names):
+            baseline = result
+        speedup = f"{baseline.seconds / result.seconds:.2f}x" if baseline and result.seconds > 0 else "-"
+        print(
+            f"{result.name:<{name_width}}  {result.seconds * 1000:>10.1f}  {result.mb_per_second:>9.1f}  "
+            f"{result.output_size / 1024:>10.1f}  {speedup:>7}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="soulstruct.benchmarks.dcx", description="Benchmark DCX compression.")
+    parser.add_argument("sources", nargs="*", help="Files to use as payloads (DCX files are decompressed first).")
+    parser.add_argument("--workers", nargs="+", type=int, default=[1, 2, 4, 8], help="Worker counts to compare.")
+    parser.add_argument("--repeat", type=int, default=3, help="Repeats per benchmark (best time is reported).")
+    parser.add_argument("--policies", action="store_true", help="Compare `DCXPolicy` levels instead of workers.")
+    parser.add_argument("--codecs", action="store_true", help="Compare in-process and subprocess codecs.")
+    args = parser.parse_args()
+
+    if args.sources:
+        payloads = {Path(path).name: load_payload(path) for path in args.sources}
+    else:
+        payloads = {"<synthetic 16 MB>": (synthetic_payload(), DCXType.Null)}
+
+    if args.policies:
+        source_results = {}
+        for name, (payload, dcx_type) in payloads.items():
+            if dcx_type in {DCXType.Null, DCXType.Unknown}:
+                dcx_type = DCXType.DCX_DFLT_10000_24_9
+            source_results[f"{name} ({dcx_type.name})"] = benchmark_dcx_policies(payload, dcx_type, repeat=args.repeat)
+        print_policy_table(source_results)
+        return
+
+    if args.codecs:
+        for name, (payload, dcx_type) in payloads.items():
+            if dcx_type in {DCXType.Null, DCXType.Unknown, DCXType.DCX_EDGE}:
+                dcx_type = DCXType.DCX_DFLT_10000_24_9
+            codec = get_dcx_codec(dcx_type)
+            subprocess_codec = SubprocessCodec(type(codec))
+            try:
+                print(f"\n{name} ({dcx_type.name}, {len(payload) / 1e6:.2f} MB)")
+                results = benchmark_dcx_codecs(
+                    payload, dcx_type, {"in-process": codec, "subprocess": subprocess_codec}, args.repeat
+                )
+            finally:
+                subprocess_codec.close()
+            print_results_table(results, baseline_names=("in-process",))
+        return
+
+    for name, (payload, _) in payloads.items():
+        print(f"\n{name} ({len(payload) / 1e6:.2f} MB)")
+        print_results_table(benchmark_dcx_edge_workers(payload, args.workers, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
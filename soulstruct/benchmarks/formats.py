@@ -0,0 +1,304 @@
+"""Read, write, and round-trip throughput benchmarks for each supported file format.
+
+Usage:
+    python -m soulstruct.benchmarks [--resources tests] [--cases msb flver ...] [--repeat 5]
+    python -m soulstruct.benchmarks --save benchmarks.json
+    python -m soulstruct.benchmarks --baseline benchmarks.json [--threshold 0.15]
+
+Each case in `FORMAT_CASES` loads one of the bundled test resources (`tests/*/resources`) as its file class and times:
+    - `read`: `from_bytes()` of the file's data (including any DCX decompression, but not disk I/O);
+    - `write`: `bytes()` of the loaded instance (including any DCX compression);
+    - `round_trip`: `from_bytes(bytes(instance))`, also checking that the reloaded instance packs to identical data.
+
+Each time is the best of `--repeat` runs. Throughput is reported in MB/s (of the packed file size) and objects/s, where
+'objects' are param rows, MSB entries, binder entries, textures, events, etc. (see `count_objects()`). Cases whose
+resource is missing or whose file cannot be loaded are reported as skipped.
+
+With `--baseline`, each time is compared with the same case and operation in a JSON file previously written with
+`--save`, and the command exits with status 1 if any is slower than the baseline by more than `--threshold` (as a
+fraction). Benchmark machines differ, so baselines should only be compared on the same machine.
+"""
+from __future__ import annotations
+
+__all__ = [
+    "FormatCase",
+    "FormatResult",
+    "FORMAT_CASES",
+    "OPERATIONS",
+    "count_objects",
+    "benchmark_format",
+    "benchmark_formats",
+    "results_to_json",
+    "compare_results",
+    "print_format_table",
+    "print_comparison_table",
+]
+
+import argparse
+import dataclasses
+import importlib
+import json
+import platform
+import sys
+import time
+import typing as tp
+from dataclasses import dataclass
+from pathlib import Path
+
+from soulstruct.utilities.files import PACKAGE_PATH
+from .dcx import time_call
+
+if tp.TYPE_CHECKING:
+    from soulstruct.base.base_binary_file import BaseBinaryFile
+
+OPERATIONS = ("read", "write", "round_trip")
+
+
+@dataclass(slots=True, frozen=True)
+class FormatCase:
+    name: str
+    # Resource path relative to `tests` directory.
+    resource: str
+    # Lazily imported file class, as 'module:ClassName'.
+    file_class: str
+
+    def get_file_class(self) -> type[BaseBinaryFile]:
+        module_name, class_name = self.file_class.split(":")
+        return getattr(importlib.import_module(module_name), class_name)
+
+
+FORMAT_CASES = (
+    FormatCase(
+        "ds1r/GameParamBND",
+        "darksouls1r/resources/GameParam.parambnd.dcx",
+        "soulstruct.darksouls1r.params:GameParamBND",
+    ),
+    FormatCase("ds1r/MSB", "darksouls1r/resources/m10_00_00_00.msb", "soulstruct.darksouls1r.maps:MSB"),
+    FormatCase("ds1r/FLVER (character)", "darksouls1r/resources/c5370.flver", "soulstruct.base.models.flver:FLVER"),
+    FormatCase(
+        "ds1r/FLVER (map piece)", "darksouls1r/resources/m2200B0A10.flver.dcx", "soulstruct.base.models.flver:FLVER"
+    ),
+    FormatCase("ds1r/TPF", "darksouls1r/resources/m10_00_arch_01.tpf.dcx", "soulstruct.containers.tpf:TPF"),
+    FormatCase("ds1r/EMEVD", "darksouls1r/resources/m10_00_00_00.emevd.dcx", "soulstruct.darksouls1r.events:EMEVD"),
+    FormatCase(
+        "ds1r/TalkESDBND",
+        "darksouls1r/resources/m10_00_00_00.talkesdbnd.dcx",
+        "soulstruct.darksouls1r.ezstate:TalkESDBND",
+    ),
+    FormatCase("ds1r/TalkESD", "darksouls1r/resources/t100613.esd", "soulstruct.darksouls1r.ezstate:TalkESD"),
+    FormatCase("ds1r/MCG", "darksouls1r/resources/m10_00_00_00.mcg", "soulstruct.darksouls1r.maps.navmesh:MCG"),
+    FormatCase("ds1r/MCP", "darksouls1r/resources/m10_00_00_00.mcp", "soulstruct.darksouls1r.maps.navmesh:MCP"),
+    FormatCase(
+        "ptde/GameParamBND",
+        "darksouls1ptde/resources/GameParam.parambnd",
+        "soulstruct.darksouls1ptde.params:GameParamBND",
+    ),
+    FormatCase("ptde/MSB", "darksouls1ptde/resources/m10_00_00_00.msb", "soulstruct.darksouls1ptde.maps:MSB"),
+    FormatCase("bb/FLVER", "bloodborne/resources/c2800.flver", "soulstruct.base.models.flver:FLVER"),
+    FormatCase(
+        "bb/GameParamBND", "bloodborne/resources/gameparam.parambnd.dcx", "soulstruct.bloodborne.params:GameParamBND"
+    ),
+    FormatCase("bb/MSB", "bloodborne/resources/m21_00_00_00.msb.dcx", "soulstruct.bloodborne.maps:MSB"),
+    FormatCase("er/EMEVD", "eldenring/resources/m10_00_00_00.emevd.dcx", "soulstruct.eldenring.events:EMEVD"),
+)
+
+
+@dataclass(slots=True)
+class FormatResult:
+    case: str
+    operation: str
+    seconds: float  # best of repeats
+    size: int  # packed file size
+    objects: int
+    # `round_trip` only: whether the reloaded instance packed to identical data.
+    identical: bool | None = None
+
+    @property
+    def mb_per_second(self) -> float:
+        return self.size / self.seconds / 1e6 if self.seconds > 0 else float("inf")
+
+    @property
+    def objects_per_second(self) -> float:
+        return self.objects / self.seconds if self.seconds > 0 else float("inf")
+
+    def to_dict(self) -> dict[str, tp.Any]:
+        return dataclasses.asdict(self) | {
+            "mb_per_second": self.mb_per_second,
+            "objects_per_second": self.objects_per_second,
+        }
+
+
+def count_objects(instance: BaseBinaryFile) -> int:
+    """Number of top-level 'objects' in `instance`: rows of all params (for param binders), or the total length of its
+    container fields (MSB entry lists, binder entries, textures, events, state machines, etc.). At least 1."""
+    if isinstance(params := getattr(instance, "params", None), dict):
+        return max(1, sum(len(getattr(param, "rows", ())) for param in params.values()))
+    count = 0
+    for f in dataclasses.fields(instance):
+        if f.name.startswith("_"):
+            continue
+        value = getattr(instance, f.name)
+        if isinstance(value, tp.Sized) and not isinstance(value, (str, bytes, bytearray)):
+            count += len(value)
+    return max(1, count)
+
+
+def benchmark_format(file_class: type[BaseBinaryFile], data: bytes, case_name: str, repeat=5) -> list[FormatResult]:
+    """Time `read`, `write`, and `round_trip` of `data` as `file_class`."""
+    read_seconds, instance = time_call(lambda: file_class.from_bytes(data), repeat)
+    size = len(data)
+    objects = count_objects(instance)
+    write_seconds, packed = time_call(lambda: bytes(instance), repeat)
+    round_trip_seconds, reloaded = time_call(lambda: file_class.from_bytes(bytes(instance)), repeat)
+    return [
+        FormatResult(case_name, "read", read_seconds, size, objects),
+        FormatResult(case_name, "write", write_seconds, len(packed), objects),
+        FormatResult(case_name, "round_trip", round_trip_seconds, size, objects, identical=bytes(reloaded) == packed),
+    ]
+
+
+def benchmark_formats(
+    resources_directory: Path | str,
+    cases: tp.Iterable[FormatCase] = FORMAT_CASES,
+    repeat=5,
+    log: tp.Callable[[str], None] = None,
+) -> tuple[list[FormatResult], dict[str, str]]:
+    """Run `benchmark_format()` for each case with a resource in `resources_directory` (usually `tests`).
+
+    Returns all results and a dictionary mapping the names of skipped cases to the reason they were skipped.
+    """
+    resources_directory = Path(resources_directory)
+    results = []
+    skipped = {}
+    for case in cases:
+        resource_path = resources_directory / case.resource
+        if not resource_path.is_file():
+            skipped[case.name] = f"missing resource: {case.resource}"
+            continue
+        try:
+            file_class = case.get_file_class()
+            data = resource_path.read_bytes()
+            file_class.from_bytes(data)  # warm-up (imports, caches) and check that the file can be loaded
+        except Exception as ex:
+            skipped[case.name] = f"{type(ex).__name__}: {ex}"
+            continue
+        if log:
+            log(f"Benchmarking {case.name} ({resource_path.name})...")
+        results += benchmark_format(file_class, data, case.name, repeat)
+    return results, skipped
+
+
+def results_to_json(results: tp.Sequence[FormatResult], skipped: dict[str, str], repeat: int) -> dict[str, tp.Any]:
+    import soulstruct
+    return {
+        "soulstruct_version": getattr(soulstruct, "__version__", "UNKNOWN"),
+        "python_version": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "repeat": repeat,
+        "results": [result.to_dict() for result in results],
+        "skipped": skipped,
+    }
+
+
+def compare_results(
+    results: tp.Sequence[FormatResult], baseline_json: dict[str, tp.Any], threshold=0.15
+) -> list[tuple[FormatResult, float | None, bool]]:
+    """Compare each result's time with the same case and operation in `baseline_json` (from `results_to_json()`).
+
+    Returns `(result, baseline_seconds, is_regression)` for each result, where `baseline_seconds` is `None` if the
+    baseline has no matching result, and `is_regression` is True if the result is more than `threshold` (a fraction)
+    slower than the baseline.
+    """
+    baseline_seconds = {(r["case"], r["operation"]): r["seconds"] for r in baseline_json.get("results", [])}
+    comparisons = []
+    for result in results:
+        baseline = baseline_seconds.get((result.case, result.operation))
+        is_regression = baseline is not None and result.seconds > baseline * (1 + threshold)
+        comparisons.append((result, baseline, is_regression))
+    return comparisons
+
+
+def print_format_table(results: tp.Sequence[FormatResult]):
+    case_width = max(len(r.case) for r in results)
+    print(
+        f"{'Case':<{case_width}}  {'Operation':<10}  {'Time (ms)':>10}  {'MB/s':>8}  {'Objects':>8}  {'Objects/s':>10}"
+    )
+    for result in results:
+        note = "  (NOT IDENTICAL)" if result.identical is False else ""
+        print(
+            f"{result.case:<{case_width}}  {result.operation:<10}  {result.seconds * 1000:>10.2f}  "
+            f"{result.mb_per_second:>8.1f}  {result.objects:>8}  {result.objects_per_second:>10.0f}{note}"
+        )
+
+
+def print_comparison_table(comparisons: tp.Sequence[tuple[FormatResult, float | None, bool]]):
+    case_width = max(len(result.case) for result, _, _ in comparisons)
+    print(f"{'Case':<{case_width}}  {'Operation':<10}  {'Time (ms)':>10}  {'Base (ms)':>10}  {'Change':>8}")
+    for result, baseline, is_regression in comparisons:
+        if baseline is None:
+            baseline_str, change_str = "-", "new"
+        else:
+            baseline_str = f"{baseline * 1000:.2f}"
+            change_str = f"{100 * (result.seconds / baseline - 1):+.1f}%" if baseline > 0 else "-"
+        print(
+            f"{result.case:<{case_width}}  {result.operation:<10}  {result.seconds * 1000:>10.2f}  "
+            f"{baseline_str:>10}  {change_str:>8}{'  REGRESSION' if is_regression else ''}"
+        )
+
+
+def main(argv: tp.Sequence[str] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="soulstruct.benchmarks", description="Benchmark read/write/round-trip throughput of each file format."
+    )
+    parser.add_argument(
+        "--resources",
+        type=Path,
+        default=PACKAGE_PATH().parent / "tests",
+        help="Directory containing `{game}/resources` test files (default: repository `tests` directory).",
+    )
+    parser.add_argument("--cases", nargs="+", help="Only run cases with names containing any of these (ignoring case).")
+    parser.add_argument("--repeat", type=int, default=5, help="Repeats per operation (best time is reported).")
+    parser.add_argument("--save", type=Path, help="Write results to this JSON file.")
+    parser.add_argument("--baseline", type=Path, help="Compare results with this JSON file (from `--save`).")
+    parser.add_argument(
+        "--threshold", type=float, default=0.15, help="Slowdown fraction that counts as a regression (default: 0.15)."
+    )
+    args = parser.parse_args(argv)
+
+    cases = FORMAT_CASES
+    if args.cases:
+        filters = [name.lower() for name in args.cases]
+        cases = [case for case in cases if any(name in case.name.lower() for name in filters)]
+
+    results, skipped = benchmark_formats(
+        args.resources, cases, args.repeat, log=lambda msg: print(msg, file=sys.stderr)
+    )
+    for case_name, reason in skipped.items():
+        print(f"Skipped {case_name}: {reason}", file=sys.stderr)
+    if not results:
+        print("No benchmarks were run.", file=sys.stderr)
+        return 1
+
+    print()
+    print_format_table(results)
+
+    if args.save:
+        args.save.write_text(json.dumps(results_to_json(results, skipped, args.repeat), indent=4))
+        print(f"\nResults written to: {args.save}")
+
+    if args.baseline:
+        comparisons = compare_results(results, json.loads(args.baseline.read_text()), args.threshold)
+        print(f"\nComparison with baseline {args.baseline} (regression threshold: {args.threshold:.0%}):")
+        print_comparison_table(comparisons)
+        regression_count = sum(is_regression for _, _, is_regression in comparisons)
+        if regression_count:
+            print(f"\n{regression_count} regression(s) found.", file=sys.stderr)
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,6 +4,7 @@ __all__ = [
     "Binder",
     "BinderVersion",
     "BinderVersion4Info",
+    "BinderProbe",
     "BinderFlags",
     "BinderError",
     "EntryNotFoundError",
@@ -11,8 +12,16 @@ __all__ = [
     "BinderEntryFlags",
     "TPF",
     "TPFTexture",
+    "BHD5Archive",
+    "BHD5FileHeader",
+    "BHD5Version",
+    "VirtualPathResolver",
 ]
 
-from .core import Binder, BinderVersion, BinderVersion4Info, BinderFlags, BinderError, EntryNotFoundError
+from .core import (
+    Binder, BinderVersion, BinderVersion4Info, BinderProbe, BinderFlags, BinderError, EntryNotFoundError
+)
 from .entry import BinderEntry, BinderEntryFlags
 from .tpf import TPF, TPFTexture
+from .bhd5 import BHD5Archive, BHD5FileHeader, BHD5Version
+from .resolver import VirtualPathResolver
@@ -0,0 +1,210 @@
+"""Read-only access to the big BHD5/BDT archives that games ship their data in (e.g. `dvdbnd0.bhd5`/`dvdbnd0.bdt`).
+
+Archive headers only store a hash of each file's path (see `BinderHashTable.path_hash`), so files can only be looked up
+by a known path (or hash), not listed by name. The BDT data file is memory-mapped, and each file is handed out as a
+`BinaryReader` over a view of the mapping that is only read (and copied) on demand:
+
+    archive = BHD5Archive("dvdbnd0.bhd5")
+    msb = MSB.from_bytes(archive.open("/map/MapStudio/m10_00_00_00.msb"))
+
+Only unencrypted headers (and unencrypted files) are supported. Headers shipped with DS2 and later games must already be
+decrypted with the game's RSA key.
+"""
+from __future__ import annotations
+
+__all__ = ["BHD5Version", "BHD5FileHeader", "BHD5Archive"]
+
+import logging
+import mmap
+import typing as tp
+from dataclasses import dataclass, field
+from enum import IntEnum
+from pathlib import Path
+
+from soulstruct.dcx.buffers import BufferViewReader
+from soulstruct.utilities.binary import *
+
+from .binder_hash import BinderHashTable
+from .core import BinderError, EntryNotFoundError
+
+if tp.TYPE_CHECKING:
+    from soulstruct.base.base_binary_file import BaseBinaryFile
+
+_LOGGER = logging.getLogger("soulstruct")
+
+BASE_BINARY_FILE_T = tp.TypeVar("BASE_BINARY_FILE_T", bound="BaseBinaryFile")
+
+
+class BHD5Version(IntEnum):
+    """Layout of BHD5 file headers, which gained fields over time."""
+    DarkSouls1 = 1  # also Bloodborne
+    DarkSouls2 = 2  # adds salt, SHA-256 hash offset, and AES key offset
+    DarkSouls3 = 3  # also Sekiro; adds unpadded file size
+
+
+@dataclass(slots=True)
+class BHD5Header(BinaryStruct):
+    _signature: bytes = field(init=False, **BinaryString(4, asserted=b"BHD5"))
+    endian_flag: sbyte = field(**Binary(asserted=[-1, 0]))  # -1 = little endian
+    unknown: bool
+    _pad1: bytes = field(init=False, **BinaryPad(2))
+    _one: int = field(init=False, **Binary(asserted=1))
+    file_size: int
+    bucket_count: int
+    buckets_offset: int
+
+
+@dataclass(slots=True)
+class BHD5Bucket(BinaryStruct):
+    file_header_count: int
+    file_headers_offset: int
+
+
+@dataclass(slots=True)
+class BHD5FileHeader:
+    """Location of one file in the BDT. Only the hash of the file's path is known."""
+    path_hash: int
+    offset: int
+    padded_size: int
+    unpadded_size: int | None = None  # DS3 and later only
+    is_encrypted: bool = False
+
+    @property
+    def size(self) -> int:
+        return self.padded_size if self.unpadded_size is None else self.unpadded_size
+
+
+class BHD5Archive:
+    """Read-only BHD5 header and memory-mapped BDT data, with an in-memory index of path hashes.
+
+    Lookups accept a path (hashed with `BinderHashTable.path_hash`, so case and slash direction do not matter) or a hash
+    directly. Close the archive (or use it as a context manager) to release the BDT mapping; readers handed out by
+    `open()` must not be used afterward.
+    """
+
+    bhd_path: Path
+    bdt_path: Path
+    version: BHD5Version
+    salt: str
+    # Maps path hash to file header.
+    file_headers: dict[int, BHD5FileHeader]
+
+    def __init__(
+        self, bhd_path: str | Path, bdt_path: str | Path | None = None, version=BHD5Version.DarkSouls1
+    ):
+        self.bhd_path = Path(bhd_path)
+        self.bdt_path = self.bhd_path.with_suffix(".bdt") if bdt_path is None else Path(bdt_path)
+        if not self.bdt_path.is_file():
+            raise FileNotFoundError(f"Could not find BDT data file for BHD5 archive: {self.bdt_path}")
+        self.version = BHD5Version(version)
+        self.salt = ""
+        self.file_headers = {}
+        self._read_headers(BinaryReader(self.bhd_path.read_bytes()))
+
+        with self.bdt_path.open("rb") as f:
+            if f.seek(0, 2) == 0:
+                self._mmap = None  # empty files cannot be mapped
+                self._view = memoryview(b"")
+            else:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                self._view = memoryview(self._mmap)
+
+    def _read_headers(self, reader: BinaryReader):
+        if reader.peek(4) != b"BHD5":
+            raise BinderError(
+                f"BHD5 header does not start with b'BHD5': {self.bhd_path}. (Encrypted headers are not supported.)"
+            )
+        reader.default_byte_order = ByteOrder.from_reader_peek(reader, 1, 4, b"\00", b"\xFF")
+        header = BHD5Header.from_bytes(reader)
+        if self.version >= BHD5Version.DarkSouls2:
+            salt_length = reader.unpack_value("i")
+            self.salt = reader.read(salt_length).decode("ascii")
+
+        reader.seek(header.buckets_offset)
+        buckets = [BHD5Bucket.from_bytes(reader) for _ in range(header.bucket_count)]
+
+        if self.version == BHD5Version.DarkSouls1:
+            fmt = "Iiq"
+        elif self.version == BHD5Version.DarkSouls2:
+            fmt = "Iiqqq"
+        else:
+            fmt = "Iiqqqq"
+        for bucket in buckets:
+            reader.seek(bucket.file_headers_offset)
+            for _ in range(bucket.file_header_count):
+                path_hash, padded_size, offset, *extra = reader.unpack(fmt)
+                file_header = BHD5FileHeader(path_hash, offset, padded_size)
+                if extra:
+                    file_header.is_encrypted = extra[1] != 0  # AES key offset
+                    if len(extra) == 3:
+                        file_header.unpadded_size = extra[2]
+                if path_hash in self.file_headers:
+                    _LOGGER.warning(f"Duplicate path hash {path_hash:#010x} in BHD5 archive. Keeping first.")
+                    continue
+                self.file_headers[path_hash] = file_header
+
+    @staticmethod
+    def get_path_hash(path: str) -> int:
+        return BinderHashTable.path_hash(path)
+
+    def get_file_header(self, path_or_hash: str | int) -> BHD5FileHeader:
+        path_hash = self.get_path_hash(path_or_hash) if isinstance(path_or_hash, str) else path_or_hash
+        try:
+            return self.file_headers[path_hash]
+        except KeyError:
+            raise EntryNotFoundError(f"No file with path (or hash) {path_or_hash!r} in BHD5 archive: {self.bhd_path}")
+
+    def open(self, path_or_hash: str | int) -> BinaryReader:
+        """Get a `BinaryReader` over the file's data in the mapped BDT. Nothing is read (or copied) until it is used."""
+        file_header = self.get_file_header(path_or_hash)
+        if file_header.is_encrypted:
+            raise BinderError(f"File {path_or_hash!r} is AES-encrypted in BHD5 archive, which is not supported.")
+        if self._view is None:
+            raise BinderError(f"BHD5 archive has been closed: {self.bhd_path}")
+        end = file_header.offset + file_header.size
+        if end > len(self._view):
+            raise BinderError(f"File {path_or_hash!r} extends past end of BDT: {end} > {len(self._view)}")
+        return BinaryReader(BufferViewReader(self._view[file_header.offset:end]))
+
+    def read(self, path_or_hash: str | int) -> bytes:
+        """Read the file's data (which may be DCX-compressed) from the BDT."""
+        reader = self.open(path_or_hash)
+        try:
+            return reader.read()
+        finally:
+            reader.close()
+
+    def get_binary_file(self, path_or_hash: str | int, file_type: type[BASE_BINARY_FILE_T]) -> BASE_BINARY_FILE_T:
+        """Load file as `file_type`, decompressing it first if it is a DCX file."""
+        binary_file = file_type.from_bytes(self.open(path_or_hash))
+        if isinstance(path_or_hash, str):
+            binary_file.path = Path(path_or_hash.replace("\\", "/").lstrip("/"))
+        return binary_file
+
+    def close(self):
+        if self._view is None:
+            return
+        self._view.release()
+        self._view = None
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                pass  # readers from `open()` still export the mapping; it is closed when they are garbage-collected
+            self._mmap = None
+
+    def __enter__(self) -> tp.Self:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __contains__(self, path_or_hash: str | int) -> bool:
+        path_hash = self.get_path_hash(path_or_hash) if isinstance(path_or_hash, str) else path_or_hash
+        return path_hash in self.file_headers
+
+    def __len__(self) -> int:
+        return len(self.file_headers)
+
+    def __repr__(self) -> str:
+        return f"BHD5Archive('{self.bhd_path}', {len(self)} files, version={self.version.name})"
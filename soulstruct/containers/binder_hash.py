@@ -77,14 +77,15 @@ class BinderHashTable:
     def path_hash(path_string: str):
         """Simple string-hashing algorithm used by FROM.
 
-        Strings use forward-slash path separators and always start with a forward slash.
+        Strings are lower-cased, use forward-slash path separators, and always start with a forward slash. The same
+        hash is used by BND4 hash tables and BHD5 archive headers.
         """
-        hashable = path_string.replace("\\", "/")
+        hashable = path_string.replace("\\", "/").lower()
         if not hashable.startswith("/"):
             hashable = "/" + hashable
         h = 0
-        for i, s in enumerate(hashable):
-            h += i * 37 + ord(s)
+        for s in hashable:
+            h = (h * 37 + ord(s)) & 0xFFFFFFFF
         return h
 
     @staticmethod
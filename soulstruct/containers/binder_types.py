@@ -49,25 +49,30 @@ class FLVERBinder(Binder, tp.Generic[FLVER_T], abc.ABC):
     def entry_autogen(self):
         """Replace/create FLVER and TPF Binder entries."""
 
+        entry_files = []
+
         if self.tpf:
             main_model_stem = self._get_model_stem()
-            self.set_default_entry(
+            tpf_entry = self.set_default_entry(
                 entry_spec=self.TPF_ENTRY_ID,
                 new_path=self.get_tpf_entry_path(main_model_stem),
                 new_flags=0x2,
-            ).set_from_binary_file(self.tpf)
+            )
+            entry_files.append((tpf_entry, self.tpf))
 
         if self.flvers:
             if len(self.flvers) > self.MAX_FLVER_COUNT:
                 raise ValueError(f"`{self.cls_name}` can only have up to {self.MAX_FLVER_COUNT} FLVERs.")
             sorted_names = sorted(self.flvers.keys())
             for i, name in enumerate(sorted_names):
-                flver = self.flvers[name]
-                self.set_default_entry(
+                flver_entry = self.set_default_entry(
                     entry_spec=self.FLVER_FIRST_ENTRY_ID + i,
                     new_path=self.get_flver_entry_path(name),
                     new_flags=0x2,
-                ).set_from_binary_file(flver)
+                )
+                entry_files.append((flver_entry, self.flvers[name]))
+
+        self.set_entries_from_binary_files(entry_files)
 
     @property
     def flver(self) -> FLVER_T | None:
@@ -8,24 +8,35 @@ __all__ = [
     "BinderHeaderV3",
     "BinderHeaderV4",
     "BinderVersion4Info",
+    "BinderProbe",
     "Binder",
 ]
 
 import enum
 import io
 import logging
+import mmap
+import os
 import re
+import tempfile
 import typing as tp
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from dataclasses import dataclass, field
 
 from soulstruct.base.base_binary_file import BaseBinaryFile
-from soulstruct.dcx import DCXType, compress, decompress, is_dcx
+from soulstruct.base.parsed_cache import get_parsed_file_cache
+from soulstruct.dcx import (
+    DCXType, BufferViewReader, DCXStreamReader, DCXStreamWriter, compress, decompress, decompress_stream,
+    get_dcx_policy, is_dcx,
+)
+from soulstruct.profiling import get_active_profile, get_remaining_size, profile_category, profile_span
 from soulstruct.utilities.binary import *
-from soulstruct.utilities.files import read_json, write_json, get_blake2b_hash
+from soulstruct.utilities.files import copy_file_mode, read_json, write_json, get_blake2b_hash
+from soulstruct.utilities.worker_pool import batch_starmap
 
 from .binder_hash import BinderHashTable
-from .entry import BinderEntry, BinderEntryHeader
+from .entry import BinderEntry, BinderEntryHeader, get_entry_key_version
 
 _LOGGER = logging.getLogger("soulstruct")
 
@@ -223,6 +234,97 @@ class BinderVersion4Info:
         return cls(False, False, True, 4)
 
 
+@dataclass(slots=True)
+class BinderProbe:
+    """Binder header and entry headers, read by `Binder.probe()` without reading (or decompressing) any entry data.
+
+    For split BXF binders, only the BHD file is read, so entry `data_offset` values refer to the (unread) BDT file.
+    """
+    signature: str
+    version: BinderVersion
+    is_split_bxf: bool
+    dcx_type: DCXType
+    entry_headers: list[BinderEntryHeader]
+    path: Path | None = None
+
+    @property
+    def entry_ids(self) -> list[int | None]:
+        return [entry_header.entry_id for entry_header in self.entry_headers]
+
+    @property
+    def entry_paths(self) -> list[str | None]:
+        """Entry paths, with forward slashes (matching `BinderEntry.path`)."""
+        return [
+            entry_header.path.replace("\\", "/") if entry_header.path is not None else None
+            for entry_header in self.entry_headers
+        ]
+
+    @property
+    def entry_sizes(self) -> list[int]:
+        """Uncompressed entry data sizes, if recorded in the binder, or stored (possibly compressed) sizes otherwise."""
+        return [
+            entry_header.uncompressed_size if entry_header.uncompressed_size is not None
+            else entry_header.compressed_size
+            for entry_header in self.entry_headers
+        ]
+
+    def __repr__(self) -> str:
+        path = f", path='{self.path}'" if self.path else ""
+        return (
+            f"BinderProbe({self.signature!r}, {self.version.name}, is_split_bxf={self.is_split_bxf}, "
+            f"{self.dcx_type.name}, <{len(self.entry_headers)} entries>{path})"
+        )
+
+
+class _BinderEntryIndex:
+    """Lookup tables mapping entry IDs, paths, and names to lists of entries (in the order they were added).
+
+    Updated incrementally by `Binder` entry management methods. Rebuilt by `Binder._get_entry_index()` if the `entries`
+    list has been replaced or changed length, or any entry's ID or path has changed, since it was last built.
+    """
+
+    KEYS: tp.ClassVar[tuple[str, ...]] = ("entry_id", "path", "name")
+
+    __slots__ = ("entries", "entry_count", "key_version", "tables")
+
+    def __init__(self, entries: list[BinderEntry]):
+        self.entries = entries
+        self.entry_count = len(entries)
+        self.key_version = get_entry_key_version()
+        self.tables = {key: {} for key in self.KEYS}  # type: dict[str, dict[int | str | None, list[BinderEntry]]]
+        for entry in entries:
+            self._add(entry)
+
+    def is_current(self, entries: list[BinderEntry]) -> bool:
+        return (
+            entries is self.entries
+            and len(entries) == self.entry_count
+            and get_entry_key_version() == self.key_version
+        )
+
+    def _add(self, entry: BinderEntry):
+        for key, table in self.tables.items():
+            table.setdefault(getattr(entry, key), []).append(entry)
+
+    def add(self, entry: BinderEntry):
+        """Record `entry`, which has just been appended to `entries`."""
+        self._add(entry)
+        self.entry_count += 1
+
+    def remove(self, entry: BinderEntry):
+        """Forget `entry`, which has just been removed from `entries`."""
+        for key, table in self.tables.items():
+            value = getattr(entry, key)
+            hits = table[value]
+            hits.pop(next(i for i, hit in enumerate(hits) if hit is entry))
+            if not hits:
+                del table[value]
+        self.entry_count -= 1
+
+    def get(self, key: str, value: int | str | None) -> list[BinderEntry]:
+        return self.tables[key].get(value, [])
+
+
 @dataclass(slots=True, kw_only=True)
 class Binder(BaseBinaryFile):
     """Collection of files, with their own internal IDs, paths, and flags, glued together into one file on disk.
@@ -267,6 +369,12 @@ class Binder(BaseBinaryFile):
     # Typically set to something like `{game.interroot_prefix}\\some\\extra\\folders`.
     DEFAULT_ENTRY_ROOT: tp.ClassVar[str] = ""
 
+    # Maximum number of threads used by `set_entries_from_binary_files()` to pack and compress entry data. Set to 1 to
+    # pack entries serially.
+    ENTRY_PACK_THREADS: tp.ClassVar[int] = min(8, os.cpu_count() or 1)
+    # Binders without `has_compression` flag are only packed on threads if they have at least this many entries.
+    ENTRY_PACK_THREADS_MIN_ENTRIES: tp.ClassVar[int] = 64
+
     signature: str = "07D7R6"
     flags: BinderFlags = BinderFlags(0b00101110)  # most common flags by far (IDs, names1, names2, compression)
     big_endian: bool = False
@@ -277,6 +385,10 @@ class Binder(BaseBinaryFile):
 
     entries: list[BinderEntry] = field(default_factory=list)
 
+    # Built on first entry lookup. Entries can still be added to or removed from `entries` directly, but changes that
+    # keep the same number of entries (e.g. `entries[i] = entry`) will not be noticed by `find_entry_*()` methods.
+    _entry_index: _BinderEntryIndex | None = field(default=None, init=False, repr=False, compare=False)
+
     # NOTE: Standard `from_dict()` class method will attempt to interpret actual entry content from the dictionary, i.e.
     # a bonafide full JSON version of the entire binder. Use `from_unpacked_path()` to load an unpacked directory or
     # manifest JSON inside one.
@@ -288,13 +400,24 @@ class Binder(BaseBinaryFile):
         cls,
         data: bytes | bytearray | tp.BinaryIO | BinaryReader | BinderEntry,
         bdt_data: bytes | bytearray | tp.BinaryIO | BinaryReader | BinderEntry | None = None,
+        lazy=False,
     ) -> tp.Self:
-        """Load `Binder` from just `data` (BND file) or split `data` and `bdt_data` (BXF file)."""
+        """Load `Binder` from just `data` (BND file) or split `data` and `bdt_data` (BXF file).
+
+        Either source may be a `DCXStreamReader` from `dcx.decompress_stream()`.
+
+        If `lazy` is True, entry data is only read when each entry's `data` is first accessed, and the entry data source
+        (`data` for BND, `bdt_data` for BXF) is left open until then. Do not use a `BinaryReader` passed in here for
+        anything else afterward.
+        """
         reader = BinaryReader(data) if not isinstance(data, BinaryReader) else data  # type: BinaryReader
 
-        if is_dcx(reader):
+        if isinstance(reader.buffer, DCXStreamReader):
+            dcx_type = reader.buffer.dcx_type
+        elif is_dcx(reader):
             try:
-                data, dcx_type = decompress(reader)
+                with profile_category(cls.__name__):
+                    data, dcx_type = decompress(reader)
             finally:
                 reader.close()
             reader = BinaryReader(data)
@@ -304,21 +427,28 @@ class Binder(BaseBinaryFile):
         if bdt_data is None:
             # BND file.
             try:
-                instance = cls.from_reader(reader)
+                with profile_span("from_reader", cls.__name__) as event:
+                    if get_active_profile() is not None:
+                        event.size = get_remaining_size(reader.buffer)
+                    instance = cls.from_reader(reader, lazy=lazy)
                 instance.dcx_type = dcx_type
             except Exception:
+                reader.close()
                 _LOGGER.error(f"Error occurred while reading `{cls.__name__}` from binary data. See traceback.")
                 raise
-            finally:
+            if not lazy:
                 reader.close()
             return instance
 
         # BHD/BDT file.
         bdt_reader = BinaryReader(bdt_data) if not isinstance(bdt_data, BinaryReader) else bdt_data
 
-        if is_dcx(bdt_reader):
+        if isinstance(bdt_reader.buffer, DCXStreamReader):
+            bdt_dcx_type = bdt_reader.buffer.dcx_type
+        elif is_dcx(bdt_reader):
             try:
-                bdt_data, bdt_dcx_type = decompress(bdt_reader)
+                with profile_category(cls.__name__):
+                    bdt_data, bdt_dcx_type = decompress(bdt_reader)
             finally:
                 bdt_reader.close()
             bdt_reader = BinaryReader(bdt_data)
@@ -329,27 +459,69 @@ class Binder(BaseBinaryFile):
             raise ValueError(f"BHD and BDT files have different DCX compression: {dcx_type} vs. {bdt_dcx_type}")
 
         try:
-            instance = cls.from_reader(reader, bdt_reader)
+            with profile_span("from_reader", cls.__name__) as event:
+                if get_active_profile() is not None:
+                    event.size = get_remaining_size(reader.buffer) + get_remaining_size(bdt_reader.buffer)
+                instance = cls.from_reader(reader, bdt_reader, lazy=lazy)
             instance.dcx_type = dcx_type
         except Exception:
+            bdt_reader.close()
             _LOGGER.error(f"Error occurred while reading `{cls.__name__}` from binary data. See traceback.")
             raise
         finally:
             reader.close()
+        if not lazy:
             bdt_reader.close()
 
         return instance
 
     @classmethod
-    def from_path(cls, path: str | Path, bdt_path: str | Path | None = None) -> tp.Self:
+    def from_path(
+        cls, path: str | Path, bdt_path: str | Path | None = None, lazy=False, mmap_bdt=False
+    ) -> tp.Self:
+        """Load `Binder` from a BND file or BHD file (with `bdt_path` next to it, or given explicitly).
+
+        If `lazy` is True, the BND or BDT file is kept open and entry data is only read when each entry's `data` is
+        first accessed. DCX-compressed BND files are then read through `decompress_stream()`.
+
+        If `mmap_bdt` is True and this is a split BXF binder, the (uncompressed) BDT file is memory-mapped and every
+        entry's `data` is a read-only `memoryview` slice of the mapping. Nothing is copied into memory until used, and
+        the mapping stays open as long as any entry data does. Entries must not be modified in place.
+
+        Non-lazy BND files (but not split BXF files) are loaded through the parsed file cache, if one is set (see
+        `base.parsed_cache`).
+        """
         path = Path(path)
-        reader = BinaryReader(path)
+        data = None  # type: bytes | None
+        if not lazy and not mmap_bdt and bdt_path is None and (cache := get_parsed_file_cache()) is not None:
+            data = path.read_bytes()
+            if data[:4] == b"DCX\0":
+                # Could be a DCX-compressed BHD. Only the first block needs decompressing to check (except for Oodle).
+                stream, _ = decompress_stream(data)
+                with stream:
+                    magic = stream.read(3)
+            else:
+                magic = data[:3]
+            if magic != b"BHF":
+                try:
+                    binder = cache.get_or_parse(cls, data, lambda: cls.from_bytes(data))
+                except Exception:
+                    _LOGGER.error(f"Error occurred while reading `{cls.__name__}` with path '{path}'. See traceback.")
+                    raise
+                binder.path = path
+                return binder
+        reader = BinaryReader(path if data is None else data)  # BHD data already read is reused
         first_four_bytes = reader.peek(4)
 
         if first_four_bytes == b"DCX\0":
             # Unpack DCX now and assign `dcx_type` manually below (so we don't do it again in `from_reader()`).
             try:
-                data, dcx_type = decompress(reader)
+                if lazy:
+                    stream, dcx_type = decompress_stream(path)
+                    data = stream
+                else:
+                    with profile_category(cls.__name__):
+                        data, dcx_type = decompress(reader)
             finally:
                 reader.close()
             reader = BinaryReader(data)
@@ -360,14 +532,15 @@ class Binder(BaseBinaryFile):
         if first_four_bytes[:3] == b"BHF":
             if bdt_path is None:
                 # Try to auto-detect BDT file next to `path`.
-                name_parts = path.name.split(".")
-                bdt_name = name_parts[0] + "." + ".".join(name_parts[1:]).replace("bhd", "bdt")
-                if bdt_name == path.name:
-                    raise ValueError(f"Could not guess name of BDT file from BHD file: {path}")
-                bdt_path = path.with_name(bdt_name)
+                bdt_path = path.with_name(cls.get_bdt_name(path.name))
                 if not bdt_path.is_file():
                     raise FileNotFoundError(f"Could not find BDT data file next to BHD header file: {bdt_path}")
-            bdt_reader = BinaryReader(bdt_path)
+            if mmap_bdt:
+                with Path(bdt_path).open("rb") as f:
+                    bdt_mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                bdt_reader = BinaryReader(BufferViewReader(memoryview(bdt_mmap), persistent=True))
+            else:
+                bdt_reader = BinaryReader(bdt_path)
         elif first_four_bytes[:3] == b"BND":
             if bdt_path is not None:
                 raise ValueError("Cannot pass in `bdt_path` when `path` is a BND file.")
@@ -376,7 +549,7 @@ class Binder(BaseBinaryFile):
             raise ValueError(f"Cannot detect `Binder` file type from first four bytes: {first_four_bytes}")
 
         try:
-            binder = cls.from_bytes(reader, bdt_reader)
+            binder = cls.from_bytes(reader, bdt_reader, lazy=lazy)
         except Exception:
             _LOGGER.error(f"Error occurred while reading `{cls.__name__}` with path '{path}'. See traceback.")
             raise
@@ -385,8 +558,79 @@ class Binder(BaseBinaryFile):
             binder.dcx_type = dcx_type
         return binder
 
+    @staticmethod
+    def get_bdt_name(bhd_name: str) -> str:
+        """Guess name of BDT file that goes with BHD file `bhd_name`, e.g. 'c5370.chrtpfbhd' -> 'c5370.chrtpfbdt'."""
+        name_parts = bhd_name.split(".")
+        bdt_name = name_parts[0] + "." + ".".join(name_parts[1:]).replace("bhd", "bdt")
+        if bdt_name == bhd_name:
+            raise ValueError(f"Could not guess name of BDT file from BHD file: {bhd_name}")
+        return bdt_name
+
     @classmethod
-    def from_reader(cls, reader: BinaryReader, bdt_reader: BinaryReader | None = None) -> tp.Self:
+    def probe(cls, source: str | Path | bytes | bytearray | tp.BinaryIO) -> BinderProbe:
+        """Read only the binder header and entry headers (IDs, paths, sizes, offsets) from a BND or BHD file.
+
+        No entry data is read. DCX sources are decompressed with `decompress_stream()`, so only the compressed blocks
+        that contain the headers are inflated (except for `DCX_KRAK`, which cannot be streamed). This is much faster
+        than `from_path()` for indexing the contents of many large binders.
+        """
+        path = Path(source) if isinstance(source, (str, Path)) else None
+        source_reader = BinaryReader(source)
+        stream = None
+        try:
+            if is_dcx(source_reader):
+                stream, dcx_type = decompress_stream(source_reader)
+                reader = BinaryReader(stream)
+            else:
+                dcx_type = DCXType.Null
+                reader = source_reader
+
+            version_bytes = reader.peek(4)
+            if version_bytes in {b"BND3", b"BHF3"}:
+                header_kwargs, entry_headers = cls._read_header_v3(reader)
+            elif version_bytes in {b"BND4", b"BHF4"}:
+                header_kwargs, entry_headers = cls._read_header_v4(reader)
+            else:
+                raise BinderError(f"Could not detect BND or BHD version from first four bytes: {version_bytes}")
+        finally:
+            if stream is not None:
+                stream.close()
+            if isinstance(source, (str, Path, bytes, bytearray)):
+                source_reader.close()
+            else:
+                source_reader.buffer = None  # caller's stream
+
+        return BinderProbe(
+            signature=header_kwargs["signature"],
+            version=header_kwargs["version"],
+            is_split_bxf=version_bytes[:3] == b"BHF",
+            dcx_type=dcx_type,
+            entry_headers=entry_headers,
+            path=path,
+        )
+
+    @classmethod
+    def probe_batch(cls, paths: tp.Iterable[Path | str], threads: int = None) -> list[BinderProbe | None]:
+        """Probe binder headers from each path in `paths` using a thread pool (see `probe()`).
+
+        Reading is mostly file I/O and `zlib`, both of which release the GIL, so threads are used rather than processes.
+        Failed probes (e.g. files that are not binders) will put `None` into list rather than a `BinderProbe`.
+        """
+
+        def _probe_or_none(path: Path | str) -> BinderProbe | None:
+            try:
+                return cls.probe(Path(path))
+            except Exception as ex:
+                _LOGGER.debug(f"Could not probe binder '{path}': {ex}")
+                return None
+
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            return list(executor.map(_probe_or_none, paths))
+
+    @classmethod
+    def from_reader(cls, reader: BinaryReader, bdt_reader: BinaryReader | None = None, lazy=False) -> tp.Self:
+        """If `lazy` is True, entries will read their data from `reader` (or `bdt_reader`) on first access."""
         version_bytes = reader.peek(4)
 
         if version_bytes[:3] == b"BHF":
@@ -410,7 +654,10 @@ class Binder(BaseBinaryFile):
         else:
             raise ValueError(f"Could not detect BND version from first four bytes: {version_bytes}:")
 
-        entries = [BinderEntry.from_header(entry_reader, entry_header) for entry_header in entry_headers]
+        with profile_span("entry_read") as event:
+            entries = [BinderEntry.from_header(entry_reader, entry_header, lazy) for entry_header in entry_headers]
+            if not lazy:
+                event.size = sum(entry_header.compressed_size for entry_header in entry_headers)
         if v4_info := header_kwargs.get("v4_info", None):
             # Set existing V4 hash properties.
             v4_info.most_recent_entry_count = len(entries)
@@ -495,8 +742,11 @@ class Binder(BaseBinaryFile):
         return header_kwargs, entry_headers
 
     @classmethod
-    def from_unpacked_path(cls, path: str | Path) -> tp.Self:
-        """Load manifest JSON or unpacked directory containing a manifest JSON."""
+    def from_unpacked_path(cls, path: str | Path, threads: int = 1) -> tp.Self:
+        """Load manifest JSON or unpacked directory containing a manifest JSON.
+
+        Entry files are read on `threads` threads.
+        """
         path = Path(path)
         if path.is_dir():
             directory = path
@@ -520,13 +770,28 @@ class Binder(BaseBinaryFile):
 
         use_id_prefix = manifest.pop("use_id_prefix")
         binder = cls.from_dict(manifest)
-        binder.add_entries_from_manifest(entries, directory, use_id_prefix)
+        binder.add_entries_from_manifest(entries, directory, use_id_prefix, threads=threads)
         if directory.suffix == ".unpacked":  # only this suffix is automatically removed
             binder.path = directory.with_name(directory.name[:-9])
         else:
             binder.path = directory  # writing this path will conflict with this unpacked folder source
         return binder
 
+    @classmethod
+    def pack_batch(
+        cls, unpacked_paths: list[Path | str], processes: int = None, threads: int = 1
+    ) -> list[int | None]:
+        """Use multiprocessing to load each unpacked binder directory in `unpacked_paths` and write the packed binder
+        (as `from_unpacked_path()` followed by `write()`), reading entry files on `threads` threads in each process.
+
+        Returns the number of bytes written for each binder. Failed binders put `None` into the list instead. If
+        `processes` is 1, binders are packed in this process.
+        """
+        mp_args = [(cls, Path(path), threads) for path in unpacked_paths]
+        if processes == 1:
+            return [_pack_binder_mp(*args) for args in mp_args]
+        return batch_starmap(_pack_binder_mp, mp_args, processes)
+
     @classmethod
     def process_manifest_header(cls, manifest: dict) -> dict[str, tp.Any]:
         """Parse manifest dictionary and return a dictionary that can be passed to `Binder.from_dict()`.
@@ -604,9 +869,33 @@ class Binder(BaseBinaryFile):
 
     def entry_autogen(self):
         """Method that `Binder` subclasses (e.g. `CHRBND`, `GameParamBND`, etc.) can override to automatically create
-        entries from loaded `BaseBinaryFile` instances with known IDs and paths."""
+        entries from loaded `BaseBinaryFile` instances with known IDs and paths.
+
+        Subclasses should set entry data with `set_entries_from_binary_files()` where possible, so entries are packed
+        and compressed concurrently.
+        """
         pass
 
+    def set_entries_from_binary_files(self, entry_files: tp.Iterable[tuple[BinderEntry, BaseBinaryFile]]):
+        """Call `entry.set_from_binary_file(binary_file)` for each pair, on up to `ENTRY_PACK_THREADS` threads.
+
+        Each entry's packed data only depends on its own file, so the result is identical to the serial loop. Most of
+        the time is spent in `zlib` (for compressed entries) and DCX compression, which release the GIL. Binders without
+        the `has_compression` flag are packed serially unless they have at least `ENTRY_PACK_THREADS_MIN_ENTRIES`
+        entries, as thread overhead would otherwise outweigh any gain.
+        """
+        entry_files = list(entry_files)
+        threads = min(self.ENTRY_PACK_THREADS, len(entry_files))
+        if not self.flags.has_compression and len(entry_files) < self.ENTRY_PACK_THREADS_MIN_ENTRIES:
+            threads = 1
+        if threads <= 1:
+            for entry, binary_file in entry_files:
+                entry.set_from_binary_file(binary_file)
+            return
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            # `list()` raises the first exception, if any.
+            list(executor.map(lambda entry_file: entry_file[0].set_from_binary_file(entry_file[1]), entry_files))
+
     def write(
         self,
         file_path: None | str | Path = None,
@@ -634,18 +923,15 @@ class Binder(BaseBinaryFile):
         Returns:
             list[Path]: path of written BND file or BHD and BDT files. Empty if nothing new is written.
         """
-        self.entry_autogen()
-
         file_path = self.get_file_path(file_path)
-        if make_dirs:
-            file_path.parent.mkdir(parents=True, exist_ok=True)
 
         if self.is_split_bxf:
+            self.entry_autogen()
+            if make_dirs:
+                file_path.parent.mkdir(parents=True, exist_ok=True)
             if bdt_file_path is None:
                 # Auto-set BDT path.
-                name_parts = file_path.name.split(".")
-                bdt_name = name_parts[0] + "." + ".".join(name_parts[1:]).replace("bhd", "bdt")
-                bdt_file_path = file_path.with_name(bdt_name)
+                bdt_file_path = file_path.with_name(self.get_bdt_name(file_path.name))
             else:
                 bdt_file_path = Path(bdt_file_path)
                 if make_dirs:  # only needed if not next to BHD file (as will be the case above)
@@ -666,10 +952,143 @@ class Binder(BaseBinaryFile):
 
         if bdt_file_path is not None:
             raise ValueError("Cannot pass in `bdt_file_path` when `Binder.is_split_bxf == False`.")
-        super(Binder, self).write(file_path, make_dirs=make_dirs, check_hash=check_hash)
+        # Entries are regenerated by `_prepare_write()`, only if the binder is not skipped by a build manifest.
+        return super(Binder, self).write(file_path, make_dirs=make_dirs, check_hash=check_hash)
+
+    def _prepare_write(self):
+        self.entry_autogen()
+
+    def write_streamed(
+        self,
+        file_path: None | str | Path = None,
+        bdt_file_path: None | str | Path = None,
+        make_dirs=True,
+    ) -> list[Path]:
+        """Like `write()`, but entry data is written straight to the BND (or BDT) file, one entry at a time, rather than
+        assembled in memory first. If `dcx_type` is set, data is compressed on the way with a `DCXStreamWriter`.
+
+        Entry data offsets are computed from entry sizes before any data is written, so peak memory (beyond the entries
+        themselves) is about the size of the largest entry. Lazy entries are read one at a time and not kept.
+
+        Files are written to temporary files next to their destinations, then moved into place. Since the source files
+        of lazy entries are only replaced at the end, they can be written back over. (Not on Windows, where open files
+        cannot be replaced.)
+
+        Falls back to `write()` if `dcx_type` cannot be compressed incrementally (`DCX_EDGE`, or Oodle `DCX_KRAK`). The
+        DCX compression cache is never used.
 
+        Returns:
+            list[Path]: paths of written BND file or BHD and BDT files.
+        """
+        dcx_type = self._get_dcx_type()
+        if dcx_type != DCXType.Null and not DCXStreamWriter.supports(dcx_type):
+            _LOGGER.info(f"Cannot stream {dcx_type.name} compression. Writing `{self.cls_name}` in memory.")
+            return self.write(file_path, bdt_file_path, make_dirs=make_dirs)
+
+        self.entry_autogen()
+
+        file_path = self.get_file_path(file_path)
+        if make_dirs:
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+        policy = get_dcx_policy(type(self))
+        packed_header, packed_bdt_header, data_layout, data_size = self._to_streamed_header()
+
+        if self.is_split_bxf:
+            if bdt_file_path is None:
+                bdt_file_path = file_path.with_name(self.get_bdt_name(file_path.name))
+            else:
+                bdt_file_path = Path(bdt_file_path)
+                if make_dirs:
+                    bdt_file_path.parent.mkdir(parents=True, exist_ok=True)
+            self.create_bak(file_path, make_dirs=make_dirs)
+            self.create_bak(bdt_file_path, make_dirs=make_dirs)
+            if dcx_type != DCXType.Null:
+                packed_header = compress(packed_header, dcx_type, policy=policy)
+            self._write_streamed_file(bdt_file_path, packed_bdt_header, data_layout, data_size, dcx_type)
+            self._write_streamed_file(file_path, packed_header, [], len(packed_header), DCXType.Null)
+            return [file_path, bdt_file_path]
+
+        if bdt_file_path is not None:
+            raise ValueError("Cannot pass in `bdt_file_path` when `Binder.is_split_bxf == False`.")
+        self.create_bak(file_path, make_dirs=make_dirs)
+        self._write_streamed_file(file_path, packed_header, data_layout, data_size, dcx_type)
         return [file_path]
 
+    def _to_streamed_header(self) -> tuple[bytes, bytes, list[tuple[int, BinderEntry, int]], int]:
+        """Pack BND header (or BHD file) with entry data offsets computed from entry sizes, without reading entry data.
+
+        Returns the packed header, packed BDT header (empty for BND), `(pad_before, entry, pad_after)` tuples in data
+        order, and the total size of the BND or BDT file.
+        """
+        if self.version == BinderVersion.V3:
+            header_writer = self._header_to_writer_v3()
+            sorted_entries, sorted_entry_headers = self._entry_headers_into_writer_v3(header_writer)
+            bdt_header_type, alignment, pad_after = BDTHeaderV3, 16, 0
+        elif self.version == BinderVersion.V4:
+            header_writer = self._header_to_writer_v4()
+            rebuild_hash_table = self._check_v4_hash_table() if self.v4_info.hash_table_type == 4 else False
+            sorted_entries, sorted_entry_headers = self._entry_headers_into_writer_v4(header_writer, rebuild_hash_table)
+            bdt_header_type, alignment, pad_after = BDTHeaderV4, 1, 10
+        else:
+            raise ValueError(f"Cannot pack BND version: {self.version}")
+
+        if self.is_split_bxf:
+            packed_bdt_header = bytes(
+                bdt_header_type.object_to_writer(self, byte_order=header_writer.default_byte_order)
+            )
+            position = len(packed_bdt_header)
+        else:
+            packed_bdt_header = b""
+            position = header_writer.position
+        if self.version == BinderVersion.V4:
+            header_writer.fill("_data_offset", position, obj=self)
+
+        data_layout = []
+        for entry, entry_header in zip(sorted_entries, sorted_entry_headers):
+            pad_before = -position % alignment
+            position += pad_before
+            header_writer.fill("entry_data_offset", position, obj=entry_header)
+            position += entry.data_size + pad_after
+            data_layout.append((pad_before, entry, pad_after))
+
+        # File size is zero for BXF.
+        header_writer.fill("file_size", 0 if self.is_split_bxf else position, obj=self)
+        return bytes(header_writer), packed_bdt_header, data_layout, position
+
+    def _write_streamed_file(
+        self,
+        file_path: Path,
+        header: bytes,
+        data_layout: list[tuple[int, BinderEntry, int]],
+        size: int,
+        dcx_type: DCXType,
+    ):
+        """Write `header` and entry data to a new temporary file, optionally through a `DCXStreamWriter`, then replace
+        `file_path` with it (keeping its permissions, if it exists)."""
+        fd, temp_name = tempfile.mkstemp(dir=file_path.parent, prefix=f".{file_path.name}.", suffix=".tmp")
+        temp_path = Path(temp_name)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                if dcx_type != DCXType.Null:
+                    stream = DCXStreamWriter(f, dcx_type, size, policy=get_dcx_policy(type(self)))
+                else:
+                    stream = f
+                stream.write(header)
+                for pad_before, entry, pad_after in data_layout:
+                    if pad_before:
+                        stream.write(b"\0" * pad_before)
+                    lazy_data = entry.lazy_data
+                    stream.write(entry.data if lazy_data is None else lazy_data.read())  # don't keep lazy data
+                    if pad_after:
+                        stream.write(b"\0" * pad_after)
+                if stream is not f:
+                    stream.close()
+            copy_file_mode(file_path, temp_path)
+            os.replace(temp_path, file_path)
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
+
     def write_split(
         self,
         bhd_path_or_entry: None | str | Path | BinderEntry,
@@ -715,6 +1134,97 @@ class Binder(BaseBinaryFile):
             elif isinstance(path_or_entry, BinderEntry):
                 path_or_entry.set_uncompressed_data(packed)
 
+    @classmethod
+    def patch_split_entry(
+        cls,
+        bhd_path: str | Path,
+        entry: BinderEntry,
+        bdt_path: str | Path | None = None,
+        overwrite_in_place=False,
+    ):
+        """Replace the entry with the same name as `entry` (or add it) in existing split BHD/BDT files, without reading
+        or rewriting the data of any other entries.
+
+        The new data is appended to the end of the BDT file, so the existing BHD file remains valid until it is
+        atomically replaced (via a temporary file) with the new entry header (and V4 hash table, if entry paths have
+        changed). The old entry data is left in the BDT file as dead space; write the whole binder normally to reclaim
+        it.
+
+        If `overwrite_in_place=True`, the new data instead overwrites the old entry data if it fits (with any leftover
+        bytes zeroed), which avoids growing the BDT file. This is NOT safe against interruption: if the BHD file is not
+        successfully replaced afterward, the old header will point to the new data, and both files will be corrupt.
+
+        No `.bak` files are created. Both files must be uncompressed (no DCX).
+        """
+        bhd_path = Path(bhd_path)
+        binder = cls.from_path(bhd_path, bdt_path, lazy=True)  # only reads BHD
+        lazy_data = [e.lazy_data for e in binder.entries]
+        # All lazy entry data uses the same BDT reader. We only need it for its path and offsets.
+        bdt_reader = next((data.source for data in lazy_data if data is not None), None)
+        if bdt_reader is not None:
+            bdt_reader.close()
+        if not binder.is_split_bxf:
+            raise BinderError(f"Cannot patch entry of non-split binder: {bhd_path}")
+        if binder.dcx_type != DCXType.Null:
+            raise BinderError(f"Cannot patch entry of DCX-compressed binder: {bhd_path}")
+        if bdt_path is None:
+            bdt_path = bhd_path.with_name(cls.get_bdt_name(bhd_path.name))
+
+        try:
+            old_index = [e.name for e in binder.entries].index(entry.name)
+        except ValueError:
+            old_index = None
+        # Maps `id(entry)` to its data offset in BDT.
+        data_offsets = {id(e): data.offset for e, data in zip(binder.entries, lazy_data)}
+
+        with Path(bdt_path).open("r+b") as f:
+            if overwrite_in_place and old_index is not None and entry.data_size <= lazy_data[old_index].size:
+                # Overwrite old data in place.
+                offset = lazy_data[old_index].offset
+                f.seek(offset)
+                f.write(entry.data)
+                f.write(b"\0" * (lazy_data[old_index].size - entry.data_size))
+            else:
+                offset = f.seek(0, io.SEEK_END)
+                if binder.version == BinderVersion.V3:
+                    f.write(b"\0" * (-offset % 16))
+                    offset = f.tell()
+                f.write(entry.data)
+                if binder.version == BinderVersion.V4:
+                    f.write(b"\0" * 10)
+
+        if old_index is not None:
+            binder.entries[old_index] = entry
+        else:
+            binder.entries.append(entry)
+        data_offsets[id(entry)] = offset
+
+        if binder.version == BinderVersion.V3:
+            header_writer = binder._header_to_writer_v3()
+            sorted_entries, sorted_entry_headers = binder._entry_headers_into_writer_v3(header_writer)
+        elif binder.version == BinderVersion.V4:
+            header_writer = binder._header_to_writer_v4()
+            rebuild_hash_table = binder._check_v4_hash_table() if binder.v4_info.hash_table_type == 4 else False
+            sorted_entries, sorted_entry_headers = binder._entry_headers_into_writer_v4(
+                header_writer, rebuild_hash_table
+            )
+            header_writer.fill("_data_offset", BDTHeaderV4.get_size(), obj=binder)
+        else:
+            raise ValueError(f"Cannot pack BND version: {binder.version}")
+        for sorted_entry, entry_header in zip(sorted_entries, sorted_entry_headers):
+            header_writer.fill("entry_data_offset", data_offsets[id(sorted_entry)], obj=entry_header)
+        header_writer.fill("file_size", 0, obj=binder)
+
+        fd, temp_name = tempfile.mkstemp(dir=bhd_path.parent, prefix=f".{bhd_path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(bytes(header_writer))
+            copy_file_mode(bhd_path, temp_name)
+            os.replace(temp_name, bhd_path)
+        except BaseException:
+            Path(temp_name).unlink(missing_ok=True)
+            raise
+
     def __bytes__(self) -> bytes:
         """Only permitted when `is_split_bxf == False`.
 
@@ -728,7 +1238,7 @@ class Binder(BaseBinaryFile):
         return super(Binder, self).__bytes__()
 
     def get_split_bytes(self) -> tuple[bytes, bytes]:
-        """Applies `dcx_type` DCX automatically.
+        """Applies `dcx_type` DCX automatically, using the `DCXPolicy` for this class.
 
         NOTE: I haven't ever actually seen a BHD/BDT file with DCX. Generally the entries have it instead.
         """
@@ -736,8 +1246,9 @@ class Binder(BaseBinaryFile):
         packed_bhd = bytes(bhd_writer)
         packed_bdt = bytes(bdt_writer)
         if self.dcx_type != DCXType.Null:
-            packed_bhd = compress(packed_bhd, self.dcx_type)
-            packed_bdt = compress(packed_bdt, self.dcx_type)
+            policy = get_dcx_policy(type(self))
+            packed_bhd = compress(packed_bhd, self.dcx_type, policy=policy)
+            packed_bdt = compress(packed_bdt, self.dcx_type, policy=policy)
         return packed_bhd, packed_bdt
 
     def to_writer(self) -> BinaryWriter:
@@ -802,6 +1313,18 @@ class Binder(BaseBinaryFile):
         NOTE: Both writers should be the same for BND files.
         """
 
+        sorted_entries, sorted_entry_headers = self._entry_headers_into_writer_v3(header_writer)
+        for entry, entry_header in zip(sorted_entries, sorted_entry_headers):
+            entry_writer.pad_align(16)
+            entry_header.pack_data(header_writer, entry_writer, entry.data)
+
+    def _entry_headers_into_writer_v3(
+        self, header_writer: BinaryWriter
+    ) -> tuple[list[BinderEntry], list[BinderEntryHeader]]:
+        """Write entry headers and paths into `header_writer`, leaving their data offsets reserved.
+
+        Returns entries sorted by ID and their headers.
+        """
         sorted_entries = list(sorted(self.entries, key=lambda e: e.entry_id))
         sorted_entry_headers = [entry.get_header(self.flags) for entry in sorted_entries]
         for entry_header in sorted_entry_headers:
@@ -812,9 +1335,7 @@ class Binder(BaseBinaryFile):
                 packed_path = entry.get_packed_path(encoding=self.ENTRY_PATH_ENCODING)
                 entry_header.pack_path(header_writer, packed_path)
 
-        for entry, entry_header in zip(sorted_entries, sorted_entry_headers):
-            entry_writer.pad_align(16)
-            entry_header.pack_data(header_writer, entry_writer, entry.data)
+        return sorted_entries, sorted_entry_headers
 
     def _header_to_writer_v4(self) -> BinaryWriter:
 
@@ -866,13 +1387,29 @@ class Binder(BaseBinaryFile):
         NOTE: Both writers should be the same for BND files.
         """
 
+        sorted_entries, sorted_entry_headers = self._entry_headers_into_writer_v4(header_writer, rebuild_hash_table)
+        header_writer.fill("_data_offset", entry_writer.position, obj=self)
+
+        for entry, entry_header in zip(sorted_entries, sorted_entry_headers):
+            # Ten pad bytes between entry data blocks (for byte-perfect writes).
+            entry_header.pack_data(header_writer, entry_writer, entry.data)
+            entry_writer.pad(10)
+
+    def _entry_headers_into_writer_v4(
+        self, header_writer: BinaryWriter, rebuild_hash_table=False
+    ) -> tuple[list[BinderEntry], list[BinderEntryHeader]]:
+        """Write entry headers, paths, and hash table (if used) into `header_writer`, leaving entry data offsets and
+        `_data_offset` reserved.
+
+        Returns entries sorted by ID and their headers.
+        """
         sorted_entries = list(sorted(self.entries, key=lambda e: e.entry_id))
         sorted_entry_headers = [entry.get_header(self.flags) for entry in sorted_entries]
         for entry_header in sorted_entry_headers:
             entry_header.into_bnd4_writer(header_writer, self.flags, self.bit_big_endian)
 
         if self.flags.has_names:
-            path_encoding = entry_writer.get_utf_16_encoding() if self.v4_info.unicode else self.ENTRY_PATH_ENCODING
+            path_encoding = header_writer.get_utf_16_encoding() if self.v4_info.unicode else self.ENTRY_PATH_ENCODING
             for entry, entry_header in zip(sorted_entries, sorted_entry_headers):
                 entry_header.pack_path(header_writer, entry.get_packed_path(encoding=path_encoding))
 
@@ -885,11 +1422,7 @@ class Binder(BaseBinaryFile):
         else:
             header_writer.fill("_hash_table_offset", 0, obj=self)
 
-        header_writer.fill("_data_offset", entry_writer.position, obj=self)
-
-        for entry, entry_header in zip(sorted_entries, sorted_entry_headers):
-            # Ten pad bytes between entry data blocks (for byte-perfect writes).
-            entry_header.pack_data(header_writer, entry_writer, entry.data + b"\0" * 10)
+        return sorted_entries, sorted_entry_headers
 
     def get_manifest_header(self) -> dict[str, tp.Any]:
         """Construct manifest header dictionary depending on file type."""
@@ -918,7 +1451,11 @@ class Binder(BaseBinaryFile):
         }
         return manifest
 
-    def write_unpacked_directory(self, directory: str | Path | None = None):
+    def write_unpacked_directory(self, directory: str | Path | None = None, threads: int = 1):
+        """Write entry files and `binder_manifest.json` to `directory` (defaults to this binder's path plus '.unpacked').
+
+        Entry files are written on `threads` threads.
+        """
         if not self.flags.has_names:
             raise NotImplementedError(
                 "Writing unpacked binder directories is only supported for binder formats with path strings."
@@ -942,6 +1479,7 @@ class Binder(BaseBinaryFile):
             for i, entry in enumerate(self.entries)
         )
 
+        entry_files = []  # type: list[tuple[Path, BinderEntry]]
         for i, entry in enumerate(self.entries):
             entry_directory = str(Path(entry.path).parent)  # no trailing backslash
 
@@ -956,8 +1494,15 @@ class Binder(BaseBinaryFile):
                 entry_tree_dict.setdefault(entry_directory, []).append(entry_dict)
 
             entry_file_name = f"__{entry.entry_id}__{entry.name}" if use_index_prefix else entry.name
-            with (directory / entry_file_name).open("wb") as f:
-                f.write(entry.data)
+            entry_files.append((directory / entry_file_name, entry))
+
+        if threads > 1 and len(entry_files) > 1:
+            with ThreadPoolExecutor(max_workers=threads) as executor:
+                # `list()` raises the first exception, if any.
+                list(executor.map(lambda entry_file: entry_file[0].write_bytes(entry_file[1].data), entry_files))
+        else:
+            for entry_file_path, entry in entry_files:
+                entry_file_path.write_bytes(entry.data)
 
         json_dict = self.get_manifest_header()
         json_dict["entries"] = entry_tree_dict
@@ -965,6 +1510,19 @@ class Binder(BaseBinaryFile):
         # NOTE: Binder manifest is always encoded in shift-JIS, not `shift_jis_2004`.
         write_json(directory / "binder_manifest.json", json_dict, encoding="shift-jis")
 
+    @classmethod
+    def unpack_batch(cls, paths: list[Path | str], processes: int = None, threads: int = 1) -> list[int | None]:
+        """Use multiprocessing to load each binder in `paths` and write its unpacked directory next to it (as
+        `from_path()` followed by `write_unpacked_directory()`), writing entry files on `threads` threads in each process.
+
+        Returns the total size of entry data unpacked from each binder. Failed binders put `None` into the list instead.
+        If `processes` is 1, binders are unpacked in this process.
+        """
+        mp_args = [(cls, Path(path), threads) for path in paths]
+        if processes == 1:
+            return [_unpack_binder_mp(*args) for args in mp_args]
+        return batch_starmap(_unpack_binder_mp, mp_args, processes)
+
     def to_dict(self) -> dict:
         raise TypeError("Base `Binder` cannot be written to dictionary. Use `write_unpacked_directory()` instead.")
 
@@ -977,11 +1535,16 @@ class Binder(BaseBinaryFile):
         entries: dict[str, list[str | dict[str, int | str]]],
         directory: str | Path,
         use_id_prefix: bool,
+        threads: int = 1,
     ):
-        """Add entries from a manifest dictionary mapping entry roots to entry data names/dicts in `directory`."""
+        """Add entries from a manifest dictionary mapping entry roots to entry data names/dicts in `directory`.
+
+        Entry files are read on `threads` threads.
+        """
         directory = Path(directory)
         auto_entry_id = None  # type: int | None  # used to set entry IDs automatically (from index) if not given
         unsorted_entries = {}  # maps ID to created `BinderEntry`s
+        entry_file_paths = {}  # type: dict[int, Path]
         for root, root_entries in entries.items():
             for entry in root_entries:
                 if isinstance(entry, str):
@@ -1010,48 +1573,58 @@ class Binder(BaseBinaryFile):
                 entry_file_path = directory / entry_file_name
                 if not entry_file_path.is_file():
                     raise FileNotFoundError(f"Could not find Binder entry file: {entry_file_path}")
-                entry_data = entry_file_path.read_bytes()
                 entry_path = str(Path(root).joinpath(entry_name))
                 unsorted_entries[entry_id] = BinderEntry(
                     entry_id=entry_id,
                     path=entry_path,
-                    data=entry_data,
+                    data=b"",  # read below
                     flags=entry_flags,
                 )
+                entry_file_paths[entry_id] = entry_file_path
 
                 if auto_entry_id is not None:
                     auto_entry_id += 1
 
+        if threads > 1 and len(entry_file_paths) > 1:
+            with ThreadPoolExecutor(max_workers=threads) as executor:
+                entry_datas = list(executor.map(Path.read_bytes, entry_file_paths.values()))
+        else:
+            entry_datas = [entry_file_path.read_bytes() for entry_file_path in entry_file_paths.values()]
+        for entry_id, entry_data in zip(entry_file_paths, entry_datas):
+            unsorted_entries[entry_id].data = entry_data
+
         # Add entries in ID order.
         for entry_id, binder_entry in sorted(unsorted_entries.items()):
             self.add_entry(binder_entry)
 
     def add_entry(self, entry: BinderEntry):
-        if id(entry) in {id(e) for e in self.entries}:
+        index = self._get_entry_index()
+        same_id_entries = index.get("entry_id", entry.entry_id)
+        if any(e is entry for e in same_id_entries):
             raise BinderError(f"Given `BinderEntry` instance with object ID {entry.entry_id} is already in Binder.")
-        if entry.entry_id in {e.id for e in self.entries}:
+        if same_id_entries:
             _LOGGER.warning(
                 f"Entry ID {entry.entry_id} appears more than once in this Binder. Entry still added, but you should"
                 f"fix this."
             )
         self.entries.append(entry)
+        index.add(entry)
 
     def add_or_replace_entry_with_name(self, entry: BinderEntry):
         """Add or replace ALL entries with the same name."""
-        entry_name = entry.name
-        for existing_entry in self.entries:
-            print(existing_entry.name)
-            if existing_entry.name == entry_name:
-                self.entries.remove(existing_entry)
-        self.entries.append(entry)
+        for existing_entry in list(self._get_entry_index().get("name", entry.name)):
+            self.remove_entry(existing_entry)
+        self.add_entry(entry)
 
     def add_or_replace_entry_with_id(self, entry: BinderEntry):
         """Add or replace an entry with the same ID. ID must be unique in the Binder, unlike name-based replacement."""
-        entries_by_id = self.get_entries_by_name()
-        if entry.entry_id in entries_by_id:
-            existing_entry = entries_by_id[entry.name]
-            self.entries.remove(existing_entry)
-        self.entries.append(entry)
+        try:
+            existing_entry = self.find_entry_id(entry.entry_id, assert_unique=True)
+        except EntryNotFoundError:
+            pass
+        else:
+            self.remove_entry(existing_entry)
+        self.add_entry(entry)
 
     def __or__(self, other: Binder | list[BinderEntry]):
         if isinstance(other, Binder):
@@ -1062,36 +1635,39 @@ class Binder(BaseBinaryFile):
             raise TypeError("`Binder` | operator must be used with another `Binder` or list of `BinderEntry`s.")
 
         new_entry_names = {entry.name for entry in new_entries}
-        for entry in tuple(self.entries):
-            if entry.name in new_entry_names:
-                self.entries.remove(entry)
+        self.entries[:] = [entry for entry in self.entries if entry.name not in new_entry_names]
         self.entries.extend(new_entries)
+        self._entry_index = None  # rebuilt on next lookup
         return self
 
     def remove_entry(self, entry: BinderEntry):
         """NOTE: Uses `id()` to remove the exact same entry instance. Does not check for field-wise entry equality."""
-        if id(entry) not in {id(e) for e in self.entries}:
+        index = self._get_entry_index()
+        if not any(e is entry for e in index.get("entry_id", entry.entry_id)):
             raise KeyError(f"Entry `{entry}` is not in this Binder. Cannot remove it.")
-        self.entries.remove(entry)
+        # `list.remove()` uses field-wise equality.
+        del self.entries[next(i for i, e in enumerate(self.entries) if e is entry)]
+        index.remove(entry)
 
     def remove_entry_id(self, entry_id: int) -> BinderEntry:
         entry = self.find_entry_id(entry_id, assert_unique=True)
-        self.entries.remove(entry)
+        self.remove_entry(entry)
         return entry
 
     def remove_entry_path(self, entry_path: Path | str):
         entry = self.find_entry_path(entry_path, assert_unique=True)
-        self.entries.remove(entry)
+        self.remove_entry(entry)
         return entry
 
     def remove_entry_name(self, entry_name: str):
         entry = self.find_entry_name(entry_name, assert_unique=True)
-        self.entries.remove(entry)
+        self.remove_entry(entry)
         return entry
 
     def clear_entries(self):
         """Remove all entries from the Binder."""
         self.entries.clear()
+        self._entry_index = None
 
     def create_default_entry(
         self,
@@ -1188,10 +1764,10 @@ class Binder(BaseBinaryFile):
         happen; if it does, fix it by accessing the culprit entries with `.entries` and changing one or more IDs.
         """
         entries = {}
-        for entry in self.entries:
-            if entry.entry_id in entries:
-                raise BinderError(f"There are multiple entries with ID {entry.entry_id}.")
-            entries[entry.entry_id] = entry
+        for entry_id, id_entries in self._get_entry_index().tables["entry_id"].items():
+            if len(id_entries) > 1:
+                raise BinderError(f"There are multiple entries with ID {entry_id}.")
+            entries[entry_id] = id_entries[0]
         return entries
 
     def get_entries_by_path(self) -> dict[str, BinderEntry]:
@@ -1201,10 +1777,10 @@ class Binder(BaseBinaryFile):
         Remastered). If it does, this method will raise a `MultipleEntriesFoundError`.
         """
         entries = {}
-        for entry in self.entries:
-            if entry.path in entries:
-                raise MultipleEntriesFoundError(f"Multiple entries have path '{entry.path}'.")
-            entries[entry.path] = entry
+        for path, path_entries in self._get_entry_index().tables["path"].items():
+            if len(path_entries) > 1:
+                raise MultipleEntriesFoundError(f"Multiple entries have path '{path}'.")
+            entries[path] = path_entries[0]
         return entries
 
     def get_entries_by_name(self) -> dict[str, BinderEntry]:
@@ -1214,17 +1790,35 @@ class Binder(BaseBinaryFile):
         Remastered). If it does, this method will raise a `MultipleEntriesFoundError`.
         """
         entries = {}
-        for entry in self.entries:
-            if entry.name in entries:
-                raise MultipleEntriesFoundError(f"Multiple entry paths have base name '{entry.name}'.")
-            entries[entry.name] = entry
+        for name, name_entries in self._get_entry_index().tables["name"].items():
+            if len(name_entries) > 1:
+                raise MultipleEntriesFoundError(f"Multiple entry paths have base name '{name}'.")
+            entries[name] = name_entries[0]
         return entries
 
+    def _get_entry_index(self) -> _BinderEntryIndex:
+        """Get ID/path/name lookup index, rebuilding it if `entries` has been modified directly."""
+        if self._entry_index is None or not self._entry_index.is_current(self.entries):
+            self._entry_index = _BinderEntryIndex(self.entries)
+        return self._entry_index
+
     def _find_entry_by_attr(self, attr: str, value: int | str, assert_unique=False):
         """Shared code for finding an entry with `getattr(entry, attr) == value`.
 
         If `assert_unique` is True, will check all entries and raise a `BinderError` if multiple hits are found.
         """
+        if attr in _BinderEntryIndex.KEYS:
+            hits = self._get_entry_index().get(attr, value)
+            if not hits:
+                raise EntryNotFoundError(f"No entry found with `{attr} == {value}`.")
+            if len(hits) == 1:
+                return hits[0]
+            if assert_unique:
+                raise MultipleEntriesFoundError(f"Multiple entries found with `{attr} == {value}`.")
+            # Entries may have been reordered since they were indexed.
+            hit_ids = {id(hit) for hit in hits}
+            return next(entry for entry in self.entries if id(entry) in hit_ids)
+
         found = None
         for entry in self.entries:
             if getattr(entry, attr) == value:
@@ -1435,3 +2029,25 @@ class Binder(BaseBinaryFile):
             isinstance(entry_spec, Path)
             or (isinstance(entry_spec, str) and ("\\" in entry_spec or "/" in entry_spec))
         )
+
+
+def _pack_binder_mp(binder_type: type[Binder], unpacked_path: Path, threads: int) -> int | None:
+    """Function for batch operator."""
+    try:
+        binder = binder_type.from_unpacked_path(unpacked_path, threads=threads)
+        written_paths = binder.write()
+        return sum(written_path.stat().st_size for written_path in written_paths)
+    except Exception as ex:
+        _LOGGER.error(f"Error occurred while packing `{binder_type.__name__}` from '{unpacked_path}': {ex}")
+        return None
+
+
+def _unpack_binder_mp(binder_type: type[Binder], path: Path, threads: int) -> int | None:
+    """Function for batch operator."""
+    try:
+        binder = binder_type.from_path(path)
+        binder.write_unpacked_directory(threads=threads)
+        return sum(entry.data_size for entry in binder.entries)
+    except Exception as ex:
+        _LOGGER.error(f"Error occurred while unpacking `{binder_type.__name__}` from '{path}': {ex}")
+        return None
@@ -6,12 +6,16 @@ imports in Soulstruct.
 """
 from __future__ import annotations
 
+import mmap
+import threading
 import typing as tp
 import zlib
 from dataclasses import dataclass
 from enum import IntEnum
 from pathlib import Path
 
+from soulstruct.dcx.buffers import BufferViewReader
+from soulstruct.profiling import profile_span
 from soulstruct.utilities.binary import *
 
 if tp.TYPE_CHECKING:
@@ -148,6 +152,87 @@ class BinderEntryHeader:
         entry_writer.append(entry_data)
 
 
+# Lazy reads from shared binder readers move their positions, so must not overlap.
+_LAZY_READ_LOCK = threading.Lock()
+
+
+class LazyEntryData:
+    """Location of `BinderEntry` data that has not been read yet: a source reader, `mmap`, or `memoryview`, offset, and
+    size. Data is sliced from a `memoryview` source without copying.
+
+    Stored in place of the entry's `data` bytes by `BinderEntry.from_header(lazy=True)`. Keeps `source` open until all
+    entries referencing it have been read or discarded.
+    """
+
+    __slots__ = ("source", "offset", "size")
+
+    def __init__(self, source: BinaryReader | mmap.mmap | memoryview, offset: int, size: int):
+        self.source = source
+        self.offset = offset
+        self.size = size
+
+    def read(self) -> bytes:
+        with profile_span("entry_read", size=self.size):
+            if isinstance(self.source, BinaryReader):
+                with _LAZY_READ_LOCK:
+                    return self.source.read(self.size, offset=self.offset)
+            return self.source[self.offset:self.offset + self.size]
+
+    def __repr__(self) -> str:
+        return f"LazyEntryData({self.source!r}, offset={self.offset}, size={self.size})"
+
+
+class _LazyDataDescriptor:
+    """Wraps the `BinderEntry.data` slot so that `LazyEntryData` is read (and replaced) on first access."""
+
+    def __init__(self, slot):
+        self.slot = slot
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        data = self.slot.__get__(instance, owner)
+        if type(data) is LazyEntryData:
+            data = data.read()
+            self.slot.__set__(instance, data)
+        return data
+
+    def __set__(self, instance, value):
+        self.slot.__set__(instance, value)
+
+
+# Incremented whenever the ID or path of an existing `BinderEntry` changes, so `Binder` lookup indexes can tell when
+# they are stale. Initial assignment (in `__init__`) does not count.
+_ENTRY_KEY_VERSION = 0
+
+
+def get_entry_key_version() -> int:
+    return _ENTRY_KEY_VERSION
+
+
+class _EntryKeyDescriptor:
+    """Wraps the `BinderEntry.entry_id` and `path` slots to increment `_ENTRY_KEY_VERSION` when they are changed."""
+
+    def __init__(self, slot):
+        self.slot = slot
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        return self.slot.__get__(instance, owner)
+
+    def __set__(self, instance, value):
+        global _ENTRY_KEY_VERSION
+        try:
+            old_value = self.slot.__get__(instance)
+        except AttributeError:
+            pass  # first assignment
+        else:
+            if value != old_value:
+                _ENTRY_KEY_VERSION += 1
+        self.slot.__set__(instance, value)
+
+
 @dataclass(slots=True)
 class BinderEntry:
 
@@ -161,9 +246,23 @@ class BinderEntry:
     flags: int = 0x2
 
     @classmethod
-    def from_header(cls, binder_reader: BinaryReader, entry_header: BinderEntryHeader) -> BinderEntry:
-        with binder_reader.temp_offset(entry_header.data_offset):
-            data = binder_reader.read(entry_header.compressed_size)
+    def from_header(cls, binder_reader: BinaryReader, entry_header: BinderEntryHeader, lazy=False) -> BinderEntry:
+        """Read entry data from `binder_reader`, or just record where it is if `lazy` is True (in which case the data
+        will be read from `binder_reader` on first access of `data`).
+
+        If `binder_reader` wraps a `persistent` `BufferViewReader` (a memory-mapped BDT from `Binder.from_path()`),
+        `data` will be a `memoryview` slice of its buffer. Other buffers (e.g. pooled ones) may be reused, so their data
+        is copied.
+        """
+        if isinstance(binder_reader.buffer, BufferViewReader) and binder_reader.buffer.persistent:
+            # Slice view without copying. Already as cheap as lazy.
+            offset = entry_header.data_offset
+            data = binder_reader.buffer.getbuffer()[offset:offset + entry_header.compressed_size]
+        elif lazy:
+            data = LazyEntryData(binder_reader, entry_header.data_offset, entry_header.compressed_size)
+        else:
+            with binder_reader.temp_offset(entry_header.data_offset):
+                data = binder_reader.read(entry_header.compressed_size)
         return cls(entry_id=entry_header.entry_id, path=entry_header.path.replace('\\','/'), data=data, flags=entry_header.flags)
 
     def get_header(self, binder_flags: BinderFlags) -> BinderEntryHeader:
@@ -172,7 +271,8 @@ class BinderEntry:
             self.data_size,
             self.entry_id,
             self.path,
-            uncompressed_size=self.data_size if binder_flags.has_compression else len(self.get_uncompressed_data()),
+            # Only written if binder has compression flag. (Avoids reading lazy data otherwise.)
+            uncompressed_size=self.data_size if binder_flags.has_compression else None,
             data_offset=-1,
         )
 
@@ -180,7 +280,8 @@ class BinderEntry:
         """Decompresses compressed data first, if appropriate."""
         return zlib.decompressobj().decompress(self.data) if BinderEntryFlags.is_compressed(self.flags) else self.data
 
-    __bytes__ = get_uncompressed_data
+    def __bytes__(self) -> bytes:
+        return bytes(self.get_uncompressed_data())  # `data` may be a `memoryview`
 
     def set_uncompressed_data(self, data: bytes):
         """Compress data (with `zlib` level 7) before setting it to `.data` attribute, if appropriate."""
@@ -215,7 +316,20 @@ class BinderEntry:
 
     @property
     def data_size(self) -> int:
-        return len(self.data)
+        """Does not read lazy data."""
+        data = _DATA_SLOT.__get__(self)
+        return data.size if type(data) is LazyEntryData else len(data)
+
+    @property
+    def is_loaded(self) -> bool:
+        """False if `data` is lazy and has not been read yet."""
+        return type(_DATA_SLOT.__get__(self)) is not LazyEntryData
+
+    @property
+    def lazy_data(self) -> LazyEntryData | None:
+        """Location of unread lazy data (source, offset, and size), or `None` if data is loaded."""
+        data = _DATA_SLOT.__get__(self)
+        return data if type(data) is LazyEntryData else None
 
     @property
     def name(self) -> str:
@@ -254,5 +368,19 @@ class BinderEntry:
             path = self.name  # relative path only
         Path(path).write_bytes(self.data)
 
+    def __reduce__(self):
+        """Pickle `memoryview` data (e.g. from a memory-mapped BDT) as `bytes`."""
+        data = self.data
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        return self.__class__, (data, self.entry_id, self.path, self.flags)
+
     def __repr__(self):
-        return f"BinderEntry({self.entry_id}, {hex(self.flags)}, \"{self.path}\", <{len(self.data)} bytes>)"
+        return f"BinderEntry({self.entry_id}, {hex(self.flags)}, \"{self.path}\", <{self.data_size} bytes>)"
+
+
+# Replace `data` slot with lazy-reading wrapper. Dataclass `__init__`, `__eq__`, and pickling all go through it.
+_DATA_SLOT = BinderEntry.data
+BinderEntry.data = _LazyDataDescriptor(_DATA_SLOT)
+BinderEntry.entry_id = _EntryKeyDescriptor(BinderEntry.entry_id)
+BinderEntry.path = _EntryKeyDescriptor(BinderEntry.path)
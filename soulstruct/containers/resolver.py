@@ -0,0 +1,196 @@
+"""Resolve virtual paths that reach into (possibly nested) binders, like `chr/c1000.chrbnd.dcx/c1000.flver`.
+
+Each path part after an on-disk file is the name of an entry inside the container before it. Decoded containers are
+kept in a small LRU cache, so looking up sibling entries does not decompress and parse the same binder again:
+
+    resolver = VirtualPathResolver("C:/Games/DARK SOULS REMASTERED", file_types={".esd": ESD})
+    flver = resolver.resolve("chr/c1000.chrbnd.dcx/c1000.flver")  # `FLVER`
+    tpf = resolver.resolve("chr/c1000.chrbnd.dcx/c1000.tpf")  # same binder, from cache
+    esd = resolver.resolve("script/talk/m10_00_00_00.talkesdbnd.dcx/t100613.esd")
+
+Split BHD/BDT binders are given by their BHD path (e.g. `map/m10/m10_0000.tpfbhd/m10_0000_0001.tpf.dcx`), and only
+have the entries that are actually used read from their BDT. A BHD nested inside a binder uses the BDT entry next to it,
+or else the BDT file next to the outer binder on disk (e.g. `chr/c5370.chrbnd.dcx/c5370.chrtpfbhd/c5370_body.tpf`,
+whose `c5370.chrtpfbdt` is next to `c5370.chrbnd.dcx` in DS1).
+"""
+from __future__ import annotations
+
+__all__ = ["VirtualPathResolver"]
+
+import importlib
+import threading
+import typing as tp
+from collections import OrderedDict
+from pathlib import Path
+
+from soulstruct.utilities.binary import BinaryReader
+
+from .core import Binder, EntryNotFoundError
+
+if tp.TYPE_CHECKING:
+    from soulstruct.base.base_binary_file import BaseBinaryFile
+    from .entry import BinderEntry
+
+
+class VirtualPathResolver:
+    """Resolves virtual paths relative to `root` to typed `GameFile` instances, with an LRU cache of parent binders.
+
+    The class for the final path part is chosen by `file_type`, if given to `resolve()`, or otherwise by its extension
+    (ignoring `.dcx`) in `file_types`, which extends `DEFAULT_FILE_TYPES`. Binder extensions (anything ending in 'bnd',
+    'bhd', or 'bxf') always resolve to `Binder`. Safe to use from multiple threads.
+    """
+
+    # Game-agnostic file types. Game-specific types (`MSB`, `ESD`, `EMEVD`, ...) should be passed to `file_types`.
+    DEFAULT_FILE_TYPES: tp.ClassVar[dict[str, str]] = {
+        ".flver": "soulstruct.base.models.flver:FLVER",
+        ".tpf": "soulstruct.containers.tpf:TPF",
+    }
+
+    root: Path
+    file_types: dict[str, type[BaseBinaryFile] | str]
+    cache_size: int
+    hits: int
+    misses: int
+
+    def __init__(
+        self,
+        root: str | Path = "",
+        file_types: dict[str, type[BaseBinaryFile]] | None = None,
+        cache_size: int = 16,
+    ):
+        self.root = Path(root)
+        self.file_types = self.DEFAULT_FILE_TYPES | (file_types or {})
+        self.cache_size = cache_size
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # Maps (lower-case) virtual path of each container to its decoded `Binder`.
+        self._cache = OrderedDict()  # type: OrderedDict[str, Binder]
+
+    @staticmethod
+    def split_virtual_path(virtual_path: str | Path) -> tuple[Path, list[str]]:
+        """Split into the on-disk file path and the entry names inside it (one per level of nesting)."""
+        parts = Path(str(virtual_path).replace("\\", "/")).parts
+        for i in range(1, len(parts) + 1):
+            disk_path = Path(*parts[:i])
+            if not disk_path.is_dir():
+                return disk_path, list(parts[i:])
+        raise IsADirectoryError(f"Virtual path is a directory: {virtual_path}")
+
+    def get_file_type(self, name: str) -> type[BaseBinaryFile]:
+        """Get class for file `name` from its extension, ignoring any `.dcx` extension."""
+        name = name.lower().removesuffix(".dcx")
+        ext = "." + name.rsplit(".", 1)[-1] if "." in name else ""
+        if ext.endswith(("bnd", "bhd", "bxf")):
+            return Binder
+        try:
+            file_type = self.file_types[ext]
+        except KeyError:
+            raise ValueError(f"No file type registered for extension '{ext}' of '{name}'. Pass `file_type` explicitly.")
+        if isinstance(file_type, str):
+            module_name, class_name = file_type.split(":")
+            file_type = self.file_types[ext] = getattr(importlib.import_module(module_name), class_name)
+        return file_type
+
+    def resolve(self, virtual_path: str | Path, file_type: type[BaseBinaryFile] | None = None) -> BaseBinaryFile:
+        """Load the file at `virtual_path`, as `file_type` or a type detected from its extension."""
+        if file_type is None:
+            file_type = self.get_file_type(Path(str(virtual_path).replace("\\", "/")).name)
+        disk_path, entry_names = self.split_virtual_path(self.root / virtual_path)
+        if not entry_names:
+            return file_type.from_path(disk_path)
+        entry = self._find_entry(self.get_binder(disk_path, entry_names[:-1]), disk_path, entry_names)
+        return entry.to_binary_file(file_type)
+
+    def get_entry(self, virtual_path: str | Path) -> BinderEntry:
+        """Get the `BinderEntry` at `virtual_path`, which must have at least one entry name after the on-disk file."""
+        disk_path, entry_names = self.split_virtual_path(self.root / virtual_path)
+        if not entry_names:
+            raise ValueError(f"Virtual path does not point inside a binder: {virtual_path}")
+        return self._find_entry(self.get_binder(disk_path, entry_names[:-1]), disk_path, entry_names)
+
+    def get_binder(self, disk_path: Path, entry_names: tp.Sequence[str] = ()) -> Binder:
+        """Get the (cached) `Binder` at `disk_path`, or nested inside it under the given entry names."""
+        key = "/".join([disk_path.as_posix(), *entry_names]).lower()
+        with self._lock:
+            if (binder := self._cache.get(key)) is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return binder
+            self.misses += 1
+
+        if entry_names:
+            parent = self.get_binder(disk_path, entry_names[:-1])
+            data = self._find_entry(parent, disk_path, entry_names).get_uncompressed_data()
+            if data[:3] == b"BHF":
+                binder = self._get_nested_split_binder(data, parent, disk_path, entry_names)
+            else:
+                binder = Binder.from_bytes(data)
+        else:
+            with disk_path.open("rb") as f:
+                is_split = f.read(3) == b"BHF"
+            # Split binders are usually large; only read the entries that are used.
+            binder = Binder.from_path(disk_path, lazy=is_split)
+
+        with self._lock:
+            self._cache[key] = binder
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return binder
+
+    def _get_nested_split_binder(
+        self, bhd_data: bytes, parent: Binder, disk_path: Path, entry_names: tp.Sequence[str]
+    ) -> Binder:
+        """Load split binder from BHD entry `bhd_data`, with its BDT found as a sibling entry in `parent` or, failing
+        that, next to `disk_path` on disk (e.g. 'c5370.chrtpfbdt' next to 'c5370.chrbnd.dcx' in DS1)."""
+        bdt_name = Binder.get_bdt_name(entry_names[-1])
+        try:
+            bdt_entry = self._find_entry(parent, disk_path, [*entry_names[:-1], bdt_name])
+        except EntryNotFoundError:
+            pass
+        else:
+            return Binder.from_bytes(bhd_data, bdt_entry.get_uncompressed_data())
+
+        bdt_path = disk_path.with_name(bdt_name)
+        if not bdt_path.is_file():
+            # File names in game files are not consistently cased.
+            lower_name = bdt_name.lower()
+            bdt_path = next(
+                (path for path in disk_path.parent.iterdir() if path.name.lower() == lower_name and path.is_file()),
+                None,
+            )
+        if bdt_path is None:
+            container_path = "/".join([disk_path.as_posix(), *entry_names])
+            raise FileNotFoundError(
+                f"Could not find BDT '{bdt_name}' for split binder '{container_path}' in its parent binder or next to "
+                f"'{disk_path}'."
+            )
+        # Split binders are usually large; only read the entries that are used.
+        return Binder.from_bytes(bhd_data, BinaryReader(bdt_path), lazy=True)
+
+    @staticmethod
+    def _find_entry(binder: Binder, disk_path: Path, entry_names: tp.Sequence[str]) -> BinderEntry:
+        """Find last of `entry_names` in `binder`, which is `disk_path` or nested inside it under the others."""
+        entry_name = entry_names[-1]
+        try:
+            return binder.find_entry_name(entry_name)
+        except EntryNotFoundError:
+            pass
+        # Entry names in game files are not consistently cased.
+        lower_name = entry_name.lower()
+        for entry in binder.entries:
+            if entry.name.lower() == lower_name:
+                return entry
+        container_path = "/".join([disk_path.as_posix(), *entry_names[:-1]])
+        raise EntryNotFoundError(f"No entry named '{entry_name}' in '{container_path}'.")
+
+    def clear_cache(self):
+        with self._lock:
+            self._cache.clear()
+
+    def __repr__(self) -> str:
+        return (
+            f"VirtualPathResolver('{self.root}', {len(self._cache)} / {self.cache_size} cached binders, "
+            f"hits={self.hits}, misses={self.misses})"
+        )
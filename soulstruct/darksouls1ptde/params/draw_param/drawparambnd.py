@@ -238,11 +238,15 @@ class DrawParamBND(Binder):
             raise ValueError(f"Invalid `DrawParamBND` slot: {slot}. Must be 0 or 1.")
         return self.get_default_entry_path(entry_name)
 
+    def entry_autogen(self):
+        self.regenerate_entries()
+
     def regenerate_entries(self):
         """Regenerate Binder entries from `draw_params` dictionary."""
 
         # Any existing Binder entries not regenerated here will be removed below.
         regenerated_entry_paths = set()
+        entry_draw_params = []
 
         for slot, draw_params in enumerate((self.draw_params_0, self.draw_params_1)):
             for draw_param_stem, draw_param in draw_params.items():
@@ -253,7 +257,8 @@ class DrawParamBND(Binder):
                 entry = self.set_default_entry(entry_path, new_id=self.get_first_new_entry_id_in_range(0, 1000000))
                 if not entry.data:
                     _LOGGER.debug(f"New `Param` entry added to `DrawParamBND`: {entry_path}")
-                entry.set_from_binary_file(draw_param)
+                entry_draw_params.append((entry, draw_param))
+        self.set_entries_from_binary_files(entry_draw_params)
 
         # Remove other entries.
         for entry in list(self.entries):
@@ -281,7 +286,6 @@ class DrawParamBND(Binder):
             raise TypeError(
                 f"Cannot write `DrawParamBND` to a split `BXF` file. (Invalid `bdt_file_path`: {bdt_file_path})"
             )
-        self.regenerate_entries()
         return super(DrawParamBND, self).write(file_path, make_dirs=make_dirs, check_hash=check_hash)
 
     @classmethod
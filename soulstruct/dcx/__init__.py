@@ -1 +1,9 @@
-from .core import DCXType, compress, decompress, is_dcx
+from .buffers import DCXBufferPool, BufferViewReader, get_dcx_buffer_pool, set_dcx_buffer_pool
+from .cache import DCXCache, get_dcx_cache, set_dcx_cache
+from .codecs import DCXCodec, ZlibCodec, OodleCodec, NativeOodleCodec, SubprocessCodec, StandInCodec
+from .core import (
+    DCXType, DCXInfo, compress, decompress, decompress_into, get_dcx_info, is_dcx, get_dcx_codec, set_dcx_codec,
+    dcx_codec,
+)
+from .policy import DCXPolicy, get_dcx_policy, set_dcx_policy, dcx_policy
+from .stream import DCXStreamReader, DCXStreamWriter, decompress_stream
@@ -0,0 +1,193 @@
+"""Reusable decompression buffers.
+
+Loading thousands of small DCX files (EMEVD, ESD, FMG, ...) with `decompress()` allocates and frees a new buffer for
+every file. A `DCXBufferPool` keeps released buffers around instead, so that `decompress_into()` can reuse them:
+
+    from soulstruct.dcx import DCXBufferPool, set_dcx_buffer_pool
+    set_dcx_buffer_pool(DCXBufferPool())
+    emevds = [EMEVD.from_path(path) for path in emevd_paths]  # decompressed into pooled buffers
+
+While a pool is set, `BaseBinaryFile.from_bytes()` parses DCX files straight from a pooled buffer and returns the buffer
+to the pool afterward. The `*_batch` loaders in `BaseBinaryFile` always give each worker process its own pool.
+"""
+from __future__ import annotations
+
+__all__ = [
+    "DCXBufferPool",
+    "BufferViewReader",
+    "get_dcx_buffer_pool",
+    "set_dcx_buffer_pool",
+]
+
+import contextlib
+import io
+import threading
+import typing as tp
+
+from .core import DCXType, decompress_into, get_dcx_info
+
+# Smallest buffer size allocated by the pool. Smaller requests share this bucket.
+_MIN_BUFFER_SIZE = 0x10000
+
+
+class DCXBufferPool:
+    """Free lists of `bytearray` buffers, bucketed by power-of-two size. Safe to use from multiple threads."""
+
+    # Buffers larger than this are not kept when released (one-off huge files should not pin memory).
+    max_buffer_size: int
+    # Maximum number of free buffers kept per size bucket.
+    max_free_per_size: int
+    allocations: int
+    reuses: int
+
+    def __init__(self, max_buffer_size: int = 64 * 1024 ** 2, max_free_per_size: int = 4):
+        self.max_buffer_size = max_buffer_size
+        self.max_free_per_size = max_free_per_size
+        self.allocations = 0
+        self.reuses = 0
+        self._lock = threading.Lock()
+        self._free = {}  # type: dict[int, list[bytearray]]
+
+    @staticmethod
+    def get_bucket_size(size: int) -> int:
+        return max(_MIN_BUFFER_SIZE, 1 << (size - 1).bit_length())
+
+    def acquire(self, size: int) -> bytearray:
+        """Get a buffer of at least `size` bytes (contents are undefined). Return it with `release()` when done."""
+        bucket_size = self.get_bucket_size(size)
+        with self._lock:
+            if free := self._free.get(bucket_size):
+                self.reuses += 1
+                return free.pop()
+            self.allocations += 1
+        return bytearray(bucket_size)
+
+    def release(self, buffer: bytearray):
+        """Return `buffer` to the pool. It must not be used (or referenced by any `memoryview`) afterward."""
+        size = len(buffer)
+        if size > self.max_buffer_size or size != self.get_bucket_size(size):
+            return  # not from this pool, or too large to keep
+        with self._lock:
+            free = self._free.setdefault(size, [])
+            if len(free) < self.max_free_per_size:
+                free.append(buffer)
+
+    @contextlib.contextmanager
+    def borrow(self, size: int) -> tp.Iterator[memoryview]:
+        """Context manager that yields a `memoryview` of exactly `size` bytes into a pooled buffer."""
+        buffer = self.acquire(size)
+        view = memoryview(buffer)[:size]
+        try:
+            yield view
+        finally:
+            view.release()
+            self.release(buffer)
+
+    @contextlib.contextmanager
+    def decompress(
+        self, dcx_source: bytes | tp.BinaryIO | str, workers: int = 1
+    ) -> tp.Iterator[tuple[BufferViewReader, DCXType]]:
+        """Decompress DCX source into a pooled buffer and yield a read-only stream over it, along with the `DCXType`.
+
+        The buffer is returned to the pool on exit, so nothing read from the stream may keep a view of it. (Normal
+        `BinaryReader` reads always copy.)
+        """
+        dcx_info = get_dcx_info(dcx_source)
+        with self.borrow(dcx_info.decompressed_size) as view:
+            size, dcx_type = decompress_into(dcx_source, view, workers)
+            stream = BufferViewReader(view[:size])
+            try:
+                yield stream, dcx_type
+            finally:
+                stream.close()
+
+    def clear(self):
+        with self._lock:
+            self._free.clear()
+
+    def __repr__(self) -> str:
+        free_count = sum(len(free) for free in self._free.values())
+        return f"DCXBufferPool(<{free_count} free buffers>, allocations={self.allocations}, reuses={self.reuses})"
+
+
+class BufferViewReader(io.BufferedIOBase):
+    """Read-only, seekable stream over a `memoryview`, without copying it like `io.BytesIO` would.
+
+    `persistent` should only be True if `view` stays valid and unchanged for as long as any slice of it is referenced
+    (e.g. a read-only memory map, but NOT a pooled buffer). Readers may then keep slices of it instead of copying data.
+    """
+
+    persistent: bool
+
+    def __init__(self, view: memoryview, persistent=False):
+        super().__init__()
+        self._view = view
+        self._position = 0
+        self.persistent = persistent
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def read(self, size: int | None = -1) -> bytes:
+        if self.closed:
+            raise ValueError("I/O operation on closed buffer view.")
+        end = len(self._view) if size is None or size < 0 else min(len(self._view), self._position + size)
+        data = self._view[self._position:end].tobytes()
+        self._position = max(self._position, end)
+        return data
+
+    read1 = read
+
+    def readinto(self, buffer) -> int:
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def seek(self, offset: int, whence=io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = len(self._view) + offset
+        else:
+            raise ValueError(f"Invalid `whence`: {whence}")
+        if position < 0:
+            raise ValueError(f"Negative seek position: {position}")
+        self._position = position
+        return position
+
+    def tell(self) -> int:
+        return self._position
+
+    def getbuffer(self) -> memoryview:
+        """Underlying view, like `io.BytesIO.getbuffer()`.
+
+        Slices of it are only as valid as the underlying buffer. For a stream from `DCXBufferPool.decompress()`, that
+        buffer returns to the pool when the block exits and is overwritten by the next `borrow()`, so slices must not be
+        kept past the block. Slices of `persistent` views (e.g. memory maps) stay valid after this stream is closed.
+        """
+        if self.closed:
+            raise ValueError("I/O operation on closed buffer view.")
+        return self._view
+
+    def close(self):
+        if not self.closed:
+            self._view.release()
+        super().close()
+
+
+_DCX_BUFFER_POOL = None  # type: DCXBufferPool | None
+
+
+def get_dcx_buffer_pool() -> DCXBufferPool | None:
+    return _DCX_BUFFER_POOL
+
+
+def set_dcx_buffer_pool(pool: DCXBufferPool | None):
+    """Enable pooled decompression buffers for `BaseBinaryFile.from_bytes()`, or disable with `None`."""
+    global _DCX_BUFFER_POOL
+    _DCX_BUFFER_POOL = pool
@@ -0,0 +1,171 @@
+"""Optional on-disk cache of DCX-compressed data, keyed by the hash of the uncompressed payload.
+
+When repacking a whole directory (or binder) in which only a few files have changed, almost all of the time is spent
+recompressing unchanged payloads. With a cache enabled, `compress()` hashes each payload (much faster than compressing
+it) and returns the previously compressed bytes if they exist:
+
+    from soulstruct.dcx import DCXCache, set_dcx_cache
+    set_dcx_cache(DCXCache("~/.soulstruct/dcx_cache", max_size=2 * 1024 ** 3))
+
+Cache keys include the DCX type, codec, and compression level, so changing `DCXPolicy` (or swapping codecs with
+`set_dcx_codec()`) never returns stale data. Entries are evicted in least-recently-used order (using file modification
+times, so recency persists across sessions) when the total cache size exceeds `max_size`.
+"""
+from __future__ import annotations
+
+__all__ = [
+    "DCXCache",
+    "get_dcx_cache",
+    "set_dcx_cache",
+]
+
+import logging
+import os
+import tempfile
+import threading
+import time
+import typing as tp
+from pathlib import Path
+
+from soulstruct.utilities.files import get_blake2b_hash
+
+if tp.TYPE_CHECKING:
+    from .core import DCXType
+    from .policy import DCXPolicy
+
+_LOGGER = logging.getLogger("soulstruct")
+
+
+class DCXCache:
+    """Directory of compressed payloads with a total size cap and LRU eviction. Safe to use from multiple threads."""
+
+    SUFFIX: tp.ClassVar[str] = ".dcxcache"
+
+    directory: Path
+    max_size: int
+    hits: int
+    misses: int
+
+    def __init__(self, directory: str | Path, max_size: int = 1024 ** 3):
+        self.directory = Path(directory).expanduser()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # Maps key to `[size, last_access_time]`. Loaded from existing cache files.
+        self._index = {}  # type: dict[str, list[int | float]]
+        self._total_size = 0
+        for path in self.directory.glob(f"*/*{self.SUFFIX}"):
+            stat = path.stat()
+            self._index[path.name.removesuffix(self.SUFFIX)] = [stat.st_size, stat.st_mtime]
+            self._total_size += stat.st_size
+
+    @staticmethod
+    def get_key(raw_data: bytes, dcx_type: DCXType, policy: DCXPolicy) -> str:
+        """Key from payload hash, DCX type, the codec registered for that type, and the compression level that `policy`
+        uses for that type."""
+        from .core import DCXType, get_dcx_codec
+        if dcx_type == DCXType.DCX_EDGE:
+            return f"{get_blake2b_hash(raw_data).hex()[:64]}_{dcx_type.name}_{policy.edge_level}"
+        if dcx_type == DCXType.DCX_KRAK:
+            level = "default" if policy.oodle_level is None else policy.oodle_level
+        else:
+            level = policy.zlib_level
+        codec_name = get_dcx_codec(dcx_type).name
+        return f"{get_blake2b_hash(raw_data).hex()[:64]}_{dcx_type.name}_{codec_name}_{level}"
+
+    def _get_path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}{self.SUFFIX}"
+
+    def get(self, key: str) -> bytes | None:
+        """Return cached compressed data for `key`, or `None` if missing. Marks entry as recently used."""
+        with self._lock:
+            entry = self._index.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+        path = self._get_path(key)
+        try:
+            data = path.read_bytes()
+            os.utime(path)
+        except OSError:
+            # Removed by another process.
+            with self._lock:
+                self._drop(key)
+                self.misses += 1
+            return None
+        with self._lock:
+            entry[1] = time.time()
+            self.hits += 1
+        return data
+
+    def put(self, key: str, compressed: bytes):
+        """Store `compressed` data under `key`, then evict least-recently-used entries if over `max_size`."""
+        if len(compressed) > self.max_size:
+            return  # would evict everything else
+        path = self._get_path(key)
+        path.parent.mkdir(exist_ok=True)
+        # Write to a temporary file and rename it, so that other processes never see partial cache files.
+        fd, temp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(compressed)
+            os.replace(temp_name, path)
+        except OSError as ex:
+            _LOGGER.warning(f"Could not write DCX cache file {path}: {ex}")
+            Path(temp_name).unlink(missing_ok=True)
+            return
+        with self._lock:
+            self._drop(key)
+            self._index[key] = [len(compressed), time.time()]
+            self._total_size += len(compressed)
+            if self._total_size > self.max_size:
+                self._evict()
+
+    def _drop(self, key: str):
+        if (entry := self._index.pop(key, None)) is not None:
+            self._total_size -= entry[0]
+
+    def _evict(self):
+        """Delete least-recently-used entries until under `max_size`. Must hold lock."""
+        for key, (size, _) in sorted(self._index.items(), key=lambda item: item[1][1]):
+            if self._total_size <= self.max_size:
+                break
+            self._get_path(key).unlink(missing_ok=True)
+            self._drop(key)
+
+    def clear(self):
+        """Delete all cache files."""
+        with self._lock:
+            for key in list(self._index):
+                self._get_path(key).unlink(missing_ok=True)
+                self._drop(key)
+
+    @property
+    def total_size(self) -> int:
+        return self._total_size
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __repr__(self) -> str:
+        return (
+            f"DCXCache('{self.directory}', {len(self)} entries, {self._total_size} / {self.max_size} bytes, "
+            f"hits={self.hits}, misses={self.misses})"
+        )
+
+
+_DCX_CACHE = None  # type: DCXCache | None
+
+
+def get_dcx_cache() -> DCXCache | None:
+    return _DCX_CACHE
+
+
+def set_dcx_cache(cache: DCXCache | str | Path | None, max_size: int = 1024 ** 3):
+    """Enable compression cache (given instance or directory) for all `compress()` calls, or disable with `None`."""
+    global _DCX_CACHE
+    if isinstance(cache, (str, Path)):
+        cache = DCXCache(cache, max_size)
+    _DCX_CACHE = cache
@@ -0,0 +1,337 @@
+"""Swappable compression backends ("codecs") for DCX payloads.
+
+Each `DCXType` whose payload is a single compressed stream (everything except the chunked `DCX_EDGE` and `DCP_EDGE`)
+is (de)compressed by the `DCXCodec` registered for it in `core`. Defaults are `ZlibCodec` for DFLT/DCP types and
+`OodleCodec` (the `oodle` module, which loads the Windows DLL through `zugbruecke` outside of Windows) for `DCX_KRAK`.
+Backends can be swapped at runtime:
+
+    from soulstruct.dcx import DCXType, NativeOodleCodec, SubprocessCodec, set_dcx_codec
+    set_dcx_codec(DCXType.DCX_KRAK, NativeOodleCodec("liboo2corelinux64.so.9"))  # in-process, plain `ctypes`
+    set_dcx_codec(DCXType.DCX_KRAK, SubprocessCodec(OodleCodec, processes=2))  # warm worker processes
+
+`StandInCodec` is a zlib-based codec that can be registered for `DCX_KRAK` so that KRAK code paths can be tested where
+Oodle is unavailable. Its output is NOT readable by the games.
+"""
+from __future__ import annotations
+
+__all__ = [
+    "DCXCodec",
+    "ZlibCodec",
+    "OodleCodec",
+    "NativeOodleCodec",
+    "SubprocessCodec",
+    "StandInCodec",
+]
+
+import abc
+import ctypes
+import os
+import typing as tp
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from . import oodle
+
+BUFFER_T = tp.Union[bytes, bytearray, memoryview]
+
+
+class DCXCodec(abc.ABC):
+    """Compresses and decompresses a single DCX payload stream."""
+
+    # Identifies codec output for `DCXCache` keys. Codecs with identical output (e.g. different Oodle loaders) should
+    # share a name.
+    name: str = ""
+
+    @abc.abstractmethod
+    def compress(self, data: BUFFER_T, level: int | None = None) -> bytes | bytearray:
+        """Compress `data`. If `level` is `None`, the vanilla level for the codec's DCX types is used."""
+
+    @abc.abstractmethod
+    def decompress(self, data: BUFFER_T, decompressed_size: int) -> bytes | bytearray:
+        """Decompress `data`, which is known to decompress to `decompressed_size` bytes."""
+
+    def decompress_into(self, data: BUFFER_T, decompressed_size: int, buffer: memoryview) -> int:
+        """Decompress `data` into `buffer` (which has room for at least `decompressed_size` bytes) and return the
+        number of bytes written.
+
+        Default implementation copies the output of `decompress()`. Codecs that can write into `buffer` directly should
+        override this.
+        """
+        decompressed = self.decompress(data, decompressed_size)
+        buffer[:len(decompressed)] = decompressed
+        return len(decompressed)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}()"
+
+
+class ZlibCodec(DCXCodec):
+    """Standard `zlib` stream, used by all DFLT and `DCP_DFLT` types."""
+
+    name = "zlib"
+
+    # Vanilla level.
+    DEFAULT_LEVEL: tp.ClassVar[int] = 7
+    # Maximum size of each piece inflated by `decompress_into()` before copying.
+    PIECE_SIZE: tp.ClassVar[int] = 0x100000
+
+    def compress(self, data: BUFFER_T, level: int | None = None) -> bytes:
+        return zlib.compress(data, level=self.DEFAULT_LEVEL if level is None else level)
+
+    def decompress(self, data: BUFFER_T, decompressed_size: int) -> bytes:
+        return zlib.decompressobj().decompress(data)
+
+    def decompress_into(self, data: BUFFER_T, decompressed_size: int, buffer: memoryview) -> int:
+        """Inflates in pieces, so no buffer for the full output is allocated. Stops when `buffer` is full."""
+        decompressor = zlib.decompressobj()
+        position = 0
+        while position < len(buffer) and not decompressor.eof:
+            piece = decompressor.decompress(data, min(self.PIECE_SIZE, len(buffer) - position))
+            if not piece:
+                break
+            buffer[position:position + len(piece)] = piece
+            position += len(piece)
+            data = decompressor.unconsumed_tail
+        return position
+
+
+class OodleCodec(DCXCodec):
+    """Default `DCX_KRAK` codec, using the `oodle` module's DLL (loaded through `zugbruecke` outside of Windows)."""
+
+    name = "oodle"
+
+    def compress(self, data: BUFFER_T, level: int | None = None) -> bytes:
+        if level is None:
+            return oodle.compress(bytes(data))  # default compressor and compression level are correct
+        return oodle.compress(bytes(data), level=oodle.CompressionLevel(level))
+
+    def decompress(self, data: BUFFER_T, decompressed_size: int) -> bytes:
+        return oodle.decompress(bytes(data), decompressed_size)
+
+
+class _NativeCompressOptions(ctypes.Structure):
+    _fields_ = [
+        ("verbosity", ctypes.c_uint),
+        ("minMatchLen", ctypes.c_int),
+        ("seekChunkReset", ctypes.c_bool),
+        ("seekChunkLen", ctypes.c_int),
+        ("profile", ctypes.c_int),
+        ("dictionarySize", ctypes.c_int),
+        ("spaceSpeedTradeoffBytes", ctypes.c_int),
+        ("maxHuffmansPerChunk", ctypes.c_int),
+        ("sendQuantumCRCs", ctypes.c_bool),
+        ("maxLocalDictionarySize", ctypes.c_int),
+        ("makeLongRangeMatcher", ctypes.c_int),
+        ("matchTableSizeLog2", ctypes.c_int),
+    ]
+
+
+class NativeOodleCodec(DCXCodec):
+    """`DCX_KRAK` codec that loads an Oodle 2.6+ shared library for the current platform in-process with plain `ctypes`
+    (e.g. `oo2core_6_win64.dll` on Windows, or a native `liboo2corelinux64.so` on Linux), avoiding Wine entirely.
+
+    Input and output buffers are passed to the library without intermediate copies.
+    """
+
+    name = "oodle"
+
+    library_path: Path
+
+    def __init__(self, library_path: str | Path):
+        self.library_path = Path(library_path)
+        loader = ctypes.WinDLL if os.name == "nt" else ctypes.CDLL
+        try:
+            library = loader(str(self.library_path))
+        except OSError as ex:
+            raise oodle.MissingOodleDLLError(f"Failed to load Oodle library '{library_path}'. Error: {ex}")
+
+        self._compress = library["OodleLZ_Compress"]
+        self._compress.restype = ctypes.c_long
+        self._compress.argtypes = (
+            ctypes.c_int,  # compressor
+            ctypes.c_void_p,  # rawBuf
+            ctypes.c_long,  # rawLen
+            ctypes.c_void_p,  # compBuf
+            ctypes.c_int,  # level
+            ctypes.POINTER(_NativeCompressOptions),  # pOptions
+            ctypes.c_void_p,  # dictionaryBase
+            ctypes.c_void_p,  # lrm
+            ctypes.c_void_p,  # scratchMem
+            ctypes.c_long,  # scratchSize
+        )
+        self._get_default_options = library["OodleLZ_CompressOptions_GetDefault"]
+        self._get_default_options.restype = ctypes.POINTER(_NativeCompressOptions)
+        self._get_default_options.argtypes = (ctypes.c_int, ctypes.c_int)
+        self._decompress = library["OodleLZ_Decompress"]
+        self._decompress.restype = ctypes.c_long
+        self._decompress.argtypes = (
+            ctypes.c_void_p,  # compBuf
+            ctypes.c_long,  # compBufSize
+            ctypes.c_void_p,  # rawBuf
+            ctypes.c_long,  # rawLen
+            ctypes.c_int,  # fuzzSafe
+            ctypes.c_int,  # checkCRC
+            ctypes.c_int,  # verbosity
+            ctypes.c_void_p,  # decBufBase
+            ctypes.c_long,  # decBufSize
+            ctypes.c_void_p,  # fpCallback
+            ctypes.c_void_p,  # callbackUserData
+            ctypes.c_void_p,  # decoderMemory
+            ctypes.c_long,  # decoderMemorySize
+            ctypes.c_int,  # threadPhase
+        )
+        self._get_compressed_buffer_size = library["OodleLZ_GetCompressedBufferSizeNeeded"]
+        self._get_compressed_buffer_size.restype = ctypes.c_long
+        self._get_compressed_buffer_size.argtypes = (ctypes.c_long,)
+        self._get_decode_buffer_size = library["OodleLZ_GetDecodeBufferSize"]
+        self._get_decode_buffer_size.restype = ctypes.c_long
+        self._get_decode_buffer_size.argtypes = (ctypes.c_long, ctypes.c_bool)
+
+    @staticmethod
+    def _get_address(data: BUFFER_T) -> tuple[int | bytes, tp.Any]:
+        """Get argument for a `c_void_p` parameter that points to `data` without copying it, and an object that must be
+        kept alive for the duration of the call."""
+        if isinstance(data, bytes):
+            return data, None  # `ctypes` passes a pointer to the internal buffer of `bytes`
+        view = memoryview(data)
+        if view.readonly:
+            data = view.tobytes()  # no way to get a pointer to a read-only buffer from `ctypes`
+            return data, None
+        array = (ctypes.c_char * view.nbytes).from_buffer(view)
+        return ctypes.addressof(array), array
+
+    def compress(self, data: BUFFER_T, level: int | None = None) -> bytearray:
+        if level is None:
+            level = oodle.CompressionLevel.Optimal2
+        raw_size = memoryview(data).nbytes
+        raw_arg, _raw_keep = self._get_address(data)
+        comp_buf = bytearray(self._get_compressed_buffer_size(raw_size))
+        comp_array = (ctypes.c_char * len(comp_buf)).from_buffer(comp_buf)
+
+        p_options = self._get_default_options(int(oodle.Compressor.Kraken), int(level))
+        p_options.contents.seekChunkReset = True  # required for the game to not crash --TK
+        p_options.contents.seekChunkLen = 0x40000
+
+        comp_size = self._compress(
+            int(oodle.Compressor.Kraken),
+            raw_arg,
+            raw_size,
+            ctypes.addressof(comp_array),
+            int(level),
+            p_options,
+            None,
+            None,
+            None,
+            0,
+        )
+        del comp_array  # release export so `comp_buf` can be resized
+        if comp_size <= 0:
+            raise oodle.OodleDLLError("Oodle compression failed.")
+        del comp_buf[comp_size:]
+        return comp_buf
+
+    def decompress(self, data: BUFFER_T, decompressed_size: int) -> bytearray:
+        raw_buf = bytearray(self._get_decode_buffer_size(decompressed_size, True))
+        size = self.decompress_into(data, decompressed_size, memoryview(raw_buf))
+        del raw_buf[size:]
+        return raw_buf
+
+    def decompress_into(self, data: BUFFER_T, decompressed_size: int, buffer: memoryview) -> int:
+        """Decompresses directly into `buffer` if it has room for Oodle's decode padding; otherwise decompresses into a
+        temporary buffer and copies."""
+        decode_size = self._get_decode_buffer_size(decompressed_size, True)
+        if len(buffer) < decode_size:
+            return super().decompress_into(data, decompressed_size, buffer)
+        comp_arg, _comp_keep = self._get_address(data)
+        raw_array = (ctypes.c_char * len(buffer)).from_buffer(buffer)
+        size = self._decompress(
+            comp_arg,
+            memoryview(data).nbytes,
+            ctypes.addressof(raw_array),
+            decompressed_size,
+            int(oodle.FuzzSafe.Yes),
+            int(oodle.CheckCRC.No),
+            int(oodle.Verbosity.Null),
+            None,
+            0,
+            None,
+            None,
+            None,
+            0,
+            int(oodle.DecodeThreadPhase.Unthreaded),
+        )
+        del raw_array
+        if size <= 0:
+            raise oodle.OodleDLLError("Oodle decompression failed.")
+        return size
+
+    def __repr__(self) -> str:
+        return f"NativeOodleCodec('{self.library_path}')"
+
+
+# Codec instance owned by each `SubprocessCodec` worker process.
+_WORKER_CODEC = None  # type: DCXCodec | None
+
+
+def _init_subprocess_codec(codec_factory: tp.Callable[[], DCXCodec]):
+    global _WORKER_CODEC
+    _WORKER_CODEC = codec_factory()
+
+
+def _subprocess_compress(data: bytes, level: int | None) -> bytes:
+    return bytes(_WORKER_CODEC.compress(data, level))
+
+
+def _subprocess_decompress(data: bytes, decompressed_size: int) -> bytes:
+    return bytes(_WORKER_CODEC.decompress(data, decompressed_size))
+
+
+class SubprocessCodec(DCXCodec):
+    """Runs another codec in a pool of long-lived worker processes, so that expensive setup (e.g. starting Wine and
+    loading the Oodle DLL) happens once per worker rather than in the main process.
+
+    `codec_factory` (usually just a codec class) must be picklable. Workers are started on first use and kept warm
+    until `close()` is called. Buffers are sent to and from the worker once each.
+    """
+
+    codec_factory: tp.Callable[[], DCXCodec]
+    processes: int
+
+    def __init__(self, codec_factory: tp.Callable[[], DCXCodec], processes: int = 1, name: str = ""):
+        self.codec_factory = codec_factory
+        self.processes = processes
+        self.name = name or getattr(codec_factory, "name", "") or "subprocess"
+        self._executor = None  # type: ProcessPoolExecutor | None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.processes, initializer=_init_subprocess_codec, initargs=(self.codec_factory,)
+            )
+        return self._executor
+
+    def compress(self, data: BUFFER_T, level: int | None = None) -> bytes:
+        return self._get_executor().submit(_subprocess_compress, bytes(data), level).result()
+
+    def decompress(self, data: BUFFER_T, decompressed_size: int) -> bytes:
+        return self._get_executor().submit(_subprocess_decompress, bytes(data), decompressed_size).result()
+
+    def close(self):
+        """Shut down worker processes. They will be restarted if the codec is used again."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __repr__(self) -> str:
+        return f"SubprocessCodec({self.codec_factory!r}, processes={self.processes})"
+
+
+class StandInCodec(ZlibCodec):
+    """Test stand-in for codecs that are unavailable (i.e. Oodle for `DCX_KRAK`). Uses `zlib`, so the output round-trips
+    through Soulstruct but is NOT readable by the games. Levels are clamped to zlib's 0-9 range."""
+
+    name = "stand-in"
+
+    def compress(self, data: BUFFER_T, level: int | None = None) -> bytes:
+        return super().compress(data, None if level is None else max(0, min(level, 9)))
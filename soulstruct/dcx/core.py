@@ -6,22 +6,33 @@ from __future__ import annotations
 
 __all__ = [
     "DCXType",
+    "DCXInfo",
+    "get_dcx_codec",
+    "set_dcx_codec",
+    "dcx_codec",
     "compress",
     "decompress",
+    "decompress_into",
+    "get_dcx_info",
     "is_dcx",
 ]
 
+import contextlib
 import logging
 import typing as tp
 import zlib
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
 
 from soulstruct.exceptions import SoulstructError
+from soulstruct.profiling import profile_span
 from soulstruct.utilities.binary import *
 
-from . import oodle
+from .cache import get_dcx_cache
+from .codecs import DCXCodec, OodleCodec, ZlibCodec
+from .policy import DCXPolicy, get_dcx_policy
 
 _LOGGER = logging.getLogger("soulstruct")
 
@@ -227,7 +238,61 @@ class DCXEdgeSubheader(BinaryStruct):
         return ByteOrder.BigEndian
 
 
-def _decompress_dcx_edge(reader: BinaryReader, header: DCXHeaderStruct) -> tuple[bytes, DCXType]:
+_DEFAULT_ZLIB_CODEC = ZlibCodec()
+_DEFAULT_OODLE_CODEC = OodleCodec()
+_DCX_CODECS = {}  # type: dict[DCXType, DCXCodec]
+
+
+def get_dcx_codec(dcx_type: DCXType) -> DCXCodec:
+    """Get codec used to (de)compress the payload of `dcx_type`. Not used for chunked `DCX_EDGE` and `DCP_EDGE` types.
+
+    Defaults to `OodleCodec` for `DCX_KRAK` and `ZlibCodec` for all other types.
+    """
+    if (codec := _DCX_CODECS.get(dcx_type)) is not None:
+        return codec
+    return _DEFAULT_OODLE_CODEC if dcx_type == DCXType.DCX_KRAK else _DEFAULT_ZLIB_CODEC
+
+
+def set_dcx_codec(dcx_type: DCXType, codec: DCXCodec | None):
+    """Register `codec` for `dcx_type`, or restore the default codec with `None`."""
+    if dcx_type in {DCXType.DCX_EDGE, DCXType.DCP_EDGE}:
+        raise ValueError(f"Cannot set codec for chunked DCX type {dcx_type.name}.")
+    if codec is None:
+        _DCX_CODECS.pop(dcx_type, None)
+    else:
+        _DCX_CODECS[dcx_type] = codec
+
+
+@contextlib.contextmanager
+def dcx_codec(dcx_type: DCXType, codec: DCXCodec) -> tp.Iterator[DCXCodec]:
+    """Temporarily register `codec` for `dcx_type`."""
+    old_codec = _DCX_CODECS.get(dcx_type)
+    set_dcx_codec(dcx_type, codec)
+    try:
+        yield codec
+    finally:
+        set_dcx_codec(dcx_type, old_codec)
+
+
+def _read_dcx_header(reader: BinaryReader) -> tuple[DCXType, DCPHeaderStruct | DCXHeaderStruct]:
+    """Detect DCX type and unpack the DCP/DCX header, leaving `reader` at the start of the 'DCA' section."""
+    dcx_type = DCXType.detect(reader)
+    if dcx_type == DCXType.Unknown:
+        raise DCXError("Unknown DCX type. Cannot decompress.")
+    if dcx_type == DCXType.DCP_DFLT:
+        header = DCPHeaderStruct.from_bytes(reader, byte_order=ByteOrder.BigEndian)
+    else:
+        header = DCXHeaderStruct.from_bytes(reader, byte_order=ByteOrder.BigEndian)
+    return dcx_type, header
+
+
+def _read_dcx_edge_chunk_table(
+    reader: BinaryReader, header: DCXHeaderStruct
+) -> tuple[int, list[tuple[int, int, bool]]]:
+    """Unpack and validate `DCX_EDGE` subheader and chunk table.
+
+    Returns absolute offset of compressed chunk data and a list of `(relative_offset, size, is_compressed)` tuples.
+    """
     dca_start = reader.position  # position of 'DCA' magic
     subheader = DCXEdgeSubheader.from_bytes(reader)
     if header.version3 != 0x50 + subheader.chunk_count * 0x10:
@@ -235,62 +300,143 @@ def _decompress_dcx_edge(reader: BinaryReader, header: DCXHeaderStruct) -> tuple
     if subheader.last_block_decompressed_size not in {0x10000, header.decompressed_size % 0x10000}:
         raise DCXError("DCX_EDGE subheader 'last_block_decompressed_size' does not match expected value.")
     if subheader.egdt_size != 0x24 + subheader.chunk_count * 0x10:
-        print(subheader)
         raise DCXError("DCX_EDGE subheader 'egdt_size' does not match expected value.")
 
-    chunks_offset = dca_start + subheader.dca_size
-    decompressed = bytearray()
+    chunks = []
     for _ in range(subheader.chunk_count):
         reader.unpack_value("i", asserted=0)
         offset, size, is_compressed_int = reader.unpack("3i")
         if is_compressed_int not in {0, 1}:
             raise DCXError("DCX_EDGE chunk 'is_compressed' field is not 0 or 1.")
-        chunk = reader.unpack_bytes(length=size, offset=chunks_offset + offset)
-        if is_compressed_int:
-            # Decompress using DEFLATE method.
-            decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
-            decompressed_chunk = decompressor.decompress(chunk)
-            decompressed_chunk += decompressor.flush()
-            decompressed += decompressed_chunk
-        else:
-            decompressed += chunk
-    return decompressed, DCXType.DCX_EDGE
+        chunks.append((offset, size, bool(is_compressed_int)))
+    return dca_start + subheader.dca_size, chunks
+
+
+def _decompress_edge_chunk(chunk: bytes, is_compressed: bool) -> bytes:
+    """Decompress a single `DCX_EDGE` chunk using raw DEFLATE, if it is compressed."""
+    if not is_compressed:
+        return chunk
+    decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+    return decompressor.decompress(chunk) + decompressor.flush()
+
+
+def _decompress_dcx_edge(reader: BinaryReader, header: DCXHeaderStruct, workers: int = 1) -> tuple[bytes, DCXType]:
+    chunks_offset, chunks = _read_dcx_edge_chunk_table(reader, header)
+    raw_chunks = [reader.read(size, offset=chunks_offset + offset) for offset, size, _ in chunks]
+    chunk_flags = [is_compressed for _, _, is_compressed in chunks]
+    if workers > 1 and len(chunks) > 1:
+        # `zlib` releases the GIL, so chunks can be decompressed in parallel on threads. `map()` preserves order.
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            decompressed_chunks = list(executor.map(_decompress_edge_chunk, raw_chunks, chunk_flags))
+    else:
+        decompressed_chunks = list(map(_decompress_edge_chunk, raw_chunks, chunk_flags))
+    return b"".join(decompressed_chunks), DCXType.DCX_EDGE
 
 
-def decompress(dcx_source: bytes | BinaryReader | tp.BinaryIO | Path | str) -> tuple[bytes, DCXType]:
+def decompress(
+    dcx_source: bytes | BinaryReader | tp.BinaryIO | Path | str, workers: int = 1
+) -> tuple[bytes, DCXType]:
     """Decompress the given file path, raw bytes, or buffer/reader.
 
     Returns a tuple containing the decompressed `bytes` and a `DCXInfo` instance that can be used to compress later
     with the same DCX type/parameters.
+
+    If `workers > 1`, the independent chunks of `DCX_EDGE` data will be decompressed in parallel on that many threads.
+    Ignored for other DCX types.
     """
-    reader = BinaryReader(dcx_source, default_byte_order=ByteOrder.BigEndian)  # always big-endian
-    dcx_type = DCXType.detect(reader)
+    with profile_span("decompress") as event:
+        decompressed, dcx_type = _decompress(dcx_source, workers)
+        event.size = len(decompressed)
+    return decompressed, dcx_type
 
-    if dcx_type == DCXType.Unknown:
-        raise DCXError("Unknown DCX type. Cannot decompress.")
-    if dcx_type == DCXType.DCP_DFLT:
-        header = DCPHeaderStruct.from_bytes(reader, byte_order=ByteOrder.BigEndian)
-    else:
-        header = DCXHeaderStruct.from_bytes(reader, byte_order=ByteOrder.BigEndian)
+
+def _decompress(dcx_source: bytes | BinaryReader | tp.BinaryIO | Path | str, workers: int) -> tuple[bytes, DCXType]:
+    reader = BinaryReader(dcx_source, default_byte_order=ByteOrder.BigEndian)  # always big-endian
+    dcx_type, header = _read_dcx_header(reader)
 
     if dcx_type == DCXType.DCX_EDGE:
-        return _decompress_dcx_edge(reader, header)
+        return _decompress_dcx_edge(reader, header, workers)
 
     reader.unpack_bytes(length=4, asserted=b"DCA")
     reader.unpack_value("i", asserted=8)  # compressed header size
     compressed = reader.read(header.compressed_size)
 
-    if dcx_type == DCXType.DCX_KRAK:
-        decompressed = oodle.decompress(compressed, header.decompressed_size)
-    else:
-        decompressed = zlib.decompressobj().decompress(compressed)
+    decompressed = get_dcx_codec(dcx_type).decompress(compressed, header.decompressed_size)
 
     if len(decompressed) != header.decompressed_size:
         raise DCXError("Decompressed DCX data size does not match size in header.")
     return decompressed, dcx_type
 
 
-def _compress_dcx_edge(raw_data: bytes) -> bytes:
+def decompress_into(
+    dcx_source: bytes | BinaryReader | tp.BinaryIO | Path | str, buffer: memoryview | bytearray, workers: int = 1
+) -> tuple[int, DCXType]:
+    """Decompress the given file path, raw bytes, or buffer/reader directly into writable `buffer`.
+
+    Returns a tuple containing the number of bytes written to the start of `buffer` (the decompressed size from the DCX
+    header) and the `DCXType`. Raises a `DCXError` if `buffer` is too small, which can be checked in advance with
+    `get_dcx_info()`.
+
+    Unlike `decompress()`, no buffer for the full decompressed payload is allocated, so the same `buffer` can be reused
+    for many files (see `DCXBufferPool`). Codecs that cannot decompress in place (such as the default `OodleCodec`)
+    decompress into their own buffer, which is then copied.
+    """
+    with profile_span("decompress") as event:
+        size, dcx_type = _decompress_into(dcx_source, buffer, workers)
+        event.size = size
+    return size, dcx_type
+
+
+def _decompress_into(
+    dcx_source: bytes | BinaryReader | tp.BinaryIO | Path | str, buffer: memoryview | bytearray, workers: int
+) -> tuple[int, DCXType]:
+    reader = BinaryReader(dcx_source, default_byte_order=ByteOrder.BigEndian)  # always big-endian
+    dcx_type, header = _read_dcx_header(reader)
+    decompressed_size = header.decompressed_size
+    buffer = memoryview(buffer).cast("B")
+    if len(buffer) < decompressed_size:
+        raise DCXError(f"Buffer of size {len(buffer)} is too small for decompressed DCX data ({decompressed_size}).")
+
+    if dcx_type == DCXType.DCX_EDGE:
+        chunks_offset, chunks = _read_dcx_edge_chunk_table(reader, header)
+        raw_chunks = [reader.read(size, offset=chunks_offset + offset) for offset, size, _ in chunks]
+        chunk_flags = [is_compressed for _, _, is_compressed in chunks]
+        if workers > 1 and len(chunks) > 1:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                decompressed_chunks = executor.map(_decompress_edge_chunk, raw_chunks, chunk_flags)
+                position = _copy_pieces_into(buffer, decompressed_chunks)
+        else:
+            position = _copy_pieces_into(buffer, map(_decompress_edge_chunk, raw_chunks, chunk_flags))
+    else:
+        reader.unpack_bytes(length=4, asserted=b"DCA")
+        reader.unpack_value("i", asserted=8)  # compressed header size
+        compressed = reader.read(header.compressed_size)
+        position = get_dcx_codec(dcx_type).decompress_into(compressed, decompressed_size, buffer)
+
+    if position != decompressed_size:
+        raise DCXError("Decompressed DCX data size does not match size in header.")
+    return position, dcx_type
+
+
+def _copy_pieces_into(buffer: memoryview, pieces: tp.Iterable[bytes]) -> int:
+    """Copy consecutive `pieces` into `buffer` and return the total size."""
+    position = 0
+    for piece in pieces:
+        end = position + len(piece)
+        if end > len(buffer):
+            raise DCXError("Decompressed DCX data does not fit in buffer.")
+        buffer[position:end] = piece
+        position = end
+    return position
+
+
+def _compress_edge_chunk(decompressed_chunk: bytes | memoryview, level: int = 9) -> bytes:
+    """Compress a single `DCX_EDGE` chunk (at most 64 KB) using raw DEFLATE."""
+    compressor = zlib.compressobj(level=level, method=zlib.DEFLATED, wbits=-zlib.MAX_WBITS)
+    return compressor.compress(decompressed_chunk) + compressor.flush(zlib.Z_FINISH)
+
+
+def _compress_dcx_edge(raw_data: bytes, workers: int = 1, level: int = 9) -> bytes:
     """Use DEFLATE compression and return compressed chunks after packed subheader."""
     writer = BinaryWriter(byte_order=ByteOrder.BigEndian)
 
@@ -333,21 +479,22 @@ def _compress_dcx_edge(raw_data: bytes) -> bytes:
     subheader.fill(writer, "dca_size", writer.position - dca_start)
     subheader.fill(writer, "egdt_size", writer.position - egdt_start)
     
+    raw_data = memoryview(raw_data)
+    decompressed_chunks = [raw_data[i * 0x10000:(i + 1) * 0x10000] for i in range(chunk_count)]
+    if workers > 1 and chunk_count > 1:
+        # `zlib` releases the GIL, so chunks can be compressed in parallel on threads. `map()` preserves order.
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            compressed_chunks = list(executor.map(_compress_edge_chunk, decompressed_chunks, [level] * chunk_count))
+    else:
+        compressed_chunks = [_compress_edge_chunk(chunk, level) for chunk in decompressed_chunks]
+
     data_start = writer.position
     compressed_size = 0
-    for i in range(chunk_count):
-        # 64 KB chunks, except for whatever is left in the last one.
-        decompressed_chunk_size = 0x10000 if i < chunk_count - 1 else last_block_decompressed_size
-        compressor = zlib.compressobj(level=9, method=zlib.DEFLATED, wbits=-zlib.MAX_WBITS)
-        raw_offset = i * 0x10000
-        decompressed_chunk = raw_data[raw_offset:raw_offset + decompressed_chunk_size]
-        chunk = compressor.compress(decompressed_chunk)
-        chunk += compressor.flush(zlib.Z_FINISH)
+    for i, (decompressed_chunk, chunk) in enumerate(zip(decompressed_chunks, compressed_chunks)):
         chunk_compressed_size = len(chunk)
-        
         writer.fill(f"offset{i}", writer.position - data_start)
         writer.fill(f"size{i}", chunk_compressed_size)
-        writer.fill(f"is_compressed{i}", int(chunk_compressed_size < decompressed_chunk_size))
+        writer.fill(f"is_compressed{i}", int(chunk_compressed_size < len(decompressed_chunk)))
         compressed_size += chunk_compressed_size
         writer.append(chunk)
         writer.pad_align(0x10)
@@ -357,40 +504,94 @@ def _compress_dcx_edge(raw_data: bytes) -> bytes:
     return bytes(writer)
 
 
-def compress(raw_data: bytes, dcx_type: DCXType) -> bytes:
+def compress(
+    raw_data: bytes, dcx_type: DCXType, workers: int | None = None, policy: DCXPolicy | None = None
+) -> bytes:
     """Compress `raw_data` with DCX of `dcx_type`.
 
     Returns bytes that are ready to be written to a DCX file.
+
+    Compression levels are taken from `policy`, which defaults to the global policy (see `set_dcx_policy()`). The
+    default global policy matches vanilla files exactly.
+
+    If `workers > 1`, the independent 64 KB chunks of `DCX_EDGE` data will be compressed in parallel on that many
+    threads. Output is identical to the serial path. Ignored for other DCX types. Defaults to `policy.workers`.
+
+    If a `DCXCache` is enabled (see `set_dcx_cache()`), previously compressed output for the same payload, DCX type, and
+    compression level is returned from it instead.
     """
+    if policy is None:
+        policy = get_dcx_policy()
+    if workers is None:
+        workers = policy.workers
+
+    with profile_span("compress", size=len(raw_data)):
+        if (cache := get_dcx_cache()) is None:
+            return _compress(raw_data, dcx_type, workers, policy)
+
+        key = cache.get_key(raw_data, dcx_type, policy)
+        if (compressed := cache.get(key)) is None:
+            compressed = _compress(raw_data, dcx_type, workers, policy)
+            cache.put(key, compressed)
+        return compressed
+
+
+def _compress(raw_data: bytes, dcx_type: DCXType, workers: int, policy: DCXPolicy) -> bytes:
     if dcx_type == DCXType.DCX_EDGE:
-        return _compress_dcx_edge(raw_data)
+        return _compress_dcx_edge(raw_data, workers, policy.edge_level)
+
+    level = policy.oodle_level if dcx_type == DCXType.DCX_KRAK else policy.zlib_level
+    compressed = get_dcx_codec(dcx_type).compress(raw_data, level)
+    return _pack_dcx_header(dcx_type, len(raw_data), len(compressed)) + compressed
 
-    if dcx_type == DCXType.DCX_KRAK:
-        compressed = oodle.compress(raw_data)  # default compressor and compression level are correct
-    else:
-        compressed = zlib.compress(raw_data, level=7)
 
+def _pack_dcx_header(dcx_type: DCXType, decompressed_size: int, compressed_size: int) -> bytes:
+    """Header that precedes compressed data for all types except `DCX_EDGE` (which also has a chunk table)."""
     if dcx_type == DCXType.DCP_DFLT:
-        header = bytes(DCPHeaderStruct(
-            decompressed_size=len(raw_data),
-            compressed_size=len(compressed),
-        ))
-    else:
-        version_info = dcx_type.get_version_info()
-        header = bytes(DCXHeaderStruct(
-            version1=version_info.version1,
-            version2=version_info.version2,
-            version3=version_info.version3,
-            compression_type=version_info.compression_type,
-            decompressed_size=len(raw_data),
-            compressed_size=len(compressed),
-            version4=version_info.version4,
-            version5=version_info.version5,
-            version6=version_info.version6,
-            version7=version_info.version7,
+        return bytes(DCPHeaderStruct(
+            decompressed_size=decompressed_size,
+            compressed_size=compressed_size,
         ))
-        header += b"DCA\0" + b"\x00\x00\x00\x08"
-    return header + compressed
+    version_info = dcx_type.get_version_info()
+    header = bytes(DCXHeaderStruct(
+        version1=version_info.version1,
+        version2=version_info.version2,
+        version3=version_info.version3,
+        compression_type=version_info.compression_type,
+        decompressed_size=decompressed_size,
+        compressed_size=compressed_size,
+        version4=version_info.version4,
+        version5=version_info.version5,
+        version6=version_info.version6,
+        version7=version_info.version7,
+    ))
+    return header + b"DCA\0" + b"\x00\x00\x00\x08"
+
+
+class DCXInfo(tp.NamedTuple):
+    """Summary of a DCX file's header."""
+    dcx_type: DCXType
+    decompressed_size: int
+    compressed_size: int
+
+
+def get_dcx_info(dcx_source: bytes | BinaryReader | tp.BinaryIO | Path | str) -> DCXInfo:
+    """Read only the DCX (or DCP) header of the given source, without reading or decompressing any payload data.
+
+    Raises a `DCXError` if the source is not a supported DCX file.
+    """
+    reader = BinaryReader(dcx_source, default_byte_order=ByteOrder.BigEndian)
+    try:
+        if not is_dcx(reader):
+            raise DCXError("Source does not start with DCX (or DCP) magic.")
+        with reader.temp_offset():
+            dcx_type, header = _read_dcx_header(reader)
+    finally:
+        if isinstance(dcx_source, (str, Path, bytes, bytearray)):
+            reader.close()
+        else:
+            reader.buffer = None  # detach so `reader` does not close caller's stream when collected
+    return DCXInfo(dcx_type, header.decompressed_size, header.compressed_size)
 
 
 def is_dcx(reader: BinaryReader) -> bool:
@@ -0,0 +1,111 @@
+"""Configurable DCX compression settings.
+
+By default, `compress()` matches vanilla game files exactly (zlib level 7 for DFLT, level 9 for `DCX_EDGE` chunks, and
+Oodle 'Optimal2' for `DCX_KRAK`). During iteration, when the same files are repacked many times, it is usually much
+faster to use a lower level, which the game engine will still happily read:
+
+    from soulstruct.dcx import DCXPolicy, set_dcx_policy
+    set_dcx_policy(DCXPolicy.dev())  # global
+    set_dcx_policy(DCXPolicy.release(), file_class=GameParamBND)  # per-class override (applies to subclasses too)
+
+    with dcx_policy(DCXPolicy(level=1)):  # temporary
+        msb.write()
+
+Policies are looked up by `BaseBinaryFile.__bytes__()` (and hence `write()`, `Binder.write()`, and
+`GameFileDirectory._write()`) using the class of the file being packed.
+"""
+from __future__ import annotations
+
+__all__ = [
+    "DCXPolicy",
+    "get_dcx_policy",
+    "set_dcx_policy",
+    "dcx_policy",
+]
+
+import contextlib
+import typing as tp
+from dataclasses import dataclass
+
+# Vanilla compression levels.
+RELEASE_ZLIB_LEVEL = 7
+RELEASE_EDGE_LEVEL = 9
+
+
+@dataclass(slots=True, frozen=True)
+class DCXPolicy:
+    """Compression settings for `compress()`. Any `None` level means "use the vanilla level"."""
+
+    # zlib level (0-9) for all DEFLATE-based DCX types (DFLT, DCP, and `DCX_EDGE` chunks).
+    level: int | None = None
+    # Oodle `CompressionLevel` value for `DCX_KRAK`.
+    oodle_level: int | None = None
+    # Number of threads to use for `DCX_EDGE` chunk compression.
+    workers: int = 1
+
+    def __post_init__(self):
+        if self.level is not None and not 0 <= self.level <= 9:
+            raise ValueError(f"DCX policy zlib `level` must be between 0 and 9, not {self.level}.")
+        if self.workers < 1:
+            raise ValueError(f"DCX policy `workers` must be at least 1, not {self.workers}.")
+
+    @classmethod
+    def release(cls) -> DCXPolicy:
+        """Byte-identical to vanilla compression."""
+        return cls()
+
+    @classmethod
+    def dev(cls, level=1) -> DCXPolicy:
+        """Fast compression for development builds. Files are larger but still valid."""
+        from .oodle import CompressionLevel
+        return cls(level=level, oodle_level=int(CompressionLevel.SuperFast))
+
+    @property
+    def zlib_level(self) -> int:
+        return RELEASE_ZLIB_LEVEL if self.level is None else self.level
+
+    @property
+    def edge_level(self) -> int:
+        return RELEASE_EDGE_LEVEL if self.level is None else self.level
+
+    @property
+    def is_release(self) -> bool:
+        return self.level is None and self.oodle_level is None
+
+
+_GLOBAL_POLICY = DCXPolicy.release()
+_CLASS_POLICIES = {}  # type: dict[type, DCXPolicy]
+
+
+def get_dcx_policy(file_class: type | None = None) -> DCXPolicy:
+    """Get policy for `file_class` (checking its MRO for overrides), or the global policy."""
+    if file_class is not None and _CLASS_POLICIES:
+        for cls in file_class.__mro__:
+            if cls in _CLASS_POLICIES:
+                return _CLASS_POLICIES[cls]
+    return _GLOBAL_POLICY
+
+
+def set_dcx_policy(policy: DCXPolicy | None, file_class: type | None = None):
+    """Set global policy, or override policy for `file_class` and its subclasses.
+
+    Passing `policy=None` resets the global policy to `DCXPolicy.release()` or removes the `file_class` override.
+    """
+    global _GLOBAL_POLICY
+    if file_class is None:
+        _GLOBAL_POLICY = policy if policy is not None else DCXPolicy.release()
+    elif policy is None:
+        _CLASS_POLICIES.pop(file_class, None)
+    else:
+        _CLASS_POLICIES[file_class] = policy
+
+
+@contextlib.contextmanager
+def dcx_policy(policy: DCXPolicy, file_class: type | None = None) -> tp.Iterator[DCXPolicy]:
+    """Temporarily set global (or `file_class`) policy."""
+    old_policy = _GLOBAL_POLICY if file_class is None else _CLASS_POLICIES.get(file_class)
+    set_dcx_policy(policy, file_class)
+    try:
+        yield policy
+    finally:
+        set_dcx_policy(old_policy, file_class)
@@ -0,0 +1,376 @@
+"""Seekable, incrementally-decompressed view of DCX data.
+
+`decompress()` always materializes the full decompressed payload. `decompress_stream()` instead returns a read-only
+`io.BufferedIOBase` that inflates data on demand, so it can be passed straight to `BinaryReader` (or any
+`BaseBinaryFile.from_bytes()`) and only the parts of the payload that are actually read are ever decompressed.
+
+DFLT payloads are a single DEFLATE stream, so random access is supported by saving copies of the `zlib` decompressor
+state at regular intervals ("checkpoints") and inflating forward from the nearest one. `DCX_EDGE` payloads are already
+split into independent 64 KB chunks, which can be decompressed in any order. `DCX_KRAK` (Oodle) has no streaming API
+and is simply decompressed in full.
+
+`DCXStreamWriter` goes the other way: it compresses DFLT payloads into a file as they are written, so that a large file
+(e.g. a binder written by `Binder.write_streamed()`) never has to be assembled in memory before compression.
+"""
+from __future__ import annotations
+
+__all__ = [
+    "DCXStreamReader",
+    "DCXStreamWriter",
+    "decompress_stream",
+]
+
+import io
+import typing as tp
+import zlib
+from pathlib import Path
+
+from soulstruct.utilities.binary import BinaryReader, ByteOrder
+
+from .codecs import ZlibCodec
+from .core import (
+    DCXError, DCXType, get_dcx_codec, _decompress_edge_chunk, _pack_dcx_header, _read_dcx_header,
+    _read_dcx_edge_chunk_table,
+)
+from .policy import DCXPolicy, get_dcx_policy
+
+# Size of decompressed blocks held in memory at once (and EDGE chunk size).
+_BLOCK_SIZE = 0x10000
+# Number of DFLT blocks between saved decompressor states.
+_CHECKPOINT_INTERVAL = 16
+# Size of compressed reads from source.
+_INPUT_SIZE = 0x10000
+
+
+class _InflateCursor:
+    """Position in a DEFLATE stream: decompressor state, next compressed source offset, and unconsumed input."""
+
+    __slots__ = ("decompressor", "source_offset", "tail")
+
+    def __init__(self, decompressor, source_offset: int, tail: bytes = b""):
+        self.decompressor = decompressor
+        self.source_offset = source_offset
+        self.tail = tail
+
+    def copy(self) -> _InflateCursor:
+        return _InflateCursor(self.decompressor.copy(), self.source_offset, self.tail)
+
+
+class DCXStreamReader(io.BufferedIOBase):
+    """Read-only, seekable stream over the decompressed payload of a DCX file.
+
+    Only one decompressed block is held in memory at a time. Create with `decompress_stream()`.
+    """
+
+    dcx_type: DCXType
+    decompressed_size: int
+
+    def __init__(
+        self,
+        source: tp.BinaryIO,
+        dcx_type: DCXType,
+        decompressed_size: int,
+        data_offset: int,
+        compressed_size: int,
+        chunks: list[tuple[int, int, bool]] | None = None,
+        owns_source=False,
+    ):
+        """Stream is chunked (independently decompressible blocks) if `chunks` is given, or a single DEFLATE stream
+        otherwise. Each chunk is a `(relative_offset, size, is_compressed)` tuple."""
+        super().__init__()
+        self._source = source
+        self._owns_source = owns_source
+        self.dcx_type = dcx_type
+        self.decompressed_size = decompressed_size
+        self._data_offset = data_offset
+        self._data_end = data_offset + compressed_size
+        self._chunks = chunks
+        self._position = 0
+
+        self._block_index = -1
+        self._block = b""
+
+        # DFLT only. Cursor is always positioned at the start of block `_cursor_block`.
+        self._cursor = None  # type: _InflateCursor | None
+        self._cursor_block = 0
+        self._checkpoints = {}  # type: dict[int, _InflateCursor]
+        if chunks is None:
+            self._cursor = _InflateCursor(zlib.decompressobj(), data_offset)
+            self._checkpoints[0] = self._cursor.copy()
+
+    # region Block Access
+
+    def _read_source(self, offset: int, size: int) -> bytes:
+        self._source.seek(offset)
+        return self._source.read(size)
+
+    def _get_block(self, block_index: int) -> bytes:
+        if block_index != self._block_index:
+            if self._chunks is not None:
+                self._block = self._decompress_chunk(block_index)
+            else:
+                self._block = self._inflate_block(block_index)
+            self._block_index = block_index
+        return self._block
+
+    def _decompress_chunk(self, chunk_index: int) -> bytes:
+        offset, size, is_compressed = self._chunks[chunk_index]
+        return _decompress_edge_chunk(self._read_source(self._data_offset + offset, size), is_compressed)
+
+    def _inflate_block(self, block_index: int) -> bytes:
+        if block_index < self._cursor_block:
+            # Rewind to nearest checkpoint at or before requested block.
+            checkpoint_block = block_index - block_index % _CHECKPOINT_INTERVAL
+            self._cursor = self._checkpoints[checkpoint_block].copy()
+            self._cursor_block = checkpoint_block
+        elif block_index - self._cursor_block >= _CHECKPOINT_INTERVAL:
+            # Jump forward to nearest checkpoint that has already been reached, if it's closer.
+            checkpoint_block = block_index - block_index % _CHECKPOINT_INTERVAL
+            if checkpoint_block in self._checkpoints:
+                self._cursor = self._checkpoints[checkpoint_block].copy()
+                self._cursor_block = checkpoint_block
+
+        while True:
+            block = self._inflate_next()
+            if self._cursor_block - 1 == block_index:
+                return block
+
+    def _inflate_next(self) -> bytes:
+        """Decompress the block at the cursor and advance the cursor, saving a checkpoint if appropriate."""
+        cursor = self._cursor
+        out = []
+        remaining = _BLOCK_SIZE
+        while remaining > 0:
+            if cursor.decompressor.eof:
+                break
+            if not cursor.tail and cursor.source_offset < self._data_end:
+                size = min(_INPUT_SIZE, self._data_end - cursor.source_offset)
+                cursor.tail = self._read_source(cursor.source_offset, size)
+                cursor.source_offset += len(cursor.tail)
+            # NOTE: Decompressor may still hold pending output after all input is consumed, so we always call it.
+            piece = cursor.decompressor.decompress(cursor.tail, remaining)
+            cursor.tail = cursor.decompressor.unconsumed_tail
+            if not piece:
+                break
+            out.append(piece)
+            remaining -= len(piece)
+
+        self._cursor_block += 1
+        if self._cursor_block % _CHECKPOINT_INTERVAL == 0 and self._cursor_block not in self._checkpoints:
+            self._checkpoints[self._cursor_block] = cursor.copy()
+        return b"".join(out)
+
+    # endregion
+
+    # region `io` Interface
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def read(self, size: int | None = -1) -> bytes:
+        if self.closed:
+            raise ValueError("I/O operation on closed DCX stream.")
+        end = self.decompressed_size if size is None or size < 0 else min(self.decompressed_size, self._position + size)
+        pieces = []
+        while self._position < end:
+            block_index, block_offset = divmod(self._position, _BLOCK_SIZE)
+            block = self._get_block(block_index)
+            if block_offset >= len(block):
+                raise DCXError(f"DCX stream ended early at offset {self._position} (expected {end} bytes).")
+            piece = block[block_offset:block_offset + end - self._position]
+            pieces.append(piece)
+            self._position += len(piece)
+        return b"".join(pieces)
+
+    read1 = read
+
+    def readinto(self, buffer) -> int:
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def seek(self, offset: int, whence=io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = self.decompressed_size + offset
+        else:
+            raise ValueError(f"Invalid `whence`: {whence}")
+        if position < 0:
+            raise ValueError(f"Negative seek position: {position}")
+        self._position = position
+        return position
+
+    def tell(self) -> int:
+        return self._position
+
+    def close(self):
+        if not self.closed:
+            if self._owns_source:
+                self._source.close()
+            self._block = b""
+            self._checkpoints.clear()
+            self._cursor = None
+        super().close()
+
+    # endregion
+
+    def __repr__(self) -> str:
+        return (
+            f"DCXStreamReader({self.dcx_type.name}, position={self._position}, "
+            f"decompressed_size={self.decompressed_size})"
+        )
+
+
+def decompress_stream(dcx_source: bytes | BinaryReader | tp.BinaryIO | Path | str) -> tuple[DCXStreamReader, DCXType]:
+    """Open a seekable, lazily-decompressed stream over the given DCX file path, raw bytes, or buffer/reader.
+
+    Returns a tuple containing the `DCXStreamReader` and the detected `DCXType`, mirroring `decompress()`. The stream
+    reads compressed data from the source as needed, so the source must stay open until the stream is closed. If a path
+    is given, the stream opens and owns its own file handle.
+    """
+    if isinstance(dcx_source, (str, Path)):
+        source = Path(dcx_source).open("rb")
+        owns_source = True
+    elif isinstance(dcx_source, (bytes, bytearray, memoryview)):
+        source = io.BytesIO(dcx_source)
+        owns_source = True
+    elif isinstance(dcx_source, BinaryReader):
+        source = dcx_source.buffer
+        owns_source = False
+    else:
+        source = dcx_source
+        owns_source = False
+
+    reader = BinaryReader(source, default_byte_order=ByteOrder.BigEndian)
+    dcx_type, header = _read_dcx_header(reader)
+
+    if dcx_type == DCXType.DCX_EDGE:
+        data_offset, chunks = _read_dcx_edge_chunk_table(reader, header)
+        reader.buffer = None  # detach so `reader` does not close `source` when collected
+        stream = DCXStreamReader(
+            source,
+            dcx_type,
+            header.decompressed_size,
+            data_offset,
+            header.compressed_size,
+            chunks,
+            owns_source=owns_source,
+        )
+        return stream, dcx_type
+
+    reader.unpack_bytes(length=4, asserted=b"DCA")
+    reader.unpack_value("i", asserted=8)  # compressed header size
+
+    codec = get_dcx_codec(dcx_type)
+    if not isinstance(codec, ZlibCodec):
+        # No incremental decompression available for Oodle (or other custom codecs). Decompress in full and serve it
+        # as uncompressed chunks.
+        decompressed = codec.decompress(reader.read(header.compressed_size), header.decompressed_size)
+        reader.buffer = None
+        if owns_source:
+            source.close()
+        chunks = [
+            (offset, min(_BLOCK_SIZE, len(decompressed) - offset), False)
+            for offset in range(0, len(decompressed), _BLOCK_SIZE)
+        ]
+        stream = DCXStreamReader(
+            io.BytesIO(decompressed), dcx_type, len(decompressed), 0, len(decompressed), chunks, owns_source=True
+        )
+        return stream, dcx_type
+
+    data_offset = reader.position
+    reader.buffer = None  # detach so `reader` does not close `source` when collected
+    stream = DCXStreamReader(
+        source,
+        dcx_type,
+        header.decompressed_size,
+        data_offset,
+        header.compressed_size,
+        owns_source=owns_source,
+    )
+    return stream, dcx_type
+
+
+class DCXStreamWriter(io.BufferedIOBase):
+    """Write-only stream that compresses everything written to it into a DCX file, incrementally.
+
+    The total `decompressed_size` must be known in advance, as it precedes the data in the DCX header. The compressed
+    size is filled in by `close()`, so `file` must be seekable; it is left open. Output is identical to `compress()`
+    (without a `DCXCache`).
+
+    Only types compressed with a `ZlibCodec` (DFLT types, `DCP_DFLT`) can be streamed. Check with `supports()`.
+    """
+
+    dcx_type: DCXType
+    decompressed_size: int
+
+    def __init__(
+        self, file: tp.BinaryIO, dcx_type: DCXType, decompressed_size: int, policy: DCXPolicy | None = None
+    ):
+        super().__init__()
+        if not self.supports(dcx_type):
+            raise DCXError(f"Cannot stream DCX compression for type {dcx_type.name} with its current codec.")
+        if policy is None:
+            policy = get_dcx_policy()
+        codec = get_dcx_codec(dcx_type)
+        level = policy.oodle_level if dcx_type == DCXType.DCX_KRAK else policy.zlib_level
+        self.dcx_type = dcx_type
+        self.decompressed_size = decompressed_size
+        self._file = file
+        self._header_offset = file.tell()
+        self._compressor = zlib.compressobj(level=codec.DEFAULT_LEVEL if level is None else level)
+        self._written = 0
+        self._compressed_size = 0
+        file.write(_pack_dcx_header(dcx_type, decompressed_size, 0))  # compressed size filled in on close
+
+    @staticmethod
+    def supports(dcx_type: DCXType) -> bool:
+        """Whether `dcx_type` (with its currently registered codec) can be compressed incrementally."""
+        if dcx_type in {DCXType.Unknown, DCXType.Null, DCXType.Zlib, DCXType.DCP_EDGE, DCXType.DCX_EDGE}:
+            return False  # not compressed, or chunked
+        return isinstance(get_dcx_codec(dcx_type), ZlibCodec)
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        if self.closed:
+            raise ValueError("I/O operation on closed DCX stream.")
+        compressed = self._compressor.compress(data)
+        self._file.write(compressed)
+        self._compressed_size += len(compressed)
+        size = len(memoryview(data).cast("B"))
+        self._written += size
+        return size
+
+    def tell(self) -> int:
+        """Position in decompressed payload."""
+        return self._written
+
+    def close(self):
+        if self.closed:
+            return
+        compressed = self._compressor.flush()
+        self._file.write(compressed)
+        self._compressed_size += len(compressed)
+        super().close()
+        if self._written != self.decompressed_size:
+            raise DCXError(
+                f"Wrote {self._written} bytes to DCX stream, but expected decompressed size {self.decompressed_size}."
+            )
+        end = self._file.tell()
+        self._file.seek(self._header_offset)
+        self._file.write(_pack_dcx_header(self.dcx_type, self.decompressed_size, self._compressed_size))
+        self._file.seek(end)
+
+    def __repr__(self) -> str:
+        return (
+            f"DCXStreamWriter({self.dcx_type.name}, written={self._written}, "
+            f"decompressed_size={self.decompressed_size})"
+        )
@@ -31,7 +31,7 @@ class DivBinder(Binder):
     write_blf_division: bool = True
 
     @classmethod
-    def from_path(cls, path: str | Path, bdt_path: str | Path | None = None) -> tp.Self:
+    def from_path(cls, path: str | Path, bdt_path: str | Path | None = None, lazy=False) -> tp.Self:
         """`path` should be the path to the core Binder containing BLF files.
 
         Does NOT support `bdt_path` of base class currently, as no split div Binders have been encountered.
@@ -42,7 +42,7 @@ class DivBinder(Binder):
 
         # Read base Binder (as `DivBinder` instance).
         # noinspection PyTypeChecker
-        core_binder = super(DivBinder, cls).from_path(path, bdt_path)  # type: tp.Self
+        core_binder = super(DivBinder, cls).from_path(path, bdt_path, lazy)  # type: tp.Self
 
         # We only need the stems of BLF entries to find those files next to `path`. No need to read BLFs.
         blf_stems = [entry.minimal_stem for entry in core_binder.entries if entry.name.endswith(".blf")]
@@ -62,7 +62,7 @@ class DivBinder(Binder):
             div_path = Path(path).with_name(div_name)
             if not div_path.is_file():
                 raise FileNotFoundError(f"Could not find div Binder file specified by BLF: {div_path}")
-            div_binder = Binder.from_path(div_path)
+            div_binder = Binder.from_path(div_path, lazy=lazy)
             found_div_data = False
             for div_entry in div_binder.entries:
                 if not found_div_data and div_entry.name == "div_data.txt":
@@ -0,0 +1,206 @@
+"""Opt-in instrumentation of Soulstruct's read/write hot paths.
+
+Inside a `profiling()` block, timings and byte counts are recorded (from all threads) for DCX `decompress` and
+`compress`, `from_reader` and `to_writer` calls made by `from_bytes()`/`from_path()` and `bytes()`, and `Binder` entry
+reads. Events are attributed to the `BaseBinaryFile` subclass being read or written, including nested ones (e.g. the
+`Param`s inside a `GameParamBND`):
+
+    from soulstruct.profiling import profiling
+    with profiling() as profile:
+        map_studio_directory = MapStudioDirectory.from_path(map_studio_path)
+    print(profile.get_summary_table())
+    profile.write_chrome_trace("msb_trace.json")  # open in `chrome://tracing` or https://ui.perfetto.dev
+
+Times are inclusive: a binder's `from_reader` time includes reading its entries, and `from_reader` of a DCX file does
+not include its decompression (which is a separate event). Work done in other processes (e.g. by `*_batch` methods) is
+not recorded. When no profile is active, instrumented code only pays for one global lookup per event.
+"""
+from __future__ import annotations
+
+__all__ = [
+    "ProfileEvent",
+    "Profile",
+    "profiling",
+    "get_active_profile",
+    "profile_category",
+    "profile_span",
+    "get_remaining_size",
+]
+
+import contextlib
+import io
+import json
+import os
+import threading
+import time
+import typing as tp
+from dataclasses import dataclass
+from pathlib import Path
+
+
+@dataclass(slots=True)
+class ProfileEvent:
+    name: str
+    category: str
+    start_ns: int
+    duration_ns: int = 0
+    # Bytes processed: decompressed size for `decompress`, input size for `compress`, and binary file size otherwise.
+    size: int = 0
+    thread_id: int = 0
+
+
+class Profile:
+    """Records `ProfileEvent`s and summarizes them. Safe to record from multiple threads."""
+
+    events: list[ProfileEvent]
+
+    def __init__(self):
+        self.events = []
+        self._start_ns = time.perf_counter_ns()
+        self._local = threading.local()
+
+    def _get_category_stack(self) -> list[str]:
+        try:
+            return self._local.stack
+        except AttributeError:
+            self._local.stack = []
+            return self._local.stack
+
+    @contextlib.contextmanager
+    def category(self, category: str) -> tp.Iterator[None]:
+        """Attribute events inside this block (on this thread) without their own category to `category`."""
+        stack = self._get_category_stack()
+        stack.append(category)
+        try:
+            yield
+        finally:
+            stack.pop()
+
+    @contextlib.contextmanager
+    def span(self, name: str, category: str = None, size: int = 0) -> tp.Iterator[ProfileEvent]:
+        """Record an event covering this block. Its `size` can be set on the yielded event before the block ends.
+
+        If `category` is not given, the innermost `category()` block on this thread is used.
+        """
+        if category is None:
+            stack = self._get_category_stack()
+            category = stack[-1] if stack else "-"
+        event = ProfileEvent(name, category, time.perf_counter_ns(), size=size, thread_id=threading.get_ident())
+        try:
+            with self.category(category):
+                yield event
+        finally:
+            event.duration_ns = time.perf_counter_ns() - event.start_ns
+            self.events.append(event)
+
+    def get_summary(self) -> list[dict[str, tp.Any]]:
+        """Total count, time, and size of events per (category, name), sorted by total time (descending)."""
+        totals = {}  # type: dict[tuple[str, str], list[int]]
+        for event in self.events:
+            total = totals.setdefault((event.category, event.name), [0, 0, 0])
+            total[0] += 1
+            total[1] += event.duration_ns
+            total[2] += event.size
+        summary = []
+        for (category, name), (count, duration_ns, size) in totals.items():
+            seconds = duration_ns / 1e9
+            summary.append({
+                "category": category,
+                "name": name,
+                "count": count,
+                "total_s": seconds,
+                "mean_ms": seconds * 1000 / count,
+                "bytes": size,
+                "mb_per_s": size / 1024 ** 2 / seconds if seconds > 0 else 0.0,
+            })
+        summary.sort(key=lambda row: row["total_s"], reverse=True)
+        return summary
+
+    def get_summary_table(self) -> str:
+        """Summary as a fixed-width text table."""
+        header = (
+            f"{'Category':<28} {'Event':<12} {'Count':>7} {'Total (s)':>10} {'Mean (ms)':>10} {'MB':>9} {'MB/s':>9}"
+        )
+        lines = [header, "-" * len(header)]
+        for row in self.get_summary():
+            lines.append(
+                f"{row['category'][:28]:<28} {row['name'][:12]:<12} {row['count']:>7} {row['total_s']:>10.4f} "
+                f"{row['mean_ms']:>10.3f} {row['bytes'] / 1024 ** 2:>9.2f} {row['mb_per_s']:>9.1f}"
+            )
+        return "\n".join(lines)
+
+    def print_summary(self):
+        print(self.get_summary_table())
+
+    def to_chrome_trace(self) -> dict[str, tp.Any]:
+        """Events in Chrome's Trace Event Format (complete 'X' events, in microseconds since profile start)."""
+        pid = os.getpid()
+        trace_events = [
+            {
+                "name": event.name,
+                "cat": event.category,
+                "ph": "X",
+                "ts": (event.start_ns - self._start_ns) / 1000,
+                "dur": event.duration_ns / 1000,
+                "pid": pid,
+                "tid": event.thread_id,
+                "args": {"class": event.category, "bytes": event.size},
+            }
+            for event in self.events
+        ]
+        return {"traceEvents": trace_events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, path: str | Path):
+        Path(path).write_text(json.dumps(self.to_chrome_trace()))
+
+    def __repr__(self) -> str:
+        return f"Profile(<{len(self.events)} events>)"
+
+
+_ACTIVE_PROFILE = None  # type: Profile | None
+# Yielded by `profile_span()` when not profiling, so instrumented code can set `size` unconditionally.
+_NULL_EVENT = ProfileEvent("", "", 0)
+
+
+def get_active_profile() -> Profile | None:
+    return _ACTIVE_PROFILE
+
+
+@contextlib.contextmanager
+def profiling(profile: Profile = None) -> tp.Iterator[Profile]:
+    """Record events into `profile` (or a new `Profile`) inside this block, then restore any previous profile."""
+    global _ACTIVE_PROFILE
+    if profile is None:
+        profile = Profile()
+    previous, _ACTIVE_PROFILE = _ACTIVE_PROFILE, profile
+    try:
+        yield profile
+    finally:
+        _ACTIVE_PROFILE = previous
+
+
+def profile_category(category: str) -> tp.ContextManager[None]:
+    """`Profile.category()` of active profile, or a no-op if not profiling."""
+    if _ACTIVE_PROFILE is None:
+        return contextlib.nullcontext()
+    return _ACTIVE_PROFILE.category(category)
+
+
+def profile_span(name: str, category: str = None, size: int = 0) -> tp.ContextManager[ProfileEvent]:
+    """`Profile.span()` of active profile, or a no-op (yielding a throwaway event) if not profiling."""
+    if _ACTIVE_PROFILE is None:
+        return contextlib.nullcontext(_NULL_EVENT)
+    return _ACTIVE_PROFILE.span(name, category, size)
+
+
+def get_remaining_size(stream: tp.BinaryIO) -> int:
+    """Number of bytes from current position to end of seekable `stream`, for recording event sizes.
+
+    Lazily-decompressed streams (with a `decompressed_size`, like `DCXStreamReader`) are not read to their end.
+    """
+    position = stream.tell()
+    if (decompressed_size := getattr(stream, "decompressed_size", None)) is not None:
+        return decompressed_size - position
+    end = stream.seek(0, io.SEEK_END)
+    stream.seek(position)
+    return end - position
@@ -9,6 +9,8 @@ __all__ = [
     "read_json",
     "write_json",
     "get_blake2b_hash",
+    "get_cached_file_hash",
+    "set_cached_file_hash",
 ]
 
 import ctypes
@@ -21,6 +23,7 @@ import re
 import shutil
 import string
 import sys
+import threading
 import types
 from pathlib import Path
 
@@ -29,6 +32,10 @@ from soulstruct.exceptions import RestoreBackupError
 _LOGGER = logging.getLogger("soulstruct")
 LOG_BACKUP_CREATION = True
 
+# Process umask, read once at import (it can only be read by setting it, which is not thread-safe).
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
 
 def PACKAGE_PATH(*relative_parts) -> Path:
     """Returns resolved path of given files in `soulstruct` package directory (the actual namespace directory containing
@@ -84,6 +91,18 @@ def restore_bak(target=None, delete_baks=False):
             return count
 
 
+def copy_file_mode(file_path: str | Path, temp_path: str | Path):
+    """Give `temp_path` the permission bits of existing `file_path` that it is about to replace, or the default
+    permissions of a new file (under the process umask) if `file_path` does not exist.
+
+    Needed for files created by `tempfile.mkstemp()`, which are always owner-only.
+    """
+    if Path(file_path).is_file():
+        shutil.copymode(file_path, temp_path)
+    else:
+        os.chmod(temp_path, 0o666 & ~_UMASK)
+
+
 def find_steam_common_paths():
     """Not using anymore. Seems to cause 'WinError 87' OSErrors for some people for some drives."""
     steam_common_paths = []
@@ -152,7 +171,7 @@ def write_json(
         f.write(json_str)
 
 
-def get_blake2b_hash(data: bytes | str | Path) -> bytes:
+def get_blake2b_hash(data: bytes | bytearray | memoryview | str | Path) -> bytes:
     if isinstance(data, (str, Path)):
         file_hash = hashlib.blake2b()
         with Path(data).open("rb") as f:
@@ -161,6 +180,37 @@ def get_blake2b_hash(data: bytes | str | Path) -> bytes:
                 file_hash.update(chunk)
                 chunk = f.read(8192)
         return file_hash.digest()
-    elif isinstance(data, bytes):
+    elif isinstance(data, (bytes, bytearray, memoryview)):
         return hashlib.blake2b(data).digest()
     raise TypeError(f"Can only get hash of `bytes` or `str`/`Path` of file, not {type(data)}.")
+
+
+# Maps resolved file paths to `(size, mtime_ns, blake2b_hash)` of files hashed or written in this process.
+_FILE_HASH_CACHE = {}  # type: dict[Path, tuple[int, int, bytes]]
+_FILE_HASH_CACHE_LOCK = threading.Lock()
+
+
+def get_cached_file_hash(file_path: str | Path) -> bytes | None:
+    """Get `get_blake2b_hash()` of file, reusing its last hash computed (or set) in this process if its size and
+    modification time have not changed since. Returns `None` if the file does not exist."""
+    file_path = Path(file_path).resolve()
+    try:
+        stat = file_path.stat()
+    except FileNotFoundError:
+        return None
+    with _FILE_HASH_CACHE_LOCK:
+        cached = _FILE_HASH_CACHE.get(file_path)
+    if cached is not None and cached[:2] == (stat.st_size, stat.st_mtime_ns):
+        return cached[2]
+    file_hash = get_blake2b_hash(file_path)
+    with _FILE_HASH_CACHE_LOCK:
+        _FILE_HASH_CACHE[file_path] = (stat.st_size, stat.st_mtime_ns, file_hash)
+    return file_hash
+
+
+def set_cached_file_hash(file_path: str | Path, file_hash: bytes):
+    """Record known `file_hash` of existing file (e.g. hash of data just written to it) for `get_cached_file_hash()`."""
+    file_path = Path(file_path).resolve()
+    stat = file_path.stat()
+    with _FILE_HASH_CACHE_LOCK:
+        _FILE_HASH_CACHE[file_path] = (stat.st_size, stat.st_mtime_ns, file_hash)
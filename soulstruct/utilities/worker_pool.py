@@ -0,0 +1,164 @@
+"""Shared, lazily started process pool for the `*_batch` methods.
+
+Creating a `multiprocessing.Pool` for every batch call means paying for process startup (and, with the 'spawn' start
+method, for importing Soulstruct again in every worker) on every call. All batch methods instead share one pool, which
+is only started the first time it is used and then kept alive until `shutdown_worker_pool()` (or interpreter exit):
+
+    from soulstruct.utilities.worker_pool import set_worker_pool_size
+    set_worker_pool_size(8)
+    emevds = EMEVD.from_path_batch(emevd_paths)  # starts pool
+    msbs = MSB.from_path_batch(msb_paths)  # reuses same worker processes
+
+Batch methods given an explicit `processes` count that differs from the shared pool size still use a temporary pool of
+that size, as before.
+
+Note that workers only see module state from when the pool was started (with the 'fork' start method) or imported (with
+'spawn'). Call `shutdown_worker_pool()` after changing global settings (like `set_dcx_policy()`) that workers should use.
+"""
+from __future__ import annotations
+
+__all__ = [
+    "WorkerPool",
+    "get_worker_pool",
+    "set_worker_pool_size",
+    "shutdown_worker_pool",
+    "batch_starmap",
+]
+
+import atexit
+import logging
+import multiprocessing
+import multiprocessing.pool
+import os
+import threading
+import typing as tp
+
+_LOGGER = logging.getLogger("soulstruct")
+
+T = tp.TypeVar("T")
+
+
+class WorkerPool:
+    """Wraps a `multiprocessing.Pool` that is started on first use and can be reused for any number of calls.
+
+    Work is submitted in chunks (default: about four chunks per worker) so that many small tasks do not each pay for a
+    round trip to a worker process. Safe to submit work from multiple threads.
+    """
+
+    processes: int
+    chunk_size: int | None
+
+    def __init__(self, processes: int = None, chunk_size: int = None):
+        self.processes = processes or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self._lock = threading.Lock()
+        self._pool = None  # type: multiprocessing.pool.Pool | None
+
+    @property
+    def is_started(self) -> bool:
+        return self._pool is not None
+
+    def get_pool(self) -> multiprocessing.pool.Pool:
+        """Get underlying `multiprocessing.Pool`, starting it if necessary."""
+        with self._lock:
+            if self._pool is None:
+                _LOGGER.debug(f"Starting worker pool with {self.processes} processes.")
+                self._pool = multiprocessing.Pool(processes=self.processes, initializer=_init_worker)
+            return self._pool
+
+    def get_chunk_size(self, task_count: int | None) -> int:
+        if self.chunk_size is not None:
+            return self.chunk_size
+        if task_count is None:
+            return 1
+        return max(1, -(-task_count // (self.processes * 4)))
+
+    def starmap(self, func: tp.Callable[..., T], args_list: tp.Sequence[tuple], chunk_size: int = None) -> list[T]:
+        """Call `func(*args)` for each `args` in `args_list` in worker processes and return results in order.
+
+        `func` must be picklable (i.e. a module-level function).
+        """
+        if not args_list:
+            return []
+        chunk_size = chunk_size or self.get_chunk_size(len(args_list))
+        return self.get_pool().starmap(func, args_list, chunksize=chunk_size)
+
+    def imap(
+        self, func: tp.Callable[..., T], args_iter: tp.Iterable[tuple], chunk_size: int = None, ordered=True
+    ) -> tp.Iterator[T]:
+        """Call `func(*args)` for each `args` in `args_iter` in worker processes, and yield results as they finish.
+
+        Results are yielded in submission order if `ordered` is True, or in completion order otherwise.
+        """
+        task_count = len(args_iter) if isinstance(args_iter, tp.Sized) else None
+        chunk_size = chunk_size or self.get_chunk_size(task_count)
+        tasks = ((func, args) for args in args_iter)
+        pool = self.get_pool()
+        imap = pool.imap if ordered else pool.imap_unordered
+        return imap(_star_call, tasks, chunksize=chunk_size)
+
+    def shutdown(self):
+        """Stop worker processes. The pool will be started again if used afterward."""
+        with self._lock:
+            if self._pool is not None:
+                self._pool.close()
+                self._pool.join()
+                self._pool = None
+
+    def __repr__(self) -> str:
+        return f"WorkerPool(processes={self.processes}, chunk_size={self.chunk_size}, started={self.is_started})"
+
+
+def _init_worker():
+    """Give each worker process its own decompression buffer pool, reused across all the files it loads."""
+    from soulstruct.dcx import DCXBufferPool, get_dcx_buffer_pool, set_dcx_buffer_pool
+    if get_dcx_buffer_pool() is None:
+        set_dcx_buffer_pool(DCXBufferPool())
+
+
+def _star_call(func_and_args: tuple[tp.Callable[..., T], tuple]) -> T:
+    func, args = func_and_args
+    return func(*args)
+
+
+_WORKER_POOL = None  # type: WorkerPool | None
+_WORKER_POOL_LOCK = threading.Lock()
+
+
+def get_worker_pool() -> WorkerPool:
+    """Get shared `WorkerPool`, creating it (but not starting its processes) if necessary."""
+    global _WORKER_POOL
+    with _WORKER_POOL_LOCK:
+        if _WORKER_POOL is None:
+            _WORKER_POOL = WorkerPool()
+        return _WORKER_POOL
+
+
+def set_worker_pool_size(processes: int = None, chunk_size: int = None):
+    """Replace shared `WorkerPool` with one of given size (default: CPU count). Any running workers are stopped."""
+    global _WORKER_POOL
+    with _WORKER_POOL_LOCK:
+        old_pool, _WORKER_POOL = _WORKER_POOL, WorkerPool(processes, chunk_size)
+    if old_pool is not None:
+        old_pool.shutdown()
+
+
+def shutdown_worker_pool():
+    """Stop worker processes of shared `WorkerPool`. It will be started again by the next batch call."""
+    if _WORKER_POOL is not None:
+        _WORKER_POOL.shutdown()
+
+
+def batch_starmap(func: tp.Callable[..., T], args_list: tp.Sequence[tuple], processes: int = None) -> list[T]:
+    """Run `func(*args)` for every `args` in `args_list` on the shared `WorkerPool`.
+
+    If `processes` is given and does not match the shared pool size, a temporary pool of that size is used instead.
+    """
+    worker_pool = get_worker_pool()
+    if processes is None or processes == worker_pool.processes:
+        return worker_pool.starmap(func, args_list)
+    with multiprocessing.Pool(processes=processes, initializer=_init_worker) as pool:
+        return pool.starmap(func, args_list)  # blocks here until all done
+
+
+atexit.register(shutdown_worker_pool)
@@ -0,0 +1,193 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest import mock
+
+from soulstruct.base.async_io import gather_limited, set_async_executor
+from soulstruct.base.build_manifest import BuildManifest, build_manifest
+from soulstruct.darksouls1r.events import EMEVD, EventDirectory
+from soulstruct.darksouls1r.params import GameParamBND
+from soulstruct.utilities.worker_pool import get_worker_pool, set_worker_pool_size, shutdown_worker_pool
+
+
+def _get_pid() -> int:
+    return os.getpid()
+
+
+class _PackCountingFile:
+    """Stands in for files whose packing changes instance state (e.g. binders with `entry_autogen()`)."""
+
+    def __init__(self):
+        self.pack_count = 0
+
+    def __bytes__(self):
+        self.pack_count += 1
+        return b"packed"
+
+
+def _read_files(directory: str) -> dict[str, bytes]:
+    """Contents of all files in `directory`, except backups."""
+    return {path.name: path.read_bytes() for path in Path(directory).iterdir() if path.suffix != ".bak"}
+
+
+class BatchTest(unittest.TestCase):
+
+    def test_worker_pool(self):
+        set_worker_pool_size(2)
+        try:
+            paths = ["resources/m10_00_00_00.emevd.dcx"] * 4 + ["missing.emevd.dcx"]
+            emevds = EMEVD.from_path_batch(paths)
+            self.assertIsNone(emevds[-1])
+            self.assertEqual(bytes(emevds[0]), bytes(EMEVD.from_path(paths[0])))
+            pool = get_worker_pool().get_pool()
+            self.assertEqual(len(EMEVD.to_bytes_batch(emevds[:4])), 4)
+            self.assertIs(get_worker_pool().get_pool(), pool)  # reused
+            self.assertLessEqual(len(set(get_worker_pool().starmap(_get_pid, [()] * 20))), 2)
+
+            streamed = list(EMEVD.iter_from_path_batch(paths, ordered=False))
+            self.assertEqual(sorted(str(path) for path, _ in streamed), sorted(paths))
+            self.assertEqual(sum(emevd is None for _, emevd in streamed), 1)
+        finally:
+            shutdown_worker_pool()
+        self.assertFalse(get_worker_pool().is_started)
+
+    def test_directory_write(self):
+        emevd = EMEVD.from_path("resources/m10_00_00_00.emevd.dcx")
+        event_directory = EventDirectory(files={"m10_00_00_00": emevd, "m10_01_00_00": emevd})
+        try:
+            with tempfile.TemporaryDirectory() as temp_dir:
+                written = event_directory.write(temp_dir, processes=2)
+                self.assertEqual(len(written), 2)
+                self.assertTrue(all(path.read_bytes() == bytes(emevd) for path in written))
+                self.assertEqual(event_directory.write(temp_dir, check_file_hashes=True), [])
+
+            # Files are packed in this process by default, so changes made by packing are kept.
+            with tempfile.TemporaryDirectory() as temp_dir:
+                counting_files = {"m10_00_00_00": _PackCountingFile(), "m10_01_00_00": _PackCountingFile()}
+                self.assertEqual(len(EventDirectory(files=counting_files).write(temp_dir)), 2)
+                self.assertEqual([file.pack_count for file in counting_files.values()], [1, 1])
+        finally:
+            shutdown_worker_pool()
+
+    def test_directory_write_rollback(self):
+        emevd = EMEVD.from_path("resources/m10_00_00_00.emevd.dcx")
+        event_directory = EventDirectory(files={"m10_00_00_00": emevd, "m10_01_00_00": emevd, "m10_02_00_00": emevd})
+        with tempfile.TemporaryDirectory() as temp_dir:
+            written = event_directory.write(temp_dir)
+            event_directory.files["m10_01_00_00"] = new_emevd = EMEVD.from_path("resources/m10_00_00_00.emevd.dcx")
+            new_emevd.map_name = "m10_01_00_00"
+            written[2].unlink()
+            original_files = _read_files(temp_dir)
+
+            real_replace = os.replace
+            replace_calls = []
+
+            def _fail_second_replace(source, destination):
+                replace_calls.append(destination)
+                if len(replace_calls) == 2:
+                    raise PermissionError("file locked")
+                real_replace(source, destination)
+
+            with mock.patch("soulstruct.base.game_file_directory.os.replace", _fail_second_replace):
+                with self.assertRaises(PermissionError):
+                    event_directory.write(temp_dir)
+            self.assertGreater(len(replace_calls), 2)  # first replaced file was restored
+            self.assertEqual(_read_files(temp_dir), original_files)  # and no temporary files left
+
+            with mock.patch("soulstruct.base.game_file_directory.os.replace", _fail_second_replace):
+                replace_calls.clear()
+                written = event_directory.write(temp_dir, no_partial_write=False)
+            self.assertEqual(len(written), 2)
+            self.assertFalse(any(path.suffix in {".tmp", ".old"} for path in Path(temp_dir).iterdir()))
+
+    @unittest.skipIf(os.name == "nt", "POSIX file modes only")
+    def test_directory_write_mode(self):
+        emevd = EMEVD.from_path("resources/m10_00_00_00.emevd.dcx")
+        event_directory = EventDirectory(files={"m10_00_00_00": emevd, "m10_01_00_00": emevd})
+        with tempfile.TemporaryDirectory() as temp_dir, mock.patch("soulstruct.utilities.files._UMASK", 0o022):
+            existing_path = Path(temp_dir, "m10_01_00_00.emevd")
+            existing_path.write_bytes(b"old")
+            existing_path.chmod(0o640)
+            written = event_directory.write(temp_dir)
+            self.assertIn(existing_path, written)
+            self.assertEqual({path.name: path.stat().st_mode & 0o777 for path in written}, {
+                "m10_00_00_00.emevd": 0o644,  # new file
+                "m10_01_00_00.emevd": 0o640,  # existing file mode kept
+            })
+
+    def test_build_manifest(self):
+        emevd = EMEVD.from_path("resources/m10_00_00_00.emevd.dcx")
+        event_directory = EventDirectory(files={"m10_00_00_00": emevd})
+        with tempfile.TemporaryDirectory() as temp_dir:
+            emevd_path = Path(temp_dir, "out/m10_01_00_00.emevd.dcx")
+            with build_manifest(temp_dir) as manifest:
+                self.assertEqual(emevd.write(emevd_path), [emevd_path])
+                self.assertEqual(len(event_directory.write(Path(temp_dir, "event"), processes=1)), 1)
+                self.assertEqual(emevd.write(emevd_path), [])  # unchanged
+                self.assertEqual(manifest.skipped_count, 1)
+
+            # Manifest is saved and reloaded. Changed instances and externally modified files are rewritten.
+            with build_manifest(temp_dir) as manifest:
+                self.assertEqual(len(manifest), 2)
+                self.assertEqual(event_directory.write(Path(temp_dir, "event"), processes=1), [])
+                self.assertEqual(EMEVD.from_path("resources/m10_00_00_00.emevd.dcx").write(emevd_path), [])
+                emevd.map_name = "m10_01_00_00"
+                self.assertEqual(emevd.write(emevd_path), [emevd_path])
+                emevd_path.write_bytes(b"")
+                self.assertEqual(emevd.write(emevd_path), [emevd_path])
+                self.assertEqual(manifest.skipped_count, 2)
+            self.assertEqual(len(BuildManifest(temp_dir)), 2)
+
+    def test_build_manifest_binder(self):
+        game_param_bnd = GameParamBND.from_path("resources/GameParam.parambnd.dcx")
+        with tempfile.TemporaryDirectory() as temp_dir:
+            param_path = Path(temp_dir, "GameParam.parambnd.dcx")
+            with build_manifest(temp_dir) as manifest:
+                self.assertEqual(game_param_bnd.write(param_path), [param_path])
+                # Unchanged binder is skipped before its entries are regenerated.
+                with mock.patch.object(GameParamBND, "entry_autogen") as entry_autogen:
+                    self.assertEqual(game_param_bnd.write(param_path), [])
+                entry_autogen.assert_not_called()
+                self.assertEqual(manifest.skipped_count, 1)
+                self.assertFalse(param_path.with_name(param_path.name + ".bak").exists())
+
+                param_stem, param = next(iter(game_param_bnd.params.items()))
+                row_id = next(iter(param))
+                param[row_id].Name = "Changed"
+                self.assertEqual(game_param_bnd.write(param_path), [param_path])
+                self.assertEqual(manifest.skipped_count, 1)
+            self.assertEqual(GameParamBND.from_path(param_path).params[param_stem][row_id].Name, "Changed")
+
+    def test_async(self):
+        paths = ["resources/m10_00_00_00.emevd.dcx"] * 3 + ["missing.emevd.dcx"]
+        active = [0, 0]  # current, max
+
+        async def _track():
+            active[0] += 1
+            active[1] = max(active)
+            await asyncio.sleep(0.01)
+            active[0] -= 1
+
+        async def _main(temp_dir: str):
+            emevd = await EMEVD.from_path_async(paths[0])
+            written = await emevd.write_async(Path(temp_dir, "m10_00_00_00.emevd.dcx"))
+            emevds = await EMEVD.from_path_batch_async([written[0], *paths], limit=2)
+            await gather_limited((_track() for _ in range(10)), limit=3)
+            return emevd, emevds
+
+        with tempfile.TemporaryDirectory() as temp_dir, ThreadPoolExecutor(2) as executor:
+            set_async_executor(executor)
+            try:
+                emevd, emevds = asyncio.run(_main(temp_dir))
+            finally:
+                set_async_executor(None)
+        self.assertEqual(bytes(emevd), bytes(EMEVD.from_path(paths[0])))
+        self.assertEqual([bytes(e) if e else None for e in emevds], [bytes(emevd)] * 4 + [None])
+        self.assertEqual(active[1], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
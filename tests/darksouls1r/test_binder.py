@@ -0,0 +1,314 @@
+import os
+import pickle
+import struct
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest import mock
+
+from soulstruct.base.models.flver import FLVER
+from soulstruct.containers import (
+    BHD5Archive, Binder, BinderEntry, BinderError, BinderFlags, BinderVersion, TPF, VirtualPathResolver
+)
+from soulstruct.containers.binder_hash import BinderHashTable
+from soulstruct.darksouls1r.events import EMEVD
+from soulstruct.dcx import DCXBufferPool, DCXType, decompress, get_dcx_info
+from soulstruct.utilities.binary import BinaryReader
+
+
+class BinderTest(unittest.TestCase):
+
+    def test_probe(self):
+        for name in ("GameParam.parambnd.dcx", "m10_00_00_00.talkesdbnd.dcx"):
+            binder = Binder.from_path(f"resources/{name}")
+            probe = Binder.probe(f"resources/{name}")
+            self.assertEqual(probe.version, BinderVersion.V3)
+            self.assertEqual(probe.signature, binder.signature)
+            self.assertEqual(probe.dcx_type, binder.dcx_type)
+            self.assertFalse(probe.is_split_bxf)
+            self.assertEqual(probe.entry_ids, [entry.entry_id for entry in binder.entries])
+            self.assertEqual(probe.entry_paths, [entry.path for entry in binder.entries])
+            self.assertEqual(probe.entry_sizes, [entry.data_size for entry in binder.entries])
+
+            # Uncompressed binder.
+            uncompressed_probe = Binder.probe(bytes(binder.to_writer()))
+            self.assertEqual(uncompressed_probe.dcx_type, DCXType.Null)
+            self.assertEqual(uncompressed_probe.entry_paths, probe.entry_paths)
+
+        probes = Binder.probe_batch(["resources/GameParam.parambnd.dcx", "resources/m10_00_00_00.msb"])
+        self.assertEqual(probes[0].entry_ids, Binder.probe("resources/GameParam.parambnd.dcx").entry_ids)
+        self.assertIsNone(probes[1])  # not a binder
+
+    def test_lazy_entries(self):
+        eager = Binder.from_path("resources/GameParam.parambnd.dcx")
+        lazy = Binder.from_path("resources/GameParam.parambnd.dcx", lazy=True)
+        self.assertFalse(any(entry.is_loaded for entry in lazy.entries))
+        self.assertEqual([e.data_size for e in lazy.entries], [e.data_size for e in eager.entries])
+        self.assertFalse(any(entry.is_loaded for entry in lazy.entries))
+        self.assertEqual(lazy.entries[-1].data, eager.entries[-1].data)
+        self.assertTrue(lazy.entries[-1].is_loaded)
+        self.assertFalse(lazy.entries[0].is_loaded)
+        self.assertEqual(pickle.loads(pickle.dumps(lazy.entries[0])), eager.entries[0])
+        self.assertEqual(lazy.entries, eager.entries)
+
+        # Split BXF: entries are read from the open BDT file.
+        eager.is_split_bxf = True
+        eager.dcx_type = DCXType.Null
+        with tempfile.TemporaryDirectory() as temp_dir:
+            eager.write_split(Path(temp_dir, "test.parambhd"), Path(temp_dir, "test.parambdt"))
+            lazy = Binder.from_path(Path(temp_dir, "test.parambhd"), lazy=True)
+            self.assertTrue(lazy.is_split_bxf)
+            self.assertFalse(any(entry.is_loaded for entry in lazy.entries))
+            self.assertEqual(lazy.entries[5].data, eager.entries[5].data)
+            self.assertEqual(lazy.entries, eager.entries)
+            del lazy  # close BDT
+
+    def test_mmap_bdt(self):
+        binder = Binder.from_path("resources/GameParam.parambnd.dcx")
+        binder.is_split_bxf = True
+        binder.dcx_type = DCXType.Null
+        with tempfile.TemporaryDirectory() as temp_dir:
+            binder.write_split(Path(temp_dir, "test.parambhd"), Path(temp_dir, "test.parambdt"))
+            mapped = Binder.from_path(Path(temp_dir, "test.parambhd"), mmap_bdt=True)
+            self.assertIsInstance(mapped.entries[0].data, memoryview)
+            self.assertEqual(mapped.entries, binder.entries)
+            self.assertEqual(mapped.get_split_bytes(), binder.get_split_bytes())
+            self.assertEqual(pickle.loads(pickle.dumps(mapped.entries[3])), binder.entries[3])
+            del mapped  # close mapping
+
+        # Pooled buffers are reused, so entries read from them are copied.
+        pool = DCXBufferPool()
+        with pool.decompress("resources/GameParam.parambnd.dcx") as (stream, _):
+            pooled = Binder.from_reader(BinaryReader(stream))
+        self.assertIsInstance(pooled.entries[0].data, bytes)
+        with pool.decompress("resources/m10_00_00_00.talkesdbnd.dcx"):
+            pass  # overwrites same buffer
+        self.assertEqual(pooled.entries, binder.entries)
+
+    def test_patch_split_entry(self):
+        binder = Binder.from_path("resources/GameParam.parambnd.dcx")
+        binder.is_split_bxf = True
+        binder.dcx_type = DCXType.Null
+        with tempfile.TemporaryDirectory() as temp_dir:
+            bhd_path, bdt_path = Path(temp_dir, "test.parambhd"), Path(temp_dir, "test.parambdt")
+            binder.write_split(bhd_path, bdt_path)
+            bdt_size = bdt_path.stat().st_size
+            bhd_path.chmod(0o640)
+
+            # New data is appended by default, leaving old data (still used by old BHD) untouched.
+            old_bdt = bdt_path.read_bytes()
+            smaller = binder.entries[3].copy()
+            smaller.data = binder.entries[3].data[:100]
+            Binder.patch_split_entry(bhd_path, smaller)
+            self.assertTrue(bdt_path.read_bytes().startswith(old_bdt))
+            self.assertGreater(bdt_path.stat().st_size, bdt_size)
+            binder.entries[3] = smaller
+            patched = Binder.from_path(bhd_path)
+            self.assertEqual(patched.entries, binder.entries)
+
+            # Smaller data is written in place only if requested.
+            bdt_size = bdt_path.stat().st_size
+            smaller = binder.entries[4].copy()
+            smaller.data = binder.entries[4].data[:100]
+            Binder.patch_split_entry(bhd_path, smaller, overwrite_in_place=True)
+            self.assertEqual(bdt_path.stat().st_size, bdt_size)
+            binder.entries[4] = smaller
+            patched = Binder.from_path(bhd_path)
+            self.assertEqual(patched.entries, binder.entries)
+
+            # Larger data is always appended. Matches a full rewrite (other than BDT data layout).
+            larger = binder.entries[5].copy()
+            larger.data = binder.entries[5].data * 2
+            Binder.patch_split_entry(bhd_path, larger, overwrite_in_place=True)
+            self.assertGreater(bdt_path.stat().st_size, bdt_size)
+            binder.entries[5] = larger
+            patched = Binder.from_path(bhd_path)
+            self.assertEqual(patched.entries, binder.entries)
+            self.assertEqual(patched.get_split_bytes(), binder.get_split_bytes())
+            if os.name != "nt":
+                self.assertEqual(bhd_path.stat().st_mode & 0o777, 0o640)  # BHD mode kept
+
+            # Old BHD is left intact if writing the new BHD fails.
+            old_bhd = bhd_path.read_bytes()
+            with mock.patch("soulstruct.containers.core.os.replace", side_effect=OSError("replace failed")):
+                with self.assertRaises(OSError):
+                    Binder.patch_split_entry(bhd_path, smaller)
+            self.assertEqual(bhd_path.read_bytes(), old_bhd)
+            self.assertEqual(sorted(p.name for p in Path(temp_dir).iterdir()), ["test.parambdt", "test.parambhd"])
+            self.assertEqual(Binder.from_path(bhd_path).entries, binder.entries)
+
+    def test_entry_index(self):
+        binder = Binder.from_path("resources/GameParam.parambnd.dcx")
+        entry = binder.entries[3]
+        self.assertIs(binder[entry.entry_id], entry)
+        self.assertIs(binder[entry.name], entry)
+        self.assertIs(binder.find_entry_path(entry.path), entry)
+
+        # Direct changes to entries and the entry list are noticed.
+        entry.path = entry.path.replace(".param", "_renamed.param")
+        self.assertIs(binder[entry.name], entry)
+        binder.entries.append(BinderEntry(b"", 9000, "N:/test/new.bin"))
+        self.assertEqual(binder["new.bin"].entry_id, 9000)
+
+        binder.add_or_replace_entry_with_id(BinderEntry(b"data", 9000, "N:/test/replaced.bin"))
+        self.assertEqual(binder.get_entries_by_id()[9000].path, "N:/test/replaced.bin")
+        with self.assertRaises(Binder.EntryNotFoundError):
+            binder.find_entry_name("new.bin")
+
+        binder.add_entry(BinderEntry(b"", 9001, "N:/other/replaced.bin"))
+        self.assertEqual(binder.find_entry_name("replaced.bin").entry_id, 9000)  # first
+        with self.assertRaises(BinderError):
+            binder.find_entry_name("replaced.bin", assert_unique=True)
+        binder.remove_entry_id(9001)
+        self.assertEqual(binder.remove_entry_name("replaced.bin").entry_id, 9000)
+        self.assertEqual(len(binder.get_entries_by_name()), len(binder.entries))
+
+    def test_parallel_entry_packing(self):
+        files = [EMEVD.from_path("resources/m10_00_00_00.emevd.dcx"), TPF.from_path("resources/m10_00_arch_01.tpf.dcx")]
+        packed = []
+        for threads in (1, 4):
+            entries = [BinderEntry(b"", i, f"N:/test/{i}.bin", flags=0x3) for i in range(8)]  # compressed
+            with mock.patch.object(Binder, "ENTRY_PACK_THREADS", threads):
+                Binder().set_entries_from_binary_files((entry, files[i % 2]) for i, entry in enumerate(entries))
+            packed.append([entry.data for entry in entries])
+        self.assertEqual(packed[0], packed[1])
+        self.assertEqual(BinderEntry(packed[1][1], flags=0x3).get_uncompressed_data(), bytes(files[1]))
+
+        # Few entries of binder without compression are packed serially.
+        entries = [BinderEntry(b"", i, f"N:/test/{i}.bin") for i in range(8)]
+        with (
+            mock.patch.object(Binder, "ENTRY_PACK_THREADS", 4),
+            mock.patch("soulstruct.containers.core.ThreadPoolExecutor") as executor,
+        ):
+            binder = Binder(flags=BinderFlags(0b00001110))
+            binder.set_entries_from_binary_files((entry, files[i % 2]) for i, entry in enumerate(entries))
+            executor.assert_not_called()
+            with mock.patch.object(Binder, "ENTRY_PACK_THREADS_MIN_ENTRIES", 8):
+                binder.set_entries_from_binary_files((entry, files[i % 2]) for i, entry in enumerate(entries))
+            executor.assert_called_once()
+        self.assertEqual([entry.data for entry in entries], [bytes(files[i % 2]) for i in range(8)])
+
+    def test_write_streamed(self):
+        binder = Binder.from_path("resources/GameParam.parambnd.dcx")
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = binder.write_streamed(Path(temp_dir, "test.parambnd.dcx"))[0]
+            self.assertEqual(path.read_bytes(), bytes(binder))
+
+            # Lazy binder can be streamed back over its own source, keeping its mode (and any unrelated '.tmp' file).
+            path.chmod(0o640)
+            other_temp_path = path.with_name(path.name + ".tmp")
+            other_temp_path.write_bytes(b"unrelated")
+            lazy = Binder.from_path(path, lazy=True)
+            lazy.write_streamed(path)
+            self.assertFalse(any(entry.is_loaded for entry in lazy.entries))
+            self.assertEqual(path.read_bytes(), bytes(binder))
+            self.assertEqual(other_temp_path.read_bytes(), b"unrelated")
+            if os.name != "nt":
+                self.assertEqual(path.stat().st_mode & 0o777, 0o640)
+            del lazy
+
+            # Concurrent writers of the same file do not share a temporary file.
+            with ThreadPoolExecutor(4) as executor:
+                list(executor.map(lambda _: binder.write_streamed(path), range(4)))
+            self.assertEqual(path.read_bytes(), bytes(binder))
+            self.assertEqual(len(list(Path(temp_dir).glob("*.tmp"))), 1)
+
+            binder.is_split_bxf = True
+            bhd_path, bdt_path = binder.write_streamed(Path(temp_dir, "test.parambhd"))
+            self.assertEqual((bhd_path.read_bytes(), bdt_path.read_bytes()), binder.get_split_bytes())
+
+            # BDT path cannot be guessed from a BHD path without 'bhd'.
+            for write in (binder.write, binder.write_streamed):
+                with self.assertRaises(ValueError):
+                    write(Path(temp_dir, "test.bin"))
+            self.assertFalse(list(Path(temp_dir).glob("test.bin*")))
+
+    def test_unpacked_batch(self):
+        binder = Binder.from_path("resources/GameParam.parambnd.dcx")
+        with tempfile.TemporaryDirectory() as temp_dir:
+            binder.write_unpacked_directory(Path(temp_dir, "threaded.unpacked"), threads=4)
+            repacked = Binder.from_unpacked_path(Path(temp_dir, "threaded.unpacked"), threads=4)
+            self.assertEqual(repacked.entries, binder.entries)
+
+            binder.write(Path(temp_dir, "GameParam.parambnd.dcx"))
+            sizes = Binder.unpack_batch([Path(temp_dir, "GameParam.parambnd.dcx"), "missing.bnd"], processes=1)
+            self.assertEqual(sizes, [sum(entry.data_size for entry in binder.entries), None])
+            sizes = Binder.pack_batch([Path(temp_dir, "GameParam.parambnd.dcx.unpacked")], processes=1, threads=2)
+            self.assertEqual(sizes, [Path(temp_dir, "GameParam.parambnd.dcx").stat().st_size])
+
+    def test_bhd5_archive(self):
+        files = {
+            "/event/m10_00_00_00.emevd.dcx": Path("resources/m10_00_00_00.emevd.dcx").read_bytes(),
+            "/map/MapStudio/m10_00_00_00.msb": b"not really an MSB",
+        }
+        # Synthetic DS1 archive: two buckets, one file in each.
+        bdt, file_headers = bytearray(b"BDF307D7R6\0\0\0\0\0\0"), []
+        for path, data in files.items():
+            file_headers.append(struct.pack("<Iiq", BinderHashTable.path_hash(path), len(data), len(bdt)))
+            bdt += data
+        buckets = struct.pack("<4i", 1, 0x28, 1, 0x38)
+        bhd = struct.pack("<4sb?2x4i", b"BHD5", -1, False, 1, 0x48, 2, 0x18) + buckets + b"".join(file_headers)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            Path(temp_dir, "dvdbnd0.bhd5").write_bytes(bhd)
+            Path(temp_dir, "dvdbnd0.bdt").write_bytes(bdt)
+            with BHD5Archive(Path(temp_dir, "dvdbnd0.bhd5")) as archive:
+                self.assertEqual(len(archive), 2)
+                self.assertIn("MAP\\MapStudio\\M10_00_00_00.MSB", archive)  # case and separators do not matter
+                msb_path = "/map/MapStudio/m10_00_00_00.msb"
+                self.assertEqual(archive.read(msb_path), files[msb_path])
+                emevd = archive.get_binary_file("/event/m10_00_00_00.emevd.dcx", EMEVD)
+                self.assertEqual(bytes(emevd), bytes(EMEVD.from_path("resources/m10_00_00_00.emevd.dcx")))
+                with self.assertRaises(Binder.EntryNotFoundError):
+                    archive.open("/event/m11_00_00_00.emevd.dcx")
+
+    def test_virtual_path_resolver(self):
+        inner = Binder(version=BinderVersion.V3, v4_info=None)
+        inner.add_entry(BinderEntry(Path("resources/m10_00_00_00.emevd.dcx").read_bytes(), 0, "N:/event/m10.emevd.dcx"))
+        chrbnd = Binder(version=BinderVersion.V3, v4_info=None, dcx_type=DCXType.DCX_DFLT_10000_24_9)
+        chrbnd.add_entry(BinderEntry(Path("resources/c5370.flver").read_bytes(), 200, "N:/chr/c5370/c5370.flver"))
+        chrbnd.add_entry(BinderEntry(bytes(TPF.from_path("resources/m10_00_arch_01.tpf.dcx")), 100, "N:/c5370.tpf"))
+        chrbnd.add_entry(BinderEntry(bytes(inner), 300, "N:/chr/c5370/inner.bnd"))
+        with tempfile.TemporaryDirectory() as temp_dir:
+            chrbnd.write(Path(temp_dir, "chr/c5370.chrbnd.dcx"))
+            resolver = VirtualPathResolver(temp_dir, file_types={".emevd": EMEVD})
+            flver = resolver.resolve("chr/c5370.chrbnd.dcx/c5370.flver")
+            self.assertIsInstance(flver, FLVER)
+            self.assertEqual(flver.path, Path("N:/chr/c5370/c5370.flver"))
+            self.assertIsInstance(resolver.resolve("chr/C5370.chrbnd.dcx/C5370.TPF"), TPF)
+            emevd = resolver.resolve("chr/c5370.chrbnd.dcx/inner.bnd/m10.emevd.dcx")
+            self.assertEqual(bytes(emevd), bytes(EMEVD.from_path("resources/m10_00_00_00.emevd.dcx")))
+            self.assertEqual((resolver.hits, resolver.misses), (2, 2))  # chrbnd decoded once
+            with self.assertRaises(Binder.EntryNotFoundError):
+                resolver.resolve("chr/c5370.chrbnd.dcx/c5371.flver")
+
+    def test_virtual_path_resolver_nested_split(self):
+        """Split BHD entries find their BDT as a sibling entry, or next to the outer binder (like DS1 'chrtpfbhd')."""
+        tpf_data = Path("resources/m10_00_arch_01.tpf.dcx").read_bytes()
+        tpfbhd = Binder(version=BinderVersion.V3, v4_info=None, is_split_bxf=True, dcx_type=DCXType.Null)
+        tpfbhd.add_entry(BinderEntry(tpf_data, 0, "c5370_body.tpf.dcx"))
+        bhd, bdt = tpfbhd.get_split_bytes()
+        chrbnd = Binder(version=BinderVersion.V3, v4_info=None, dcx_type=DCXType.DCX_DFLT_10000_24_9)
+        chrbnd.add_entry(BinderEntry(bhd, 400, "N:/chr/c5370/c5370.chrtpfbhd"))
+        chrbnd.add_entry(BinderEntry(bhd, 401, "N:/chr/c5370/c5371.chrtpfbhd"))
+        chrbnd.add_entry(BinderEntry(bdt, 402, "N:/chr/c5370/c5371.chrtpfbdt"))
+        with tempfile.TemporaryDirectory() as temp_dir:
+            chrbnd.write(Path(temp_dir, "chr/c5370.chrbnd.dcx"))
+            resolver = VirtualPathResolver(temp_dir)
+            with self.assertRaises(FileNotFoundError):
+                resolver.get_entry("chr/c5370.chrbnd.dcx/c5370.chrtpfbhd/c5370_body.tpf.dcx")
+            Path(temp_dir, "chr/C5370.chrtpfbdt").write_bytes(bdt)  # on disk, differently cased
+            for bhd_name in ("c5370.chrtpfbhd", "c5371.chrtpfbhd"):
+                entry = resolver.get_entry(f"chr/c5370.chrbnd.dcx/{bhd_name}/c5370_body.tpf.dcx")
+                self.assertEqual(bytes(entry), tpf_data)
+            chrtpfbhd = resolver.get_binder(Path(temp_dir, "chr/c5370.chrbnd.dcx"), ["c5370.chrtpfbhd"])
+            self.assertTrue(chrtpfbhd.is_split_bxf)
+
+    def test_dcx_info(self):
+        info = get_dcx_info("resources/GameParam.parambnd.dcx")
+        self.assertEqual(info.dcx_type, DCXType.DCX_DFLT_10000_24_9)
+        self.assertEqual(info.decompressed_size, len(decompress("resources/GameParam.parambnd.dcx")[0]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+import io
+import os
+import tempfile
+import unittest
+
+from soulstruct.containers import Binder
+from soulstruct.darksouls1r.events import EMEVD
+from soulstruct.dcx import (
+    DCXType, DCXBufferPool, DCXCache, DCXPolicy, DCXStreamWriter, StandInCodec, SubprocessCodec, ZlibCodec, compress,
+    decompress, decompress_into, decompress_stream, dcx_codec, dcx_policy, get_dcx_codec, get_dcx_policy,
+    set_dcx_buffer_pool, set_dcx_cache,
+)
+
+
+class DCXTest(unittest.TestCase):
+
+    def test_stream_matches_decompress(self):
+        for name in ("GameParam.parambnd.dcx", "m10_00_00_00.emevd.dcx", "m10_00_arch_01.tpf.dcx"):
+            data, dcx_type = decompress(f"resources/{name}")
+            stream, stream_dcx_type = decompress_stream(f"resources/{name}")
+            self.assertEqual(dcx_type, stream_dcx_type)
+            self.assertEqual(stream.read(), data)
+
+            # Random access, including backwards seeks across checkpoints.
+            for offset in (len(data) - 100, 0x10000 * 17 + 5, 3, len(data) // 2, 0):
+                offset = max(0, min(offset, len(data) - 1))
+                stream.seek(offset)
+                self.assertEqual(stream.read(50), data[offset:offset + 50])
+            stream.close()
+
+    def test_stream_dcx_edge(self):
+        raw = os.urandom(0x8000) + bytes(0x30000) + b"soulstruct" * 1000
+        compressed = compress(raw, DCXType.DCX_EDGE)
+        stream, dcx_type = decompress_stream(compressed)
+        self.assertEqual(dcx_type, DCXType.DCX_EDGE)
+        stream.seek(0x20000 - 5)
+        self.assertEqual(stream.read(10), raw[0x20000 - 5:0x20000 + 5])
+        stream.seek(0)
+        self.assertEqual(stream.read(), raw)
+
+    def test_dcx_edge_workers(self):
+        raw = os.urandom(0x8000) + bytes(0x30000) + b"soulstruct" * 50000
+        serial = compress(raw, DCXType.DCX_EDGE)
+        self.assertEqual(compress(raw, DCXType.DCX_EDGE, workers=4), serial)
+        self.assertEqual(decompress(serial, workers=4), (raw, DCXType.DCX_EDGE))
+        self.assertEqual(decompress(serial), (raw, DCXType.DCX_EDGE))
+
+    def test_dcx_policy(self):
+        binder = Binder.from_path("resources/GameParam.parambnd.dcx")
+        release = bytes(binder)
+        with dcx_policy(DCXPolicy.dev(), file_class=Binder):
+            self.assertEqual(get_dcx_policy(type(binder)), DCXPolicy.dev())
+            dev = bytes(binder)
+        self.assertEqual(get_dcx_policy(Binder), DCXPolicy.release())
+        self.assertNotEqual(dev, release)
+        self.assertEqual(decompress(dev), decompress(release))
+
+    def test_dcx_cache(self):
+        data, dcx_type = decompress("resources/m10_00_00_00.emevd.dcx")
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = DCXCache(cache_dir, max_size=1024 ** 2)
+            set_dcx_cache(cache)
+            try:
+                compressed = compress(data, dcx_type)
+                self.assertEqual((cache.hits, cache.misses), (0, 1))
+                self.assertEqual(compress(data, dcx_type), compressed)
+                self.assertEqual((cache.hits, cache.misses), (1, 1))
+                compress(data, dcx_type, policy=DCXPolicy.dev())  # different level, different key
+                self.assertEqual(len(cache), 2)
+                self.assertEqual(len(DCXCache(cache_dir)), 2)  # index reloaded from disk
+
+                # Fill past size cap; least-recently-used entries are evicted first.
+                cache.max_size = cache.total_size + 100
+                compress(os.urandom(1000), dcx_type)
+                self.assertEqual(len(cache), 2)
+                self.assertLessEqual(cache.total_size, cache.max_size)
+            finally:
+                set_dcx_cache(None)
+
+    def test_stream_writer(self):
+        raw = b"soulstruct" * 100000 + os.urandom(10000)
+        for dcx_type in (DCXType.DCX_DFLT_10000_24_9, DCXType.DCP_DFLT):
+            f = io.BytesIO()
+            stream = DCXStreamWriter(f, dcx_type, len(raw))
+            for i in range(0, len(raw), 30000):
+                stream.write(raw[i:i + 30000])
+            stream.close()
+            self.assertEqual(f.getvalue(), compress(raw, dcx_type))
+        self.assertFalse(DCXStreamWriter.supports(DCXType.DCX_EDGE))
+
+    def test_decompress_into(self):
+        edge_raw = os.urandom(0x8000) + bytes(0x30000)
+        sources = [
+            (compress(edge_raw, DCXType.DCX_EDGE), edge_raw),
+            ("resources/m10_00_00_00.emevd.dcx", decompress("resources/m10_00_00_00.emevd.dcx")[0]),
+        ]
+        for source, raw in sources:
+            buffer = bytearray(len(raw) + 100)
+            size, _ = decompress_into(source, buffer)
+            self.assertEqual(size, len(raw))
+            self.assertEqual(buffer[:size], raw)
+            with self.assertRaises(Exception):
+                decompress_into(source, bytearray(len(raw) - 1))
+
+        pool = DCXBufferPool()
+        set_dcx_buffer_pool(pool)
+        try:
+            emevds = [EMEVD.from_path("resources/m10_00_00_00.emevd.dcx") for _ in range(3)]
+        finally:
+            set_dcx_buffer_pool(None)
+        self.assertEqual((pool.allocations, pool.reuses), (1, 2))
+        self.assertEqual(bytes(emevds[2]), bytes(EMEVD.from_path("resources/m10_00_00_00.emevd.dcx")))
+
+    def test_dcx_codecs(self):
+        raw = b"soulstruct" * 10000 + os.urandom(1000)
+        with dcx_codec(DCXType.DCX_KRAK, StandInCodec()):
+            compressed = compress(raw, DCXType.DCX_KRAK)
+            self.assertEqual(decompress(compressed), (raw, DCXType.DCX_KRAK))
+            buffer = bytearray(len(raw))
+            self.assertEqual(decompress_into(compressed, buffer), (len(raw), DCXType.DCX_KRAK))
+            self.assertEqual(buffer, raw)
+            stream, _ = decompress_stream(compressed)
+            self.assertEqual(stream.read(), raw)
+        self.assertNotIsInstance(get_dcx_codec(DCXType.DCX_KRAK), StandInCodec)
+
+        codec = SubprocessCodec(ZlibCodec)
+        try:
+            with dcx_codec(DCXType.DCX_DFLT_10000_24_9, codec):
+                compressed = compress(raw, DCXType.DCX_DFLT_10000_24_9)
+                self.assertEqual(decompress(compressed), (raw, DCXType.DCX_DFLT_10000_24_9))
+        finally:
+            codec.close()
+        self.assertEqual(compressed, compress(raw, DCXType.DCX_DFLT_10000_24_9))
+
+    def test_binder_from_stream(self):
+        stream, _ = decompress_stream("resources/GameParam.parambnd.dcx")
+        binder = Binder.from_bytes(stream)
+        self.assertEqual(binder.dcx_type, DCXType.DCX_DFLT_10000_24_9)
+        self.assertEqual(
+            [entry.data for entry in binder.entries],
+            [entry.data for entry in Binder.from_path("resources/GameParam.parambnd.dcx").entries],
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,8 +1,12 @@
 import os
+import tempfile
 import unittest
 from pathlib import Path
 
 from soulstruct.base.models.flver import FLVER
+from soulstruct.base.parsed_cache import ParsedFileCache, set_parsed_file_cache
+from soulstruct.containers import Binder
+from soulstruct.dcx import DCXType
 from soulstruct.utilities.inspection import profile_function, Timer
 
 
@@ -26,6 +30,37 @@ class FLVERTest(unittest.TestCase):
         with Timer("Writing chr OBJ"):
             gwyn.write_obj("_test_c5370.obj")
 
+    def test_parsed_file_cache(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = ParsedFileCache(cache_dir)
+            set_parsed_file_cache(cache)
+            try:
+                parsed = FLVER.from_path("resources/m2200B0A10.flver.dcx")
+                cached = FLVER.from_path("resources/m2200B0A10.flver.dcx")
+                self.assertEqual((cache.hits, cache.misses), (1, 1))
+                self.assertEqual(cached.path, Path("resources/m2200B0A10.flver.dcx"))
+                self.assertEqual(bytes(cached), bytes(parsed))
+                array = cached.submeshes[0].vertex_arrays[0].array
+                self.assertTrue(array.flags.writeable)  # out-of-band buffer, not read-only `bytes`
+
+                binder = Binder.from_path("resources/GameParam.parambnd.dcx")
+                self.assertEqual(Binder.from_path("resources/GameParam.parambnd.dcx").entries, binder.entries)
+                self.assertEqual((cache.hits, cache.misses, len(cache)), (2, 2, 2))
+
+                # Split binders are detected from their content, not their names, and are never cached.
+                with tempfile.TemporaryDirectory() as temp_dir:
+                    binder.write(Path(temp_dir, "bhd_copy.parambnd.dcx"))
+                    self.assertEqual(Binder.from_path(Path(temp_dir, "bhd_copy.parambnd.dcx")).entries, binder.entries)
+                    self.assertEqual((cache.misses, len(cache)), (3, 3))  # cached despite 'bhd' in name
+                    binder.is_split_bxf = True
+                    binder.dcx_type = DCXType.Null
+                    binder.write_split(Path(temp_dir, "test.parambhd"), Path(temp_dir, "test.parambdt"))
+                    split_binder = Binder.from_path(Path(temp_dir, "test.parambhd"))
+                    self.assertEqual((split_binder.is_split_bxf, split_binder.entries), (True, binder.entries))
+                    self.assertEqual(len(cache), 3)
+            finally:
+                set_parsed_file_cache(None)
+
     def tearDown(self):
         for test_file in Path(".").glob("_test*"):
             if test_file.is_file():
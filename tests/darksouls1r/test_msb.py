@@ -1,13 +1,20 @@
 import os
 import shutil
+import tempfile
 import unittest
 from pathlib import Path
 
+from soulstruct.base.game_file_directory import LazyFileDict
 from soulstruct.darksouls1r.maps import MSB, MapStudioDirectory
 from soulstruct.utilities.maths import Vector3
 from soulstruct.utilities.inspection import profile_function, Timer
 
 
+class _UnpackableFile:
+    def __bytes__(self):
+        raise ValueError("Cannot pack this file.")
+
+
 class MSBTest(unittest.TestCase):
 
     def setUp(self) -> None:
@@ -37,6 +44,54 @@ class MSBTest(unittest.TestCase):
 
         # TODO: assert equal
 
+    def test_lazy_dir(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for stem in ("m10_00_00_00", "m10_01_00_00"):
+                shutil.copy("resources/m10_00_00_00.msb", Path(temp_dir, f"{stem}.msb"))
+            msd = MapStudioDirectory.from_path(temp_dir, lazy=True)
+            self.assertIsInstance(msd.files, LazyFileDict)
+            self.assertEqual(len(msd.files), 2)
+            self.assertEqual(msd.files.loaded_count, 0)
+
+            msb = msd["m10_00_00_00"]
+            self.assertIsInstance(msb, MSB)
+            self.assertIs(msd.files["m10_00_00_00"], msb)
+            self.assertFalse(msd.files.is_loaded("m10_01_00_00"))
+
+            # Unloaded files are not rewritten in place.
+            self.assertEqual([path.name for path in msd.write()], ["m10_00_00_00.msb"])
+
+            msd.files.prefetch().join()
+            self.assertEqual(msd.files.loaded_count, 2)
+            self.assertEqual(bytes(msd.files["m10_01_00_00"]), bytes(msb))
+
+            prefetched = MapStudioDirectory.from_path(temp_dir, lazy=True, prefetch=["m10_01_00_00"])
+            self.assertEqual(bytes(prefetched.files["m10_01_00_00"]), bytes(msb))
+
+    def test_dir_write(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source_dir, out_dir = Path(temp_dir, "source"), Path(temp_dir, "out")
+            source_dir.mkdir()
+            for stem in ("m10_00_00_00", "m10_01_00_00"):
+                shutil.copy("resources/m10_00_00_00.msb", source_dir / f"{stem}.msb")
+            msd = MapStudioDirectory.from_path(source_dir)
+            msb_data = bytes(msd["m10_00_00_00"])
+
+            written = msd.write(out_dir, processes=2)
+            self.assertEqual(sorted(path.name for path in written), ["m10_00_00_00.msb", "m10_01_00_00.msb"])
+            self.assertTrue(all(path.read_bytes() == msb_data for path in written))
+            self.assertEqual(msd.write(out_dir, check_file_hashes=True), [])
+
+            # Nothing is written (or left behind) if any file fails to pack.
+            msd.files["m10_01_00_00"] = _UnpackableFile()
+            (out_dir / "m10_00_00_00.msb").unlink()
+            with self.assertRaises(ValueError):
+                msd.write(out_dir, processes=1)
+            self.assertEqual(sorted(path.name for path in out_dir.iterdir()), ["m10_01_00_00.msb"])
+
+            written = msd.write(out_dir, no_partial_write=False, processes=1)
+            self.assertEqual([path.name for path in written], ["m10_00_00_00.msb"])
+
     def test_rewrite(self):
         """Test:
 
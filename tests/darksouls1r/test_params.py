@@ -2,6 +2,10 @@ import os
 import unittest
 from pathlib import Path
 
+import numpy as np
+
+from soulstruct.base.params.columnar import ColumnarParam, TypedColumnarParam
+from soulstruct.containers import Binder
 from soulstruct.darksouls1r.params import GameParamBND, ParamDefBND
 from soulstruct.utilities.inspection import Timer
 
@@ -48,6 +52,37 @@ class ParamsTest(unittest.TestCase):
         for i, (line_initial, line_json_read) in enumerate(zip(json_initial, json_from_binary_read)):
             self.assertEqual(line_initial, line_json_read, msg=f"Line {i + 1}")
 
+    def test_columnar(self):
+        game_param = GameParamBND.from_path("resources/GameParam.parambnd.dcx")
+        weapons_param = game_param.params["EquipParamWeapon"]
+        weapons = ColumnarParam.from_param(weapons_param)
+        self.assertEqual(bytes(weapons.to_writer()), bytes(weapons_param.to_writer()))
+        entry = Binder.from_path("resources/GameParam.parambnd.dcx")["EquipParamWeapon.param"]
+        weapons_from_bytes = TypedColumnarParam(weapons_param.ROW_TYPE).from_bytes(entry)
+        self.assertEqual(bytes(weapons_from_bytes.to_writer()), bytes(weapons_param.to_writer()))
+
+        self.assertEqual(weapons.row_ids.tolist(), list(weapons_param.keys()))
+        self.assertEqual(weapons["Weight"].tolist(), [row.Weight for row in weapons_param.values()])
+        self.assertEqual(weapons["rightHandEquipable:1"].tolist(), [r.RightHandAllowed for r in weapons_param.values()])
+        self.assertEqual(weapons.get_row(100000), weapons_param[100000])
+
+        is_heavy = weapons["Weight"] > 10.0
+        weapons.update(is_heavy, Weight=weapons["Weight"] * 2, ParryEnabled=True, RepairCost=1)
+        with self.assertRaises(ValueError):
+            weapons.set_column("WeaponCategory", 256)
+        with self.assertRaises(ValueError):
+            weapons.set_column("LeftHandAllowed", 2)
+
+        edited_param = weapons.to_param()
+        for row_id, is_row_heavy in zip(weapons.row_ids.tolist(), is_heavy.tolist()):
+            row, original_row = edited_param[row_id], weapons_param[row_id]
+            if is_row_heavy:
+                self.assertEqual(row.Weight, np.float32(original_row.Weight * 2))
+                self.assertEqual((row.ParryEnabled, row.RepairCost), (True, 1))
+            else:
+                self.assertEqual(row, original_row)
+            self.assertEqual(row.GuardEnabled, original_row.GuardEnabled)  # in same bit field unit
+
     def tearDown(self):
         for test_file in Path(".").glob("_test*"):
             if test_file.is_file():
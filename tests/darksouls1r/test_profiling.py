@@ -0,0 +1,55 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from soulstruct.benchmarks.formats import FORMAT_CASES, benchmark_formats, compare_results, results_to_json
+from soulstruct.containers import Binder
+from soulstruct.darksouls1r.events import EMEVD
+from soulstruct.profiling import get_active_profile, profiling
+
+
+class ProfilingTest(unittest.TestCase):
+
+    def test_profiling(self):
+        with profiling() as profile:
+            binder = Binder.from_path("resources/GameParam.parambnd.dcx")
+            emevd = EMEVD.from_path("resources/m10_00_00_00.emevd.dcx")
+            bytes(emevd)
+        self.assertIsNone(get_active_profile())
+        bytes(binder)  # not recorded
+
+        summary = {(row["category"], row["name"]): row for row in profile.get_summary()}
+        self.assertEqual(
+            set(summary),
+            {
+                ("Binder", "decompress"), ("Binder", "from_reader"), ("Binder", "entry_read"),
+                ("EMEVD", "decompress"), ("EMEVD", "from_reader"), ("EMEVD", "to_writer"), ("EMEVD", "compress"),
+            },
+        )
+        self.assertEqual(summary["Binder", "entry_read"]["bytes"], sum(e.data_size for e in binder.entries))
+        self.assertEqual(summary["EMEVD", "to_writer"]["bytes"], len(bytes(emevd.to_writer())))
+        self.assertIn("entry_read", profile.get_summary_table())
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            profile.write_chrome_trace(Path(temp_dir, "trace.json"))
+            trace = json.loads(Path(temp_dir, "trace.json").read_text())
+        self.assertEqual(len(trace["traceEvents"]), len(profile.events))
+        self.assertTrue(all(event["ph"] == "X" and event["dur"] >= 0 for event in trace["traceEvents"]))
+
+    def test_format_benchmarks(self):
+        cases = [case for case in FORMAT_CASES if case.name in {"ds1r/MCP", "ds1r/EMEVD"}]
+        results, skipped = benchmark_formats("..", cases + [FORMAT_CASES[-1]], repeat=1)
+        self.assertEqual(len(results), 6)
+        self.assertIn(FORMAT_CASES[-1].name, skipped)  # no Oodle or missing resource
+        self.assertTrue(all(result.objects > 1 and result.mb_per_second > 0 for result in results))
+
+        baseline = results_to_json(results, skipped, repeat=1)
+        for result in baseline["results"]:
+            result["seconds"] /= 10
+        comparisons = compare_results(results, json.loads(json.dumps(baseline)), threshold=0.5)
+        self.assertTrue(all(is_regression for _, _, is_regression in comparisons))
+
+
+if __name__ == '__main__':
+    unittest.main()